@@ -0,0 +1,358 @@
+"""
+animacy_model.py
+
+Character n-gram animacy classifier – the fallback behind guess_animacy()
+for words that no lexicon entry or ANIMACY_HINTS fragment covers.
+
+    • features: character 1–4-grams of "<word>" (with boundary marks, so
+      suffixes like -jik and prefixes like nme' are their own features),
+      hashed into `dim` buckets – no vocabulary to store
+    • model: logistic regression, animate = 1 / inanimate = 0
+    • a batch is scored with array operations only: the words are packed
+      into one padded code-point matrix, every n-gram of every word is
+      hashed at once, and np.bincount sums each word's weights – a
+      sentence or a bulk job is a handful of NumPy calls, not a loop per
+      word
+
+Training data is every noun with a known animacy and a valid SFO
+spelling (LEXICON_CORE, LNU_LEXICON, lnu_bridge.LEXICON) plus
+ANIMACY_HINTS.  A model is only used once it has seen MIN_TRAINING_WORDS
+words and reaches MIN_HELDOUT_ACCURACY in cross-validation; until then
+load_or_train() returns None and guess_animacy() keeps to its rules.  The
+lexicon is far smaller than that today.  Confidences are shrunk towards
+0.5 by the held-out accuracy, so a 75%-accurate model never claims 0.9.
+
+Train offline and ship the weights (with their held-out accuracy):
+
+    python animacy_model.py --out animacy_model.npz
+
+LnuTranslator.warm() loads animacy_model.npz if it exists, otherwise fits
+the model from the lexicon in memory.
+
+Needs NumPy; without it guess_animacy() keeps to its rules.
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import re
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import orthography
+
+try:  # optional
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+DEFAULT_MODEL_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "animacy_model.npz")
+
+# below this probability of the winning class, say "don't know"
+MIN_CONFIDENCE = 0.6
+# a model is only used with at least this much data and held-out accuracy
+MIN_TRAINING_WORDS = 200
+MIN_HELDOUT_ACCURACY = 0.75
+CV_FOLDS = 5
+
+LABELS = ("inanimate", "animate")
+
+
+_PRIME = 1_000_003
+_MIX = 0x9E3779B97F4A7C15  # 64-bit golden-ratio multiplier
+
+
+def hashed_ngrams(words: Sequence[str], dim: int, n_min: int = 1, n_max: int = 4):
+    """
+    Hashed character n-grams of a batch of words, as two parallel arrays:
+    (word index, bucket id).  Every n-gram of every word is hashed in the
+    same few array operations.
+    """
+    padded = ["<" + orthography.normalize(w) + ">" for w in words]
+    lengths = np.fromiter((len(w) for w in padded), dtype=np.int64, count=len(padded))
+    width = int(lengths.max()) if len(padded) else 0
+    flat = np.frombuffer("".join(padded).encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+
+    # words -> (batch, width) code-point matrix, zero padded
+    codes = np.zeros((len(padded), width), dtype=np.uint64)
+    row_of = np.repeat(np.arange(len(padded)), lengths)
+    starts = np.cumsum(lengths) - lengths
+    codes[row_of, np.arange(len(flat)) - np.repeat(starts, lengths)] = flat
+
+    rows, cols = [], []
+    for n in range(n_min, n_max + 1):
+        if width < n:
+            break
+        span = width - n + 1
+        h = np.full((len(padded), span), n, dtype=np.uint64)
+        for k in range(n):
+            h = h * np.uint64(_PRIME) + codes[:, k:k + span]
+        valid = np.arange(span)[None, :] <= (lengths - n)[:, None]
+        r, _ = np.nonzero(valid)
+        rows.append(r)
+        cols.append(((h[valid] * np.uint64(_MIX)) >> np.uint64(40)) % np.uint64(dim))
+    if not rows:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(rows), np.concatenate(cols).astype(np.int64)
+
+
+class AnimacyModel:
+    """
+        model = AnimacyModel.fit(words, labels)
+        model.classify(["kataqaq", "tekekl", "..."])
+        # -> [("animate", 0.9), ("inanimate", 0.92), (None, None)]
+    """
+
+    def __init__(
+        self,
+        weights,
+        bias: float = 0.0,
+        n_min: int = 1,
+        n_max: int = 4,
+        n_train: int = 0,
+        heldout_accuracy: Optional[float] = None,
+    ):
+        if np is None:
+            raise RuntimeError("the animacy model needs numpy: pip install numpy")
+        self.weights = np.asarray(weights, dtype=np.float32)
+        self.bias = float(bias)
+        self.n_min = n_min
+        self.n_max = n_max
+        # training set size and cross-validated accuracy (see validate())
+        self.n_train = n_train
+        self.heldout_accuracy = heldout_accuracy
+
+    @property
+    def dim(self) -> int:
+        return int(self.weights.shape[0])
+
+    @property
+    def shrink(self) -> float:
+        """1.0 for a perfect held-out score, 0.0 for a coin flip."""
+        if self.heldout_accuracy is None:
+            return 1.0
+        return min(1.0, max(0.0, (self.heldout_accuracy - 0.5) / 0.5))
+
+    @property
+    def usable(self) -> bool:
+        """Enough data and held-out accuracy to be worth showing anyone."""
+        return (
+            self.n_train >= MIN_TRAINING_WORDS
+            and self.heldout_accuracy is not None
+            and self.heldout_accuracy >= MIN_HELDOUT_ACCURACY
+        )
+
+    # ------------------ features ------------------
+
+    def _features(self, words: Sequence[str]):
+        """
+        Sparse batch: (row index, column id, value) arrays.  Each word's
+        n-grams are weighted 1/sqrt(count) so long words don't dominate.
+        """
+        rows, cols = hashed_ngrams(words, self.dim, self.n_min, self.n_max)
+        counts = np.bincount(rows, minlength=len(words))
+        vals = (1.0 / np.sqrt(np.maximum(counts, 1)))[rows].astype(np.float32)
+        return rows, cols, vals
+
+    @staticmethod
+    def _sigmoid(z):
+        return 1.0 / (1.0 + np.exp(-np.clip(z, -30, 30)))
+
+    def _scores(self, rows, cols, vals, n: int, weights=None, bias=None):
+        w = self.weights if weights is None else weights
+        b = self.bias if bias is None else bias
+        return np.bincount(rows, weights=w[cols] * vals, minlength=n) + b
+
+    # ------------------ inference ------------------
+
+    def predict_proba(self, words: Sequence[str]):
+        """P(animate) for each word, as one array."""
+        if not words:
+            return np.zeros(0, dtype=np.float64)
+        rows, cols, vals = self._features(words)
+        return self._sigmoid(self._scores(rows, cols, vals, len(words)))
+
+    def classify(
+        self, words: Sequence[str], min_confidence: float = MIN_CONFIDENCE
+    ) -> List[Tuple[Optional[str], Optional[float]]]:
+        """
+        (label, confidence) per word; (None, None) when not confident.
+        Confidence is shrunk towards 0.5 by the held-out accuracy.
+        """
+        p = self.predict_proba(words)
+        animate = p >= 0.5
+        conf = 0.5 + (np.where(animate, p, 1.0 - p) - 0.5) * self.shrink
+        return [
+            (LABELS[int(a)], round(float(c), 3)) if c >= min_confidence else (None, None)
+            for a, c in zip(animate, conf)
+        ]
+
+    # ------------------ training ------------------
+
+    @classmethod
+    def fit(
+        cls,
+        words: Sequence[str],
+        labels: Sequence[str],
+        dim: int = 1 << 14,
+        epochs: int = 300,
+        learning_rate: float = 1.0,
+        l2: float = 1e-3,
+    ) -> "AnimacyModel":
+        """Full-batch gradient descent on class-balanced logistic loss."""
+        model = cls(np.zeros(dim, dtype=np.float32))
+        if not words:
+            return model
+        y = np.asarray([1.0 if l == "animate" else 0.0 for l in labels])
+        rows, cols, vals = model._features(words)
+        n = len(words)
+        # weight classes equally however lopsided the lexicon is
+        pos = max(y.sum(), 1.0)
+        neg = max(n - y.sum(), 1.0)
+        sample_w = np.where(y == 1.0, n / (2 * pos), n / (2 * neg))
+
+        w = np.zeros(dim, dtype=np.float64)
+        b = 0.0
+        for _ in range(epochs):
+            p = cls._sigmoid(model._scores(rows, cols, vals, n, w, b))
+            err = (p - y) * sample_w / n
+            grad = np.bincount(cols, weights=err[rows] * vals, minlength=dim) + l2 * w
+            w -= learning_rate * grad
+            b -= learning_rate * float(err.sum())
+        model.weights = w.astype(np.float32)
+        model.bias = b
+        return model
+
+    @classmethod
+    def cross_validate(
+        cls, words: Sequence[str], labels: Sequence[str], folds: int = CV_FOLDS, **kw
+    ) -> Optional[float]:
+        """Accuracy on held-out folds (fixed shuffle); None with fewer words than folds."""
+        n = len(words)
+        if n < max(folds, 2):
+            return None
+        order = np.random.default_rng(0).permutation(n)
+        correct = 0
+        for f in range(folds):
+            test = order[f::folds]
+            train = np.setdiff1d(order, test)
+            model = cls.fit([words[i] for i in train], [labels[i] for i in train], **kw)
+            p = model.predict_proba([words[i] for i in test])
+            correct += int(sum((pi >= 0.5) == (labels[i] == "animate") for pi, i in zip(p, test)))
+        return correct / n
+
+    @classmethod
+    def fit_validated(cls, words: Sequence[str], labels: Sequence[str], **kw) -> "AnimacyModel":
+        """fit() on everything, with n_train and the cross-validated accuracy filled in."""
+        model = cls.fit(words, labels, **kw)
+        model.n_train = len(words)
+        model.heldout_accuracy = cls.cross_validate(words, labels, **kw)
+        return model
+
+    # ------------------ persistence ------------------
+
+    def save(self, path: str = DEFAULT_MODEL_PATH) -> None:
+        np.savez_compressed(
+            path, weights=self.weights, bias=self.bias, ngrams=np.asarray([self.n_min, self.n_max]),
+            n_train=np.asarray(self.n_train),
+            heldout_accuracy=np.asarray(
+                np.nan if self.heldout_accuracy is None else self.heldout_accuracy
+            ),
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_MODEL_PATH) -> "AnimacyModel":
+        if np is None:
+            raise RuntimeError("the animacy model needs numpy: pip install numpy")
+        with np.load(path) as data:
+            n_min, n_max = (int(x) for x in data["ngrams"])
+            # files from before validation existed count as unvalidated
+            n_train = int(data["n_train"]) if "n_train" in data else 0
+            acc = float(data["heldout_accuracy"]) if "heldout_accuracy" in data else float("nan")
+            return cls(data["weights"], float(data["bias"]), n_min, n_max,
+                       n_train, None if np.isnan(acc) else acc)
+
+
+# NA / NI (core lexicon, lnu_bridge), noun-animate / noun-abstract (story)
+_NOUN_POS_RE = re.compile(r"^(noun|n[ai](\b|[-_]))", re.IGNORECASE)
+
+
+def training_examples(tx) -> Tuple[List[str], List[str]]:
+    """(words, labels) from every noun with a known animacy."""
+    seen = {}
+
+    def add(word: Optional[str], animacy: Optional[str], pos: Optional[str] = None) -> None:
+        if not word or animacy not in LABELS:
+            return
+        # animacy is a property of nouns; verb forms (VTA, VII...) only agree
+        if pos is not None and not _NOUN_POS_RE.match(pos.strip()):
+            return
+        # skip placeholders like "oyster (fill exact Mi'kmaw form)" and
+        # English stand-ins: only valid SFO spellings
+        if not orthography.WORD_RE.fullmatch(word.strip()):
+            return
+        key = orthography.normalize(word)
+        if not orthography.accepts(key):
+            return
+        seen.setdefault(key, animacy)
+
+    for hw, entry in tx.lexicon.items():
+        add(hw, entry.animacy, entry.part_of_speech or "")
+    for entry in tx.story_lexicon:
+        add(entry.get("surface"), entry.get("animacy"), entry.get("pos") or "")
+        add(entry.get("lemma"), entry.get("animacy"), entry.get("pos") or "")
+    try:
+        import lnu_bridge
+        for sfo, entry in lnu_bridge.LEXICON.items():
+            add(sfo, entry.animacy, entry.pos or "")
+    except ImportError:  # pragma: no cover
+        pass
+    from translator import ANIMACY_HINTS
+    for frag, animacy in ANIMACY_HINTS.items():
+        add(frag, animacy)
+    return list(seen), list(seen.values())
+
+
+def train_from_translator(tx, **kw) -> AnimacyModel:
+    words, labels = training_examples(tx)
+    return AnimacyModel.fit_validated(words, labels, **kw)
+
+
+def load_or_train(tx, path: str = DEFAULT_MODEL_PATH) -> Optional[AnimacyModel]:
+    """
+    Shipped weights if present, else fit from the lexicon – but only a
+    model that passes MIN_TRAINING_WORDS / MIN_HELDOUT_ACCURACY; None
+    otherwise, and without NumPy.
+    """
+    if np is None:
+        return None
+    if os.path.exists(path):
+        model = AnimacyModel.load(path)
+    else:
+        words, _ = training_examples(tx)
+        if len(words) < MIN_TRAINING_WORDS:
+            return None  # not worth fitting
+        model = train_from_translator(tx)
+    return model if model.usable else None
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Train the character n-gram animacy model.")
+    parser.add_argument("--out", default=DEFAULT_MODEL_PATH)
+    parser.add_argument("--dim", type=int, default=1 << 14, help="hashed feature buckets")
+    parser.add_argument("--epochs", type=int, default=300)
+    args = parser.parse_args(argv)
+
+    from translator import get_translator
+    words, labels = training_examples(get_translator())
+    model = AnimacyModel.fit_validated(words, labels, dim=args.dim, epochs=args.epochs)
+    model.save(args.out)
+    acc = "n/a" if model.heldout_accuracy is None else f"{model.heldout_accuracy:.3f}"
+    print(f"animacy_model.py: {len(words)} words, held-out accuracy {acc} -> {args.out}")
+    if not model.usable:
+        print(f"  not used: needs >= {MIN_TRAINING_WORDS} words and >= "
+              f"{MIN_HELDOUT_ACCURACY} held-out accuracy")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+annotation_sessions.py
+
+Incremental annotation for editor integrations (the /sessions routes in
+api.py).
+
+The transcription editor used to re-send the whole document to
+/explain-sentence after every keystroke.  Instead it now opens a session
+with the full text once, then sends only diffs:
+
+    {"start": 10, "end": 12, "text": "ew"}     replace text[10:12] with "ew"
+
+The session keeps the document split into sentences, each with its token
+analyses.  An edit re-splits only the sentences it touches (plus one
+neighbour on each side, since adding or deleting a "." can merge or split
+them) and re-analyzes only sentences whose text actually changed.  The
+reply lists just the new/changed sentences and the ids of the removed
+ones; every other sentence keeps its id and annotations, and its offsets
+move by the edits' length change, which the client already knows.
+
+Token offsets are relative to their sentence, so they never change when
+text before the sentence is edited.
+
+Idle sessions are evicted after `idle_ttl` seconds, and there are never
+more than `max_sessions` (least recently used go first).
+"""
+
+from __future__ import annotations
+
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+# a sentence is a run of text up to and including its . ! ? (or a newline)
+_SENTENCE_RE = re.compile(r"[^.!?\n]+[.!?]*")
+
+# analyses of distinct tokens kept per session
+TOKEN_MEMO_SIZE = 4096
+
+
+class SessionNotFound(KeyError):
+    """Unknown or evicted session id."""
+
+
+class EditConflict(ValueError):
+    """The edits were made against an older version of the document."""
+
+
+@dataclass
+class _Sentence:
+    id: int
+    start: int
+    end: int
+    text: str
+    tokens: List[Dict[str, Any]]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "start": self.start,
+            "end": self.end,
+            "text": self.text,
+            "tokens": self.tokens,
+        }
+
+
+def split_sentences(text: str, offset: int = 0):
+    """(start, end, sentence text) for each non-blank sentence, leading blanks trimmed."""
+    for m in _SENTENCE_RE.finditer(text):
+        chunk = m.group()
+        stripped = chunk.lstrip()
+        if not stripped.strip():
+            continue
+        start = offset + m.start() + (len(chunk) - len(stripped))
+        yield start, offset + m.end(), stripped
+
+
+class AnnotationSession:
+    def __init__(self, translator, text: str, max_chars: int):
+        self.translator = translator
+        self.max_chars = max_chars
+        self.text = ""
+        self.version = 0
+        self.sentences: List[_Sentence] = []
+        self.lock = threading.Lock()
+        self.last_used = time.monotonic()
+        self._next_id = 0
+        self._memo: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # the whole session is annotated against the lexicon version it
+        # started on, so later speaker corrections don't mix in mid-document
+        self.lexicon_revision = translator.versions.head
+        self._check_size(len(text))
+        self.text = text
+        self.sentences = [self._sentence(s, e, t) for s, e, t in split_sentences(text)]
+
+    def _check_size(self, n: int) -> None:
+        if n > self.max_chars:
+            raise ValueError(f"document too long ({n} > {self.max_chars} characters)")
+
+    # ------------------ analysis ------------------
+
+    def _analyze_tokens(self, tokens: List[str]) -> List[Dict[str, Any]]:
+        new = list(dict.fromkeys(t for t in tokens if t not in self._memo))
+        # keystroke-level half-words are not real lookups: don't feed the
+        # unknown-word review queue
+        fresh = dict(zip(new, self.translator.analyze_words(
+            new, track=False, as_of=self.lexicon_revision
+        )))
+        out = []
+        for tok in tokens:
+            analysis = self._memo.get(tok)
+            if analysis is None:
+                analysis = fresh[tok].to_dict()
+                self._memo[tok] = analysis
+            else:
+                self._memo.move_to_end(tok)
+            out.append(analysis)
+        while len(self._memo) > TOKEN_MEMO_SIZE:
+            self._memo.popitem(last=False)
+        return out
+
+    def _sentence(self, start: int, end: int, text: str) -> _Sentence:
+        tokens = []
+        pos = 0
+        words = self.translator.tokenize_sentence(text)
+        for tok, analysis in zip(words, self._analyze_tokens(words)):
+            at = text.find(tok, pos)
+            pos = at + len(tok)
+            tokens.append({"token": tok, "start": at, "end": pos, "analysis": analysis})
+        self._next_id += 1
+        return _Sentence(self._next_id, start, end, text, tokens)
+
+    # ------------------ edits ------------------
+
+    def apply_edits(self, edits: List[Dict[str, Any]], version: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Apply edits in order (each in the coordinates left by the previous
+        one).  If `version` is given it must match the current version.
+
+        All or nothing: every edit is checked against the length the ones
+        before it leave before anything changes, and if applying still
+        fails the document is restored, so a rejected batch can be retried.
+        """
+        if version is not None and version != self.version:
+            raise EditConflict(f"session is at version {self.version}, edits are for {version}")
+        parsed = [(int(e["start"]), int(e["end"]), str(e.get("text", ""))) for e in edits]
+        length = len(self.text)
+        for start, end, new in parsed:
+            if not 0 <= start <= end <= length:
+                raise ValueError(f"edit [{start}, {end}) is outside the document (length {length})")
+            length += len(new) - (end - start)
+            self._check_size(length)
+
+        saved = (self.text, self._next_id, [(s, s.start, s.end) for s in self.sentences])
+        created: Dict[int, _Sentence] = {}
+        removed: List[int] = []
+        try:
+            for start, end, new in parsed:
+                self._apply(start, end, new, created, removed)
+        except BaseException:
+            self.text, self._next_id, positions = saved
+            for sent, start, end in positions:
+                sent.start, sent.end = start, end
+            self.sentences = [sent for sent, _, _ in positions]
+            raise
+        self.version += 1
+        live = {s.id for s in self.sentences}
+        return {
+            "version": self.version,
+            "length": len(self.text),
+            "changed": [s.to_dict() for i, s in created.items() if i in live],
+            "removed": [i for i in removed if i not in created],
+        }
+
+    def _apply(self, start: int, end: int, new: str, created: Dict[int, _Sentence],
+               removed: List[int]) -> None:
+        if not 0 <= start <= end <= len(self.text):
+            raise ValueError(f"edit [{start}, {end}) is outside the document (length {len(self.text)})")
+        self._check_size(len(self.text) - (end - start) + len(new))
+        self.text = self.text[:start] + new + self.text[end:]
+        delta = len(new) - (end - start)
+
+        sents = self.sentences
+        # sentences touching the edit, widened by one neighbour each side
+        first = next((i for i, s in enumerate(sents) if s.end >= start), len(sents))
+        last = next((i for i in range(len(sents) - 1, -1, -1) if sents[i].start <= end), -1)
+        lo, hi = max(0, first - 1), min(len(sents), last + 2)
+        old = sents[lo:hi]
+
+        # re-split from where the previous sentence's match ended, so the
+        # regex sees the same text it would in a full pass
+        region_start = min(start, sents[lo - 1].end if lo > 0 else 0)
+        # ...and up to the end of the untouched neighbour after the edit, or
+        # the end of the document (stray "!" after the last sentence can join it)
+        region_end = (sents[hi - 1].end if hi < len(sents) else len(self.text) - delta)
+        region_end = max(region_end, end) + delta
+
+        reusable: Dict[str, List[_Sentence]] = {}
+        for s in old:
+            reusable.setdefault(s.text, []).append(s)
+        fresh: List[_Sentence] = []
+        for s_start, s_end, text in split_sentences(self.text[region_start:region_end], region_start):
+            same = reusable.get(text)
+            if same:
+                sent = same.pop(0)
+                sent.start, sent.end = s_start, s_end
+            else:
+                sent = self._sentence(s_start, s_end, text)
+                created[sent.id] = sent
+            fresh.append(sent)
+
+        kept = {s.id for s in fresh}
+        removed.extend(s.id for s in old if s.id not in kept)
+        for s in sents[hi:]:
+            s.start += delta
+            s.end += delta
+        self.sentences = sents[:lo] + fresh + sents[hi:]
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "version": self.version,
+            "length": len(self.text),
+            "lexicon_revision": self.lexicon_revision,
+            "text": self.text,
+            "sentences": [s.to_dict() for s in self.sentences],
+        }
+
+
+class AnnotationSessions:
+    """
+    Session store.
+
+        sessions = AnnotationSessions(get_translator(), idle_ttl=900)
+        sid, state = sessions.create("Kesalul nikmaq. Wela'lin.")
+        sessions.edit(sid, [{"start": 0, "end": 7, "text": "Kesalulk"}])
+    """
+
+    def __init__(self, translator, idle_ttl: float = 900.0, max_sessions: int = 1000,
+                 max_chars: int = 200_000):
+        self.translator = translator
+        self.idle_ttl = idle_ttl
+        self.max_sessions = max_sessions
+        self.max_chars = max_chars
+        self._sessions: "OrderedDict[str, AnnotationSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.created = 0
+        self.evicted = 0
+
+    def _evict(self, now: float) -> None:
+        # least recently used first, so stop at the first live one
+        while self._sessions:
+            sid, session = next(iter(self._sessions.items()))
+            if now - session.last_used < self.idle_ttl and len(self._sessions) <= self.max_sessions:
+                break
+            del self._sessions[sid]
+            self.evicted += 1
+
+    def _get(self, session_id: str) -> AnnotationSession:
+        now = time.monotonic()
+        with self._lock:
+            self._evict(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                raise SessionNotFound(session_id)
+            session.last_used = now
+            self._sessions.move_to_end(session_id)
+            return session
+
+    def create(self, text: str, translator=None):
+        # `translator`: e.g. a dialect view (LnuTranslator.for_dialect)
+        session = AnnotationSession(translator or self.translator, text, self.max_chars)
+        session_id = secrets.token_urlsafe(12)
+        with self._lock:
+            self._sessions[session_id] = session
+            self.created += 1
+            self._evict(time.monotonic())
+        return session_id, session.snapshot()
+
+    def edit(self, session_id: str, edits: List[Dict[str, Any]],
+             version: Optional[int] = None) -> Dict[str, Any]:
+        session = self._get(session_id)
+        with session.lock:
+            return session.apply_edits(edits, version)
+
+    def get(self, session_id: str) -> Dict[str, Any]:
+        session = self._get(session_id)
+        with session.lock:
+            return session.snapshot()
+
+    def close(self, session_id: str) -> bool:
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            self._evict(time.monotonic())
+            return {
+                "active": len(self._sessions),
+                "created": self.created,
+                "evicted": self.evicted,
+                "idle_ttl": self.idle_ttl,
+                "max_sessions": self.max_sessions,
+            }
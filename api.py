@@ -3,18 +3,111 @@
 # Small HTTP API around translator.py for The Living Treaty / NetukilmkUtanProject.
 # bridge.js or any frontend can call these JSON endpoints.
 
-from typing import List, Dict, Any
+import hmac
+import json
+import os
+import threading
+from contextlib import asynccontextmanager
+from typing import List, Dict, Any, Iterator, Optional, Union
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Header, HTTPException, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from fastapi.responses import Response, StreamingResponse
+from pydantic import BaseModel, Field
 
-from translator import get_translator
+import orthography
+from annotation_sessions import AnnotationSessions, EditConflict, SessionNotFound
+from coinage import CoinageGenerator
+from concordance import CorpusIndex
+from heavy_hitters import UnknownWordTracker
+from lexicon_versions import UnknownVersion, VersionedLexicon
+from http_cache import body_cache_stats, cached_json_response, make_etag
+from result_cache import ResultCache
+from serve import process_memory
+from singleflight import SingleFlight
+from suggest import SuggestIndex
+from timeline_service import TimelineService
+from translator import GenerationRequest, LnuTranslator, entry_from_dict, get_translator
 
 # ---------------------------------------------------------------------
 # FastAPI setup
 # ---------------------------------------------------------------------
 
+translator = get_translator()
+# unknown words people look up most, for elder review (heavy_hitters.py);
+# with LNU_UNKNOWN_WORDS_DIR set, each worker snapshots its counts there and
+# /admin/unknown-words merges all of them
+translator.unknown_words = UnknownWordTracker(
+    capacity=int(os.environ.get("LNU_UNKNOWN_WORDS_CAPACITY", "512")),
+    snapshot_dir=os.environ.get("LNU_UNKNOWN_WORDS_DIR") or None,
+)
+# speaker corrections as numbered lexicon versions (lexicon_versions.py);
+# with LNU_LEXICON_LOG set they go to that append-only audit log, which
+# all workers share.  Without it every worker would keep its own edits, so
+# lexicon writes are refused when serve.py runs more than one worker.
+translator.versions = VersionedLexicon(
+    translator.versions.base,
+    path=os.environ.get("LNU_LEXICON_LOG") or None,
+    checkpoint_every=int(os.environ.get("LNU_LEXICON_CHECKPOINT_EVERY", "500")),
+    make_entry=entry_from_dict,
+)
+# /generate-term result cache; set LNU_GENERATION_CACHE to a file path to
+# keep it across restarts (a file from other patterns / lexicon data is
+# dropped)
+translator.generation_cache = ResultCache(
+    max_entries=int(os.environ.get("LNU_GENERATION_CACHE_SIZE", "4096")),
+    ttl=float(os.environ.get("LNU_GENERATION_CACHE_TTL", "86400")),
+    path=os.environ.get("LNU_GENERATION_CACHE") or None,
+    namespace=translator.generation_version,
+)
+# concurrent identical translator calls share one computation (singleflight.py)
+inflight = SingleFlight()
+# editor sessions for incremental re-annotation (annotation_sessions.py)
+sessions = AnnotationSessions(
+    translator,
+    idle_ttl=float(os.environ.get("LNU_SESSION_IDLE_TTL", "900")),
+    max_sessions=int(os.environ.get("LNU_MAX_SESSIONS", "1000")),
+)
+# combinatorial search over the morpheme inventory (coinage.py)
+coinage = CoinageGenerator.from_translator(translator)
+# prefix index for as-you-type lookup (suggest.py)
+suggester = SuggestIndex.from_translator(translator)
+# positional index over example sentences + ingested texts (concordance.py)
+corpus = CorpusIndex.from_translator(translator)
+# texts added by POST /corpus/documents; with LNU_CORPUS_LOG set they are
+# kept in that JSONL file, which all workers share and restarts reload
+if os.environ.get("LNU_CORPUS_LOG"):
+    corpus.load_log(os.environ["LNU_CORPUS_LOG"])
+CORPUS_MAX_DOCUMENT_CHARS = int(os.environ.get("LNU_CORPUS_MAX_DOCUMENT_CHARS", "100000"))
+CORPUS_MAX_ADDED_DOCUMENTS = int(os.environ.get("LNU_CORPUS_MAX_ADDED_DOCUMENTS", "10000"))
+# longest ?q= GET /sentence takes; longer texts go to POST /explain-sentence
+# or /sessions, whose answers are not kept in the HTTP body cache
+SENTENCE_MAX_QUERY_CHARS = int(os.environ.get("LNU_SENTENCE_MAX_QUERY_CHARS", "2000"))
+suggester.set_frequencies(corpus.word_counts())
+# the three indexes above are built from the lexicon; _refresh_derived()
+# rebuilds them after an edit.  ETags of their answers use this version.
+_derived_lock = threading.Lock()
+_derived_revision = translator.versions.head
+_derived_version = translator.lexicon_version
+# suggest indexes of dialect views, built on first use (dialect -> index)
+_dialect_suggesters: Dict[str, SuggestIndex] = {}
+# interval tree + era / figure / word indexes over timelineData.js and
+# data.js (timeline_service.py)
+timeline = TimelineService.from_files()
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI):
+    # Build indexes before the first request.  Under serve.py this already
+    # happened in the parent before fork, so it is a no-op here.
+    translator.warm()
+    yield
+    translator.generation_cache.namespace = translator.generation_version
+    translator.generation_cache.save()
+    translator.unknown_words.save_snapshot()
+    translator.versions.checkpoint()
+
+
 app = FastAPI(
     title="Lnu Translator API",
     description=(
@@ -22,6 +115,7 @@ app = FastAPI(
         "Msit No'kmaq / Netukulimk worldview."
     ),
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 # Allow browser apps (GitHub Pages, local dev, etc.) to call this API.
@@ -31,26 +125,192 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Lexicon-Version", "X-Lexicon-Revision", "X-Lnu-Dialect"],
 )
 
-translator = get_translator()
-
 # ---------------------------------------------------------------------
 # Pydantic request models
 # ---------------------------------------------------------------------
 
 class ExplainWordRequest(BaseModel):
     word: str
+    as_of: Optional[int] = None  # lexicon version; default latest
 
 
 class ExplainSentenceRequest(BaseModel):
     sentence: str
+    as_of: Optional[int] = None
+
+
+class CheckSpellingRequest(BaseModel):
+    text: str
+
+
+class AddDocumentRequest(BaseModel):
+    text: str
+    title: str = ""
+    source: str = ""
+
+
+class CreateSessionRequest(BaseModel):
+    text: str = ""
+
+
+class TextEdit(BaseModel):
+    start: int
+    end: int
+    text: str = ""
+
+
+class EditSessionRequest(BaseModel):
+    edits: List[TextEdit]
+    version: Optional[int] = None  # reject if the session has moved on
+
+
+class MorphemeModel(BaseModel):
+    surface: str
+    gloss: str = ""
+    role: str = ""
+    notes: Optional[str] = None
+
+
+class LexiconEntryEdit(BaseModel):
+    english: str
+    part_of_speech: str
+    animacy: Optional[str] = None
+    morphemes: List[MorphemeModel] = []
+    register_: Optional[str] = Field(default=None, alias="register")
+    worldview_tags: List[str] = []
+    examples: List[str] = []
+    # audit trail (the author is whoever the admin token belongs to)
+    note: str = ""
 
 
 class GenerateTermRequest(BaseModel):
     concept: str
     purpose: str
     domain_tags: List[str] = []
+    top_k: Optional[int] = None  # only return the best k candidates
+    # combinatorial search (coinage.py) on top of the pattern library
+    search: bool = False
+    max_candidates: int = 50
+    time_budget_ms: int = 250
+    # stream candidates back as NDJSON, one per line, as they are found
+    stream: bool = False
+
+
+# ---------------------------------------------------------------------
+# Dialect overlays
+# ---------------------------------------------------------------------
+#
+# Pick a community overlay (dialect_overlays.json) per request with the
+# X-Lnu-Dialect header or ?dialect=...; no dialect = the shared base.
+# Every cache below is keyed by the view's dialect / lexicon_version, so
+# dialects never serve each other's answers.
+
+def _translator_for(request: Union[Request, WebSocket]) -> LnuTranslator:
+    # pick up corrections other workers appended to the shared log
+    translator.versions.refresh()
+    name = request.headers.get("x-lnu-dialect") or request.query_params.get("dialect")
+    try:
+        return translator.for_dialect(name)
+    except KeyError:
+        raise HTTPException(
+            status_code=400,
+            detail=f"unknown dialect {name!r}; one of {translator.overlays.names()}",
+        )
+
+
+def _refresh_derived() -> str:
+    """
+    Rebuild suggester / corpus / coinage if the lexicon changed since they
+    were built (here or in another worker); returns the lexicon_version
+    they now reflect.
+    """
+    global suggester, corpus, coinage, _derived_revision, _derived_version, _dialect_suggesters
+    translator.versions.refresh()
+    if translator.versions.head == _derived_revision:
+        return _derived_version
+    with _derived_lock:
+        head = translator.versions.head
+        if head != _derived_revision:
+            version = translator.lexicon_version_at(head)
+            new_corpus = corpus.rebuilt(translator)
+            new_suggester = SuggestIndex.from_translator(translator)
+            new_suggester.set_frequencies(new_corpus.word_counts())
+            coinage = CoinageGenerator.from_translator(translator)
+            corpus, suggester = new_corpus, new_suggester
+            _dialect_suggesters = {}
+            _derived_revision, _derived_version = head, version
+        return _derived_version
+
+
+def _suggester_for(tx: LnuTranslator) -> SuggestIndex:
+    """The suggest index for a dialect view (call _refresh_derived() first)."""
+    if tx.dialect is None:
+        return suggester
+    index = _dialect_suggesters.get(tx.dialect)
+    if index is None:
+        index = SuggestIndex.from_translator(tx)
+        index.set_frequencies(corpus.word_counts())
+        _dialect_suggesters[tx.dialect] = index
+    return index
+
+
+# ---------------------------------------------------------------------
+# Coalesced translator calls
+# ---------------------------------------------------------------------
+#
+# Keys are the normalized request, so students sending the same sentence
+# with different spacing, or a word in different case, still share the
+# work.  Results are shared between callers – copy before changing them.
+# The shared computation never counts unknown words; each route does that
+# for its own caller (tx.track_unknown), including callers answered from
+# the HTTP cache or with a 304.
+
+def _revision(tx: LnuTranslator, as_of: Optional[int]) -> int:
+    try:
+        return tx.versions.resolve(as_of)
+    except UnknownVersion:
+        raise HTTPException(
+            status_code=404, detail=f"no lexicon version {as_of} (latest is {tx.versions.head})"
+        )
+
+
+def _explain_word(
+    word: str, tx: LnuTranslator = translator, as_of: Optional[int] = None
+) -> Dict[str, Any]:
+    revision = _revision(tx, as_of)
+    result = inflight.do(
+        f"word\x1f{tx.dialect}\x1f{revision}\x1f{word.strip().lower()}",
+        lambda: tx.explain_word_for_api(word, as_of=as_of, track=False),
+    )
+    if result["word"] != word:
+        result = dict(result, word=word)
+    return result
+
+
+def _explain_sentence(
+    sentence: str, tx: LnuTranslator = translator, as_of: Optional[int] = None
+) -> Dict[str, Any]:
+    # analyses only depend on the tokens; echo each caller's own text back
+    revision = _revision(tx, as_of)
+    key = " ".join(tx.tokenize_sentence(sentence))
+    result = inflight.do(
+        f"sentence\x1f{tx.dialect}\x1f{revision}\x1f{key}",
+        lambda: tx.explain_sentence_for_api(sentence, as_of=as_of, track=False),
+    )
+    if result["sentence"] != sentence:
+        result = dict(result, sentence=sentence)
+    return result
+
+
+def _generate_term(payload: Dict[str, Any], tx: LnuTranslator = translator) -> Dict[str, Any]:
+    # generation_version covers the overlay (through lexicon_version)
+    req = GenerationRequest(payload["concept"], payload["purpose"], payload["domain_tags"] or [])
+    key = f"{tx.dialect}\x1f{tx.generation_version}|{req.cache_key(payload.get('top_k'))}"
+    result = inflight.do("generate\x1f" + key, lambda: tx.generate_term_for_api(payload))
+    return dict(result, concept=req.concept)
 
 
 # ---------------------------------------------------------------------
@@ -68,13 +328,81 @@ def root() -> Dict[str, Any]:
         "endpoints": [
             "POST /explain-word",
             "POST /explain-sentence",
+            "GET /word/{headword}",
+            "GET /sentence?q=...",
+            "GET /suggest?prefix=...",
+            "WS /ws/suggest",
+            "GET /concordance?q=...",
+            "GET /frequencies",
+            "POST /corpus/documents",
+            "GET /timeline/events?start=...&end=...&era=...&figure=...&q=...",
+            "GET /timeline/events/{id}",
+            "GET /timeline/eras",
+            "GET /timeline/figures",
+            "GET /timeline/figures/{id}",
+            "POST /sessions",
+            "POST /sessions/{id}/edits",
             "POST /generate-term",
+            "POST /check-spelling",
+            "GET /dialects",
+            "GET /lexicon/version",
+            "GET /stats",
+            "GET /admin/unknown-words",
+            "PUT /admin/lexicon/{headword}",
+            "DELETE /admin/lexicon/{headword}",
+            "GET /admin/lexicon/{headword}/history",
         ],
     }
 
 
+@app.get("/stats")
+def stats() -> Dict[str, Any]:
+    """
+    Per-worker runtime info.  Each worker answers for itself, so hit this
+    a few times (or once per worker) to see all of them.
+    """
+    return {
+        "worker": {
+            "pid": os.getpid(),
+            "parent_pid": os.getppid(),
+            "warmed": translator.warmed,
+            "memory": process_memory(),
+        },
+        "generation_cache": translator.generation_cache.stats(),
+        "http_body_cache": body_cache_stats(),
+        "coinage": coinage.stats(),
+        "corpus": corpus.stats(),
+        "unknown_words": translator.unknown_words.stats(),
+        "singleflight": inflight.stats(),
+        "sessions": sessions.stats(),
+        "lexicon": translator.versions.stats(),
+        "timeline": timeline.stats(),
+    }
+
+
+@app.get("/dialects")
+def dialects() -> Dict[str, Any]:
+    """
+    Community overlays selectable with X-Lnu-Dialect or ?dialect=...
+
+    Returns:
+        { base_version, dialects: [ {name, label, parent, version, keys}, ... ] }
+    """
+    return {"base_version": translator.lexicon_version, "dialects": translator.overlays.info()}
+
+
+@app.get("/lexicon/version")
+def lexicon_version() -> Dict[str, Any]:
+    """
+    The lexicon version now being served.  Pass `revision` as `as_of` to
+    reproduce today's answers after later corrections.
+    """
+    translator.versions.refresh()
+    return {"revision": translator.versions.head, "lexicon_version": translator.lexicon_version}
+
+
 @app.post("/explain-word")
-def explain_word(req: ExplainWordRequest) -> Dict[str, Any]:
+def explain_word(req: ExplainWordRequest, request: Request, response: Response) -> Dict[str, Any]:
     """
     Analyze a single Mi'kmaw word.
 
@@ -85,14 +413,19 @@ def explain_word(req: ExplainWordRequest) -> Dict[str, Any]:
           entry: { ... full WordEntry ... } or null,
           guessed_morphemes: [ ... Morpheme ... ],
           animacy_guess: "animate"/"inanimate"/null,
-          worldview_notes: [ "...", ... ]
+          worldview_notes: [ "...", ... ],
+          lexicon_revision: 12
         }
     """
-    return translator.explain_word_for_api(req.word)
+    tx = _translator_for(request)
+    result = _explain_word(req.word, tx, req.as_of)
+    tx.track_unknown([req.word], req.as_of)
+    response.headers.update(_lexicon_headers(tx, result["lexicon_revision"]))
+    return result
 
 
 @app.post("/explain-sentence")
-def explain_sentence(req: ExplainSentenceRequest) -> Dict[str, Any]:
+def explain_sentence(req: ExplainSentenceRequest, request: Request, response: Response) -> Dict[str, Any]:
     """
     Analyze each token in a Mi'kmaw sentence.
 
@@ -100,26 +433,528 @@ def explain_sentence(req: ExplainSentenceRequest) -> Dict[str, Any]:
         {
           sentence: "...",
           tokens: ["...", "..."],
-          analyses: [ <same structure as /explain-word>, ... ]
+          analyses: [ <same structure as /explain-word>, ... ],
+          lexicon_revision: 12
         }
     """
-    return translator.explain_sentence_for_api(req.sentence)
+    tx = _translator_for(request)
+    result = _explain_sentence(req.sentence, tx, req.as_of)
+    tx.track_unknown(tx.tokenize_sentence(req.sentence), req.as_of)
+    response.headers.update(_lexicon_headers(tx, result["lexicon_revision"]))
+    return result
+
+
+@app.post("/check-spelling")
+def check_spelling(req: CheckSpellingRequest) -> Dict[str, Any]:
+    """
+    Normalize text to Smith-Francis orthography and report the first
+    spelling problem, if any.
+
+    Returns:
+        { text, normalized, valid, position, reason }
+    """
+    return orthography.check(req.text).to_dict()
+
+
+# ---------------------------------------------------------------------
+# Cacheable GET routes
+# ---------------------------------------------------------------------
+#
+# Same answers as the POST routes, but addressable by URL, so browsers,
+# CDNs and reverse proxies can cache them.  The ETag only depends on the
+# lexicon snapshot version and the request, so revalidations are answered
+# with 304 without running the translator.  ?as_of=N answers from lexicon
+# version N.
+
+def _lexicon_headers(tx: LnuTranslator = translator, revision: Optional[int] = None) -> Dict[str, str]:
+    revision = tx.versions.head if revision is None else revision
+    headers = {
+        "X-Lexicon-Version": tx.lexicon_version_at(revision),
+        "X-Lexicon-Revision": str(revision),
+        # the dialect can come from a header, so shared caches must key on it
+        "Vary": "Accept-Encoding, X-Lnu-Dialect",
+    }
+    if tx.dialect:
+        headers["X-Lnu-Dialect"] = tx.dialect
+    return headers
+
+
+@app.get("/word/{headword}")
+def get_word(headword: str, request: Request, as_of: Optional[int] = None) -> Response:
+    """GET version of /explain-word (dialect via X-Lnu-Dialect or ?dialect=)."""
+    tx = _translator_for(request)
+    revision = _revision(tx, as_of)
+    etag = make_etag("word", tx.lexicon_version_at(revision), headword)
+    tx.track_unknown([headword], as_of)
+    return cached_json_response(
+        request, etag, lambda: _explain_word(headword, tx, as_of), _lexicon_headers(tx, revision)
+    )
+
+
+@app.get("/sentence")
+def get_sentence(q: str, request: Request, as_of: Optional[int] = None) -> Response:
+    """GET version of /explain-sentence: /sentence?q=Kesalul nikmaq"""
+    if len(q) > SENTENCE_MAX_QUERY_CHARS:
+        raise HTTPException(
+            status_code=414,
+            detail=f"q longer than {SENTENCE_MAX_QUERY_CHARS} characters; POST /explain-sentence instead",
+        )
+    tx = _translator_for(request)
+    revision = _revision(tx, as_of)
+    etag = make_etag("sentence", tx.lexicon_version_at(revision), q)
+    tx.track_unknown(tx.tokenize_sentence(q), as_of)
+    return cached_json_response(
+        request, etag, lambda: _explain_sentence(q, tx, as_of), _lexicon_headers(tx, revision)
+    )
+
+
+@app.get("/suggest")
+def suggest(prefix: str, request: Request, k: int = 10) -> Response:
+    """
+    Top-k completions for a prefix, ranked by usage frequency.
+
+    Returns:
+        { prefix: "kes", suggestions: [ {text, headword, source, frequency}, ... ] }
+    (dialect via X-Lnu-Dialect or ?dialect=)
+    """
+    tx = _translator_for(request)
+    version = _refresh_derived()
+    overlay = tx.overlay.version if tx.overlay else ""
+    etag = make_etag("suggest", version, tx.dialect or "", overlay, prefix, k)
+    index = _suggester_for(tx)
+    return cached_json_response(
+        request,
+        etag,
+        lambda: {"prefix": prefix, "suggestions": index.suggest(prefix, k)},
+        _lexicon_headers(tx),
+    )
+
+
+@app.websocket("/ws/suggest")
+async def suggest_ws(ws: WebSocket) -> None:
+    """
+    Keystroke-rate completions over one connection.
+
+    Send either a bare prefix ("kes") or {"prefix": "kes", "k": 5};
+    each message gets one {prefix, suggestions} reply.  The dialect
+    (X-Lnu-Dialect or ?dialect=) is fixed when connecting.
+    """
+    try:
+        tx = _translator_for(ws)
+    except HTTPException as exc:
+        await ws.close(code=1008, reason=exc.detail)
+        return
+    await ws.accept()
+    try:
+        while True:
+            msg = await ws.receive_text()
+            k = 10
+            prefix = msg
+            if msg.startswith("{"):
+                try:
+                    data = json.loads(msg)
+                    prefix, k = str(data.get("prefix", "")), int(data.get("k", 10))
+                except (ValueError, TypeError, AttributeError):
+                    await ws.send_json({"error": "expected a prefix or {\"prefix\": ..., \"k\": ...}"})
+                    continue
+            _refresh_derived()
+            await ws.send_json({"prefix": prefix, "suggestions": _suggester_for(tx).suggest(prefix, k)})
+    except WebSocketDisconnect:
+        pass
+
+
+# ---------------------------------------------------------------------
+# Corpus: concordance + frequencies
+# ---------------------------------------------------------------------
+
+@app.get("/concordance")
+def get_concordance(q: str, window: int = 5, limit: int = 50, offset: int = 0) -> Dict[str, Any]:
+    """
+    Keyword-in-context lines for a word or phrase: /concordance?q=kataq
+
+    Returns:
+        { query, total, hits: [ {doc, title, source, position,
+                                 left, keyword, right, sentence}, ... ] }
+    """
+    _refresh_derived()
+    corpus.refresh()
+    return corpus.concordance(
+        q,
+        window=max(0, min(window, 50)),
+        limit=max(0, min(limit, 500)),
+        offset=max(0, offset),
+    )
+
+
+@app.get("/frequencies")
+def get_frequencies(kind: str = "word", limit: int = 50) -> Dict[str, Any]:
+    """
+    Most frequent words (kind=word) or morphemes (kind=morpheme) in the corpus.
+    """
+    limit = max(1, min(limit, 1000))
+    _refresh_derived()
+    corpus.refresh()
+    if kind == "morpheme":
+        rows = corpus.morpheme_frequencies(limit)
+    else:
+        kind, rows = "word", corpus.frequencies(limit)
+    return {"kind": kind, "tokens": corpus.tokens, "rows": rows}
+
+
+@app.post("/corpus/documents")
+def add_corpus_document(
+    req: AddDocumentRequest,
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Add a story or other text to the corpus (admin token required).  Only
+    the new text is indexed; it is searchable by /concordance straight
+    away, and in the other workers too when LNU_CORPUS_LOG is set.
+    """
+    _check_admin(x_admin_token, write=True)
+    if len(req.text) > CORPUS_MAX_DOCUMENT_CHARS:
+        raise HTTPException(
+            status_code=413, detail=f"document longer than {CORPUS_MAX_DOCUMENT_CHARS} characters"
+        )
+    _refresh_derived()
+    corpus.refresh()
+    if corpus.logged_documents >= CORPUS_MAX_ADDED_DOCUMENTS:
+        raise HTTPException(
+            status_code=507, detail=f"corpus already holds {CORPUS_MAX_ADDED_DOCUMENTS} added documents"
+        )
+    doc_id = corpus.append_document(req.text, title=req.title, source=req.source)
+    return {"doc_id": doc_id, **corpus.stats()}
+
+
+# ---------------------------------------------------------------------
+# Timeline
+# ---------------------------------------------------------------------
+#
+# The timeline data is loaded once at startup and never changes while the
+# process runs, so every answer is keyed on its content hash and can be
+# revalidated with a 304.
+
+@app.get("/timeline/events")
+def timeline_events(
+    request: Request,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    era: Optional[str] = None,
+    figure: Optional[str] = None,
+    q: Optional[str] = None,
+    tag: Optional[str] = None,
+    order: str = "asc",
+    limit: int = 50,
+    offset: int = 0,
+) -> Response:
+    """
+    Events overlapping [start, end] (years CE, BCE negative), filtered by
+    era, figure id, words mentioned and tag, one page at a time:
+
+        /timeline/events?start=1700&end=1760&era=Treaty Era&q=Membertou
+
+    Returns:
+        { total, offset, limit, events: [ {id, title, era, start, end,
+                                           date_display, tags, people, ...}, ... ] }
+    """
+    if start is not None and end is not None and start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    etag = make_etag("timeline", timeline.version, start, end, era, figure, q, tag, order, limit, offset)
+    return cached_json_response(
+        request,
+        etag,
+        lambda: timeline.query(
+            start=start, end=end, era=era, figure=figure, mention=q, tag=tag,
+            order=order, offset=offset, limit=limit,
+        ),
+    )
+
+
+@app.get("/timeline/events/{event_id}")
+def timeline_event(event_id: str, request: Request) -> Response:
+    """One event with its full original record (summaries, people, sources)."""
+    event = timeline.get(event_id)
+    if event is None:
+        raise HTTPException(status_code=404, detail=f"no timeline event {event_id!r}")
+    return cached_json_response(request, make_etag("timeline-event", timeline.version, event_id), event.to_dict)
+
+
+@app.get("/timeline/eras")
+def timeline_eras() -> Dict[str, Any]:
+    """Eras with their event counts and date spans."""
+    return {"eras": timeline.era_stats()}
+
+
+@app.get("/timeline/figures")
+def timeline_figures() -> Dict[str, Any]:
+    """Historical figures and how many events mention each."""
+    return {"figures": timeline.figure_list()}
+
+
+@app.get("/timeline/figures/{figure_id}")
+def timeline_figure(figure_id: str) -> Dict[str, Any]:
+    """A figure's biography plus the events about them, in date order."""
+    fig = timeline.figure(figure_id)
+    if fig is None:
+        raise HTTPException(status_code=404, detail=f"no figure {figure_id!r}")
+    return fig
+
+
+# ---------------------------------------------------------------------
+# Editor sessions: incremental re-annotation
+# ---------------------------------------------------------------------
+#
+# Sessions live in the worker that created them.  Behind several workers
+# without sticky routing, a 404 just means "open a new session with the
+# full text".
+
+@app.post("/sessions")
+def create_session(req: CreateSessionRequest, request: Request) -> Dict[str, Any]:
+    """
+    Open an annotation session for a document.  The dialect
+    (X-Lnu-Dialect or ?dialect=) is fixed for the session's lifetime.
+
+    Returns:
+        { session_id, version, length, text,
+          sentences: [ {id, start, end, text,
+                        tokens: [ {token, start, end, analysis}, ... ]}, ... ] }
+    """
+    try:
+        session_id, state = sessions.create(req.text, _translator_for(request))
+    except ValueError as exc:
+        raise HTTPException(status_code=413, detail=str(exc))
+    return {"session_id": session_id, **state}
+
+
+@app.post("/sessions/{session_id}/edits")
+def edit_session(session_id: str, req: EditSessionRequest) -> Dict[str, Any]:
+    """
+    Apply text diffs ({start, end, text}: replace text[start:end]) in order
+    and return only what changed.
+
+    Returns:
+        { session_id, version, length,
+          changed: [ <sentence, same shape as POST /sessions> ... ],
+          removed: [ sentence ids ] }
+
+    Sentences not listed keep their id and annotations; their offsets move
+    by the edits' length change.
+    """
+    try:
+        result = sessions.edit(session_id, [{"start": e.start, "end": e.end, "text": e.text} for e in req.edits], req.version)
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="unknown or expired session")
+    except EditConflict as exc:
+        raise HTTPException(status_code=409, detail=str(exc))
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    return {"session_id": session_id, **result}
+
+
+@app.get("/sessions/{session_id}")
+def get_session(session_id: str) -> Dict[str, Any]:
+    """Full current state of a session (to resync a client)."""
+    try:
+        return {"session_id": session_id, **sessions.get(session_id)}
+    except SessionNotFound:
+        raise HTTPException(status_code=404, detail="unknown or expired session")
+
+
+@app.delete("/sessions/{session_id}")
+def close_session(session_id: str) -> Dict[str, Any]:
+    return {"session_id": session_id, "closed": sessions.close(session_id)}
 
 
 @app.post("/generate-term")
-def generate_term(req: GenerateTermRequest) -> Dict[str, Any]:
+def generate_term(req: GenerateTermRequest, request: Request) -> Dict[str, Any]:
     """
-    Propose Mi'kmaw-style words for a modern concept (e.g. refrigerator).
+    Propose Mi'kmaw-style words for a modern concept (e.g. refrigerator);
+    dialect via X-Lnu-Dialect or ?dialect=.
+
+    With `search: true`, also explores preverb + root + final combinations
+    from the morpheme inventory ("combinations" in the response).  With
+    `stream: true` the answer is NDJSON instead: one
+    {"kind": "pattern"|"search", "candidate": {...}} object per line, sent
+    as soon as each candidate is ready.
 
     NOTE: All results are **prototypes** and must be checked with
     fluent speakers and elders before real-world use.
     """
+    tx = _translator_for(request)
     payload = {
         "concept": req.concept,
         "purpose": req.purpose,
         "domain_tags": req.domain_tags,
+        "top_k": req.top_k,
     }
-    return translator.generate_term_for_api(payload)
+    if req.stream:
+        return StreamingResponse(
+            _stream_term_candidates(req, payload, tx),
+            media_type="application/x-ndjson",
+        )
+
+    result = _generate_term(payload, tx)
+    if req.search:
+        result["combinations"] = [c.to_dict() for c in _search_combinations(req)]
+    return result
+
+
+def _search_combinations(req: GenerateTermRequest):
+    _refresh_derived()
+    return coinage.generate(
+        GenerationRequest(req.concept, req.purpose, req.domain_tags),
+        max_candidates=max(0, min(req.max_candidates, 500)),
+        time_budget=max(0, min(req.time_budget_ms, 5000)) / 1000.0,
+    )
+
+
+def _stream_term_candidates(
+    req: GenerateTermRequest, payload: Dict[str, Any], tx: LnuTranslator = translator
+) -> Iterator[str]:
+    for cand in _generate_term(payload, tx)["candidates"]:
+        yield json.dumps({"kind": "pattern", "candidate": cand}) + "\n"
+    if req.search:
+        for cand in _search_combinations(req):
+            yield json.dumps({"kind": "search", "candidate": cand.to_dict()}) + "\n"
+
+
+# ---------------------------------------------------------------------
+# Admin
+# ---------------------------------------------------------------------
+
+# LNU_ADMIN_TOKEN is one shared token (edits are recorded as author
+# "admin"); LNU_ADMIN_TOKENS="name:token,name:token" gives each editor
+# their own, so the audit trail records who made each edit.  With neither
+# set the read-only admin routes are open (local dev) and writes are off.
+#
+# serve.py sets LNU_SERVE_WORKERS; more than one worker without a shared
+# LNU_LEXICON_LOG means edits would only reach one of them.
+SERVE_WORKERS = int(os.environ.get("LNU_SERVE_WORKERS", "1"))
+
+
+def _admin_tokens() -> Dict[str, str]:
+    """token -> author name"""
+    tokens: Dict[str, str] = {}
+    if os.environ.get("LNU_ADMIN_TOKEN"):
+        tokens[os.environ["LNU_ADMIN_TOKEN"]] = "admin"
+    for item in os.environ.get("LNU_ADMIN_TOKENS", "").split(","):
+        name, _, secret = item.strip().partition(":")
+        if name and secret:
+            tokens[secret] = name
+    return tokens
+
+
+def _check_admin(token: Optional[str], write: bool = False) -> str:
+    """The author the token belongs to; 403 for a wrong token, 503 for writes with none configured."""
+    tokens = _admin_tokens()
+    if not tokens:
+        if write:
+            raise HTTPException(
+                status_code=503, detail="admin writes are disabled: set LNU_ADMIN_TOKEN or LNU_ADMIN_TOKENS"
+            )
+        return ""
+    for secret, name in tokens.items():
+        if token is not None and hmac.compare_digest(token.encode("utf-8"), secret.encode("utf-8")):
+            return name
+    raise HTTPException(status_code=403, detail="admin token required")
+
+
+def _check_lexicon_writable() -> None:
+    if not translator.versions.path and SERVE_WORKERS > 1:
+        raise HTTPException(
+            status_code=503,
+            detail="lexicon edits need LNU_LEXICON_LOG when serving with more than one worker",
+        )
+
+
+@app.get("/admin/unknown-words")
+def admin_unknown_words(
+    limit: int = 100,
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Review queue: the unknown words looked up most, across all workers
+    (merged from LNU_UNKNOWN_WORDS_DIR when set).  Counts are estimates
+    that may overcount by up to `error_bound`, never undercount.
+
+    Returns:
+        { lookups, tracked, capacity, sketch, error_bound,
+          words: [ {word, spelling, count, first_seen, last_seen}, ... ] }
+    """
+    _check_admin(x_admin_token)
+    live = translator.unknown_words
+    merged = (
+        UnknownWordTracker.merged_from_dir(live.snapshot_dir, live=live)
+        if live.snapshot_dir
+        else live
+    )
+    return {**merged.stats(), "words": merged.top(max(1, min(limit, 1000)))}
+
+
+@app.put("/admin/lexicon/{headword}")
+def admin_edit_entry(
+    headword: str,
+    req: LexiconEntryEdit,
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Add or correct a core lexicon entry.  Creates a new lexicon version;
+    earlier versions stay queryable with as_of.
+
+    Returns:
+        { headword, revision, lexicon_version }
+    """
+    author = _check_admin(x_admin_token, write=True)
+    _check_lexicon_writable()
+    data = {
+        "english": req.english,
+        "part_of_speech": req.part_of_speech,
+        "animacy": req.animacy,
+        "morphemes": [
+            {"surface": m.surface, "gloss": m.gloss, "role": m.role, "notes": m.notes}
+            for m in req.morphemes
+        ],
+        "register": req.register_,
+        "worldview_tags": req.worldview_tags,
+        "examples": req.examples,
+    }
+    revision = translator.edit_entry(headword, data, author=author, note=req.note)
+    _refresh_derived()
+    return {"headword": headword, "revision": revision, "lexicon_version": translator.lexicon_version_at(revision)}
+
+
+@app.delete("/admin/lexicon/{headword}")
+def admin_delete_entry(
+    headword: str,
+    note: str = "",
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """Remove a core lexicon entry (as a new version; history is kept)."""
+    author = _check_admin(x_admin_token, write=True)
+    _check_lexicon_writable()
+    try:
+        revision = translator.edit_entry(headword, None, author=author, note=note)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"no entry {headword!r}")
+    _refresh_derived()
+    return {"headword": headword, "revision": revision, "lexicon_version": translator.lexicon_version_at(revision)}
+
+
+@app.get("/admin/lexicon/{headword}/history")
+def admin_entry_history(
+    headword: str,
+    x_admin_token: Optional[str] = Header(default=None),
+) -> Dict[str, Any]:
+    """
+    Audit trail of one headword, oldest first.
+
+    Returns:
+        { headword, history: [ {version, ts, author, note, entry}, ... ] }
+        (entry null = deleted; no history = never edited since version 0)
+    """
+    _check_admin(x_admin_token)
+    translator.versions.refresh()
+    return {"headword": headword, "history": translator.versions.history(headword)}
 
 
 # ---------------------------------------------------------------------
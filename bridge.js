@@ -11,8 +11,71 @@ function lookupLocalWord(word) {
   );
 }
 
-function explainWord(word) {
-  const entry = lookupLocalWord(word);
+// Static lexicon export written by `python export_static.py`: a small
+// manifest plus content-hashed shards keyed by normalized prefix. Only the
+// shard for the word being looked up is fetched. Falls back to lexicon.js
+// when no export has been published.
+const STATIC_LEXICON_BASE = 'lexicon-static/';
+let manifestPromise = null;
+const shardPromises = new Map();
+
+function loadManifest() {
+  if (!manifestPromise) {
+    manifestPromise = fetch(`${STATIC_LEXICON_BASE}manifest.json`, { cache: 'no-cache' })
+      .then((res) => (res.ok ? res.json() : null))
+      .catch(() => null);
+  }
+  return manifestPromise;
+}
+
+// Same as orthography.normalize() in Python, using the map and the g -> k
+// letter set from the manifest.
+function normalizeKey(word, charMap, foldLetters = '') {
+  let out = '';
+  for (const ch of word.normalize('NFC').trim().toLowerCase()) out += charMap[ch] ?? ch;
+  let depth = 0; // inside "( ... )": an English gloss, never folded
+  return out
+    .split(/\s+/)
+    .filter(Boolean)
+    .map((tok) => {
+      const inGloss = depth > 0 || tok.startsWith('(');
+      depth = Math.max(0, depth + (tok.split('(').length - 1) - (tok.split(')').length - 1));
+      const mikmaw = [...tok].every((c) => !/\p{L}/u.test(c) || foldLetters.includes(c));
+      return foldLetters && !inGloss && tok.includes('g') && mikmaw ? tok.replaceAll('g', 'k') : tok;
+    })
+    .join(' ');
+}
+
+function shardPrefix(key, length) {
+  const letters = [...key].filter((c) => !" '-".includes(c));
+  return letters.slice(0, length).join('').padEnd(length, '_');
+}
+
+async function lookupStaticWord(word) {
+  const manifest = await loadManifest();
+  if (!manifest) return undefined; // no static export published
+  const key = normalizeKey(word, manifest.normalize || {}, manifest.fold_g_letters || '');
+  const file = manifest.shards[shardPrefix(key, manifest.prefix_length)];
+  if (!file) return null;
+  if (!shardPromises.has(file)) {
+    shardPromises.set(
+      file,
+      fetch(STATIC_LEXICON_BASE + file).then((res) => (res.ok ? res.json() : { keys: {}, records: [] }))
+    );
+  }
+  const shard = await shardPromises.get(file);
+  const hits = shard.keys[key];
+  return hits ? shard.records[hits[0]] : null;
+}
+
+async function lookupWord(word) {
+  if (!word || !word.trim()) return null;
+  const hit = await lookupStaticWord(word);
+  return hit === undefined ? lookupLocalWord(word) : hit;
+}
+
+async function explainWord(word) {
+  const entry = await lookupWord(word);
   if (entry) {
     return {
       from: 'lexicon',
@@ -35,38 +98,86 @@ function explainWord(word) {
   };
 }
 
-function generateConceptCandidates(concept, purpose = '') {
-  const text = `${concept || ''} ${purpose || ''}`.toLowerCase();
-  const candidates = [];
-
-  if (text.includes('refrigerator') || text.includes('keeps food cold') || text.includes('cold')) {
-    candidates.push({
-      word: 'Mesentaqtekekim',
-      breakdown: [
-        { piece: 'mesen-', gloss: 'keep / maintain' },
-        { piece: 'taq-', gloss: 'inside / container-like space' },
-        { piece: 'tekek', gloss: 'it is cold' },
-        { piece: '-im', gloss: 'instrument / thing that does this' },
-      ],
-      explanation:
-        'A prototype for “the thing that keeps the inside cold.” Aligns with the purpose of a refrigerator without claiming to be an established term.',
-      caution: 'Prototype only – MUST be checked with fluent speakers / elders.',
-    });
-  } else {
-    candidates.push({
-      word: 'Apoqnmatultimik',
-      breakdown: [
-        { piece: 'apoqnmatulti-', gloss: 'to support / help / make easier' },
-        { piece: '-m', gloss: 'instrument / tool (pattern)' },
-        { piece: '-ik', gloss: 'nominal ending (pattern)' },
-      ],
-      explanation:
-        'Pattern-only prototype suggesting “a helper tool.” Adapt pieces to fit the specific concept with fluent speakers.',
-      caution: 'Prototype only – MUST be checked with fluent speakers / elders.',
-    });
+// Concept patterns are shared with translator.py (generation_patterns.json),
+// so the static site and the API propose the same candidates.
+const STOP_WORDS = new Set(
+  ('a an and are as at be by for from has have in into is it its of on or ' +
+    'so that the their them they this to was were which while with').split(' ')
+);
+
+let patternLibraryPromise = null;
+
+function compilePatterns(data) {
+  const patterns = data.patterns || [];
+  const keywordIndex = new Map();
+  const tagIndex = new Map();
+  const fallbacks = [];
+  const post = (index, key, i, weight) => {
+    const k = key.toLowerCase();
+    if (!index.has(k)) index.set(k, []);
+    index.get(k).push([i, weight]);
+  };
+  patterns.forEach((p, i) => {
+    if (p.fallback) fallbacks.push(i);
+    Object.entries(p.keywords || {}).forEach(([k, w]) => post(keywordIndex, k, i, w));
+    Object.entries(p.domain_tags || {}).forEach(([t, w]) => post(tagIndex, t, i, w));
+  });
+  return { patterns, keywordIndex, tagIndex, fallbacks };
+}
+
+function loadPatternLibrary() {
+  if (!patternLibraryPromise) {
+    patternLibraryPromise = fetch('generation_patterns.json')
+      .then((res) => (res.ok ? res.json() : { patterns: [] }))
+      .catch(() => ({ patterns: [] }))
+      .then(compilePatterns);
   }
+  return patternLibraryPromise;
+}
+
+function tokenizeText(text) {
+  return (text.toLowerCase().match(/[a-z0-9']+/g) || [])
+    .map((w) => w.replace(/^'+|'+$/g, ''))
+    .filter((w) => w && !STOP_WORDS.has(w));
+}
+
+async function generateConceptCandidates(concept, purpose = '', domainTags = [], topK = null) {
+  const lib = await loadPatternLibrary();
+  const scores = new Map();
+  const bump = (postings) =>
+    (postings || []).forEach(([i, w]) => scores.set(i, (scores.get(i) || 0) + w));
+
+  const seen = new Set();
+  [...tokenizeText(concept || ''), ...tokenizeText(purpose || '')].forEach((word) => {
+    const variants =
+      word.length > 3 && word.endsWith('s') && !word.endsWith('ss') ? [word, word.slice(0, -1)] : [word];
+    variants.forEach((v) => {
+      if (seen.has(v)) return;
+      seen.add(v);
+      bump(lib.keywordIndex.get(v));
+    });
+  });
+  new Set(domainTags.map((t) => t.trim().toLowerCase())).forEach((t) => bump(lib.tagIndex.get(t)));
+
+  const ranked = [];
+  scores.forEach((score, i) => {
+    const p = lib.patterns[i];
+    if (!p.fallback && score >= (p.min_score ?? 1)) ranked.push({ i, p, score });
+  });
+  lib.fallbacks.forEach((i) => {
+    const p = lib.patterns[i];
+    ranked.push({ i, p, score: (p.base_score || 0) + (scores.get(i) || 0) });
+  });
+  ranked.sort((a, b) => Number(a.p.fallback || 0) - Number(b.p.fallback || 0) || b.score - a.score || a.i - b.i);
 
-  return candidates;
+  return (topK == null ? ranked : ranked.slice(0, topK)).map(({ p, score }) => ({
+    word: p.word,
+    breakdown: (p.morphemes || []).map((m) => ({ piece: m.surface, gloss: m.gloss })),
+    explanation: p.explanation,
+    caution: p.caution,
+    score,
+    pattern_id: p.id,
+  }));
 }
 
 function renderMorphology(list) {
@@ -177,7 +288,7 @@ function renderResults(container, content) {
   container.innerHTML = content;
 }
 
-function handleExplain() {
+async function handleExplain() {
   const mode = document.getElementById('mode-select').value;
   const mainInput = document.getElementById('main-input').value.trim();
   const purpose = document.getElementById('purpose-input').value.trim();
@@ -189,10 +300,10 @@ function handleExplain() {
   }
 
   if (mode === 'mikmaq') {
-    const explanation = explainWord(mainInput);
+    const explanation = await explainWord(mainInput);
     renderResults(results, renderWordCard(explanation));
   } else {
-    const candidates = generateConceptCandidates(mainInput, purpose);
+    const candidates = await generateConceptCandidates(mainInput, purpose);
     renderResults(results, renderConceptCandidates(mainInput, candidates));
   }
 }
@@ -211,4 +322,4 @@ function wireUI() {
 
 wireUI();
 
-export { lookupLocalWord, explainWord, generateConceptCandidates };
+export { lookupLocalWord, lookupWord, explainWord, generateConceptCandidates };
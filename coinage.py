@@ -0,0 +1,319 @@
+"""
+coinage.py
+
+Search-based generator for new-word candidates.
+
+generate_modern_term() only proposes the handful of patterns in
+generation_patterns.json.  For real coinage work we want to explore every
+
+    [preverb] + root [+ root] + final
+
+combination from the morpheme inventory that fits a concept's purpose.
+That space blows up fast, so instead of listing it we search it:
+
+    • beam search – each step keeps only the best `beam_width` partial words
+    • pruning     – a partial word is dropped as soon as it breaks role order
+                    (preverb → root(s) → final) or can no longer become valid
+                    Smith-Francis orthography (orthography.py automaton)
+    • memoization – the surface form and automaton state of each partial
+                    composition are computed once; longer words that start
+                    with it only feed their new morpheme to the automaton
+    • budgets     – a time budget and a candidate budget stop the search
+
+Candidates are yielded as soon as they are complete, so callers (e.g.
+/generate-term with stream=true) can send the first results right away.
+
+Inventory = lnu_bridge.MORPHEMES + morphemes used in translator.py's lexicon
+and generation patterns.  Relevance is gloss-word overlap with the request
+plus, with NumPy, vector similarity to it (morpheme_vectors.py), so
+morphemes whose glosses are only close to the purpose still rank.
+
+Everything produced here is a brainstorming prototype.  It MUST be checked
+with fluent speakers / elders before real-world use.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import lnu_bridge
+import orthography
+from term_generation import tokenize_text, word_variants
+from translator import (
+    GenerationCandidate,
+    GenerationRequest,
+    LnuTranslator,
+    Morpheme,
+)
+
+
+# slot a morpheme can fill, by the role/type names used across the repo
+ROLE_SLOTS = {
+    "preverb": "preverb",
+    "root": "root",
+    "root-ish": "root",
+    "suffix": "final",
+    "final": "final",
+}
+
+# finals that build things/states rather than inflect for person/number;
+# only these can fill the final slot of a coinage
+DERIVATIONAL_HINTS = ("instrument", "device", "thing", "make", "cause", "state", "condition")
+# glosses of person / number / object inflections ("1→2 object",
+# "animate plural", "I am ..."): never derivational, whatever else they say
+INFLECTIONAL_HINTS = ("→", "->", "plural", "singular", "object", "subject", "person",
+                      "obviative", "i am", "you are")
+_DERIVATIONAL_RE = re.compile(r"\b(?:" + "|".join(DERIVATIONAL_HINTS) + ")")
+
+# vector similarity (0..1) is worth this many overlapping gloss words
+SIMILARITY_WEIGHT = 2.0
+
+COINAGE_CAUTION = (
+    "Machine-generated combination. Confirm meaning, phonology and cultural fit "
+    "with fluent Mi'kmaw speakers and elders before any use."
+)
+
+@dataclass(frozen=True)
+class InventoryMorpheme:
+    surface: str    # cleaned form, no boundary hyphens
+    gloss: str
+    slot: str       # "preverb", "root" or "final"
+    source: str     # where it came from
+    gloss_words: frozenset
+    # a person/number ending, not a derivational final: never placed in a coinage
+    inflectional: bool = False
+
+    def to_morpheme(self) -> Morpheme:
+        return Morpheme(self.surface, self.gloss, self.slot, self.source)
+
+
+def _clean_surface(form: str) -> str:
+    return form.strip().strip("-").lower()
+
+
+def is_derivational_final(gloss: str) -> bool:
+    """True if a final with this gloss builds a thing/state (DERIVATIONAL_HINTS)."""
+    g = gloss.lower()
+    if any(h in g for h in INFLECTIONAL_HINTS):
+        return False
+    return _DERIVATIONAL_RE.search(g) is not None
+
+
+def build_inventory(translator: Optional[LnuTranslator] = None) -> List[InventoryMorpheme]:
+    """Collect slot-able morphemes from lnu_bridge and the translator."""
+    raw: List[Tuple[str, str, str, str]] = []
+    for m in lnu_bridge.MORPHEMES:
+        raw.append((m.form, m.gloss, m.type, "lnu_bridge"))
+
+    if translator is not None:
+        for entry in translator.lexicon.values():
+            for m in entry.morphemes or []:
+                raw.append((m.surface, m.gloss, m.role, f"lexicon:{entry.headword}"))
+        for pat in translator.patterns.patterns:
+            if pat.fallback:
+                continue
+            for d in pat.morphemes:
+                raw.append((d["surface"], d.get("gloss", ""), d.get("role", ""), f"pattern:{pat.id}"))
+
+    # an ending that is a person/number inflection anywhere (kesalul's
+    # "-ul", 1→2 object) would read as one in a coinage too, even where
+    # another source glosses the same form derivationally
+    inflected = {
+        _clean_surface(form) for form, gloss, role, _ in raw
+        if ROLE_SLOTS.get(role) == "final" and not is_derivational_final(gloss)
+    }
+
+    seen = set()
+    inventory: List[InventoryMorpheme] = []
+    for form, gloss, role, source in raw:
+        slot = ROLE_SLOTS.get(role)
+        surface = _clean_surface(form)
+        if not slot or not surface or " " in surface or (surface, slot) in seen:
+            continue
+        seen.add((surface, slot))
+        words = set()
+        for w in tokenize_text(gloss):
+            words.update(word_variants(w))
+        inflectional = slot == "final" and surface in inflected
+        inventory.append(InventoryMorpheme(surface, gloss, slot, source, frozenset(words), inflectional))
+    return inventory
+
+
+# allowed next slots, given the last slot and how many roots are in
+def _next_slots(last: Optional[str], roots: int, max_roots: int) -> Tuple[str, ...]:
+    if last is None:
+        return ("preverb", "root")
+    if last == "preverb":
+        return ("root",)
+    if last == "root":
+        return ("root", "final") if roots < max_roots else ("final",)
+    return ()
+
+
+class CoinageGenerator:
+    """
+    Beam search over the morpheme inventory.
+
+        gen = CoinageGenerator.from_translator(get_translator())
+        for cand in gen.generate(req, max_candidates=20):
+            ...
+    """
+
+    def __init__(
+        self,
+        inventory: Iterable[InventoryMorpheme],
+        memo_limit: int = 200_000,
+        retriever=None,
+    ):
+        self.inventory: List[InventoryMorpheme] = list(inventory)
+        # morpheme_vectors.MorphemeRetriever over this same inventory, or None
+        self.retriever = retriever
+        self.by_slot: Dict[str, List[int]] = {"preverb": [], "root": [], "final": []}
+        for i, m in enumerate(self.inventory):
+            if not m.inflectional:
+                self.by_slot[m.slot].append(i)
+        # composition ids -> (surface, SFO automaton state); shared across requests
+        self._memo: Dict[Tuple[int, ...], Tuple[str, int]] = {}
+        self.memo_limit = memo_limit
+        self.memo_hits = 0
+        self.memo_misses = 0
+
+    @classmethod
+    def from_translator(cls, translator: LnuTranslator, **kw) -> "CoinageGenerator":
+        retriever = translator.morpheme_retriever
+        if retriever is not None:
+            return cls(retriever.inventory, retriever=retriever, **kw)
+        return cls(build_inventory(translator), **kw)
+
+    # ------------------ composition ------------------
+
+    def _compose(self, ids: Tuple[int, ...]) -> Tuple[str, int]:
+        """
+        Surface form of a partial composition and the orthography automaton
+        state after reading it (orthography.DEAD = prune).
+        """
+        hit = self._memo.get(ids)
+        if hit is not None:
+            self.memo_hits += 1
+            return hit
+        self.memo_misses += 1
+
+        if len(ids) == 1:
+            surface = self.inventory[ids[0]].surface
+            state, _ = orthography.run(surface)
+        else:
+            left, state = self._compose(ids[:-1])
+            right = self.inventory[ids[-1]].surface
+            # collapse a letter repeated across the boundary (tekek + k...)
+            if left and right and left[-1] == right[0] and left[-1] != "'":
+                right = right[1:]
+            surface = left + right
+            if state != orthography.DEAD:
+                state, _ = orthography.run(right, state)
+
+        if len(self._memo) >= self.memo_limit:
+            self._memo.clear()
+        self._memo[ids] = (surface, state)
+        return surface, state
+
+    # ------------------ scoring ------------------
+
+    def _relevance(self, req: GenerationRequest) -> List[float]:
+        wanted = set()
+        for w in tokenize_text(req.concept) + tokenize_text(req.purpose) + [t.lower() for t in req.domain_tags]:
+            wanted.update(word_variants(w))
+        similarity = None
+        if self.retriever is not None:
+            text = " ".join([req.concept, req.purpose] + [t.replace("_", " ") for t in req.domain_tags])
+            similarity = self.retriever.morpheme_scores(text).tolist()
+        scores = []
+        for i, m in enumerate(self.inventory):
+            s = float(len(m.gloss_words & wanted))
+            if similarity is not None:
+                s += SIMILARITY_WEIGHT * similarity[i]
+            scores.append(s)
+        return scores
+
+    # ------------------ search ------------------
+
+    def generate(
+        self,
+        req: GenerationRequest,
+        beam_width: int = 32,
+        max_roots: int = 2,
+        max_candidates: int = 50,
+        time_budget: float = 0.25,
+        min_relevance: float = 0.0,
+    ) -> Iterator[GenerationCandidate]:
+        """
+        Lazily yield complete candidates, best-scoring partial words first.
+
+        Stops when the beam is exhausted, `max_candidates` have been
+        yielded, or `time_budget` seconds have passed.
+        """
+        deadline = time.monotonic() + time_budget
+        relevance = self._relevance(req)
+        # most relevant morphemes first, so the best completions stream first
+        ordered = {
+            slot: sorted(ids, key=lambda i: -relevance[i])
+            for slot, ids in self.by_slot.items()
+        }
+        produced = 0
+        seen_words = set()
+        if max_candidates <= 0:
+            return
+
+        # state: (score, ids, last slot, number of roots)
+        beam: List[Tuple[float, Tuple[int, ...], Optional[str], int]] = [(0.0, (), None, 0)]
+
+        while beam:
+            expanded: List[Tuple[float, Tuple[int, ...], Optional[str], int]] = []
+            for score, ids, last, roots in beam:
+                for slot in _next_slots(last, roots, max_roots):
+                    for i in ordered[slot]:
+                        if time.monotonic() > deadline:
+                            return
+                        if i in ids:
+                            continue
+                        new_ids = ids + (i,)
+                        surface, state = self._compose(new_ids)
+                        if state == orthography.DEAD:
+                            continue
+                        new_score = score + relevance[i]
+                        if slot == "final":
+                            if new_score < min_relevance or surface in seen_words:
+                                continue
+                            if not orthography.is_accepting(state):
+                                continue
+                            seen_words.add(surface)
+                            yield self._candidate(new_ids, surface, new_score)
+                            produced += 1
+                            if produced >= max_candidates:
+                                return
+                        else:
+                            expanded.append((new_score, new_ids, slot, roots + (slot == "root")))
+            expanded.sort(key=lambda s: -s[0])
+            beam = expanded[:beam_width]
+
+    def _candidate(self, ids: Tuple[int, ...], surface: str, score: float) -> GenerationCandidate:
+        parts = [self.inventory[i] for i in ids]
+        explanation = "Combination: " + " + ".join(f"{m.surface} ({m.gloss})" for m in parts) + "."
+        return GenerationCandidate(
+            word=surface[:1].upper() + surface[1:],
+            breakdown=[m.to_morpheme() for m in parts],
+            explanation=explanation,
+            caution=COINAGE_CAUTION,
+            score=round(score, 3),
+            pattern_id="search",
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "inventory": len(self.inventory),
+            "memo_size": len(self._memo),
+            "memo_hits": self.memo_hits,
+            "memo_misses": self.memo_misses,
+        }
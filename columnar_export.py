@@ -0,0 +1,338 @@
+# columnar_export.py
+#
+# Export the lexicon and bulk sentence annotations as Apache Arrow / Parquet
+# for analysis jobs (pandas, polars, DuckDB, R arrow, ...).
+#
+#   lexicon      one row per entry: headword, POS, animacy, worldview tags
+#                and notes, and the morpheme breakdown as a nested
+#                list<struct>
+#   annotations  one row per token of analyze_sentence() output
+#
+# Rows are written in record batches as they are produced, so exports of
+# millions of tokens run in constant memory.  Parquet (.parquet) is the
+# small, compressed format for storage and exchange; Arrow IPC (.arrow /
+# .feather) is uncompressed and can be memory-mapped by read_table() with
+# no copying.  The IPC file format can't change a dictionary between
+# batches, so there the dictionary-encoded columns are written as plain
+# strings.
+#
+# Needs pyarrow (`pip install pyarrow`); nothing else in the repo does.
+#
+# Usage:
+#     python columnar_export.py lexicon lexicon.parquet
+#     python columnar_export.py annotations sentences.txt tokens.arrow
+#         (one sentence per line; "-" reads stdin)
+
+import argparse
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from translator import LnuTranslator, get_translator
+
+try:  # optional
+    import pyarrow as pa  # type: ignore
+    import pyarrow.parquet as pq  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    pa = pq = None
+
+
+DEFAULT_BATCH_SIZE = 65536
+# analyses remembered per export (tokens repeat a lot in running text)
+ANALYSIS_MEMO_SIZE = 100_000
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise RuntimeError("columnar export needs pyarrow: pip install pyarrow")
+
+
+def _morpheme_type():
+    return pa.list_(pa.struct([
+        ("surface", pa.string()),
+        ("gloss", pa.string()),
+        ("role", pa.string()),
+        ("notes", pa.string()),
+    ]))
+
+
+def lexicon_schema():
+    _require_pyarrow()
+    return pa.schema([
+        ("source", pa.dictionary(pa.int32(), pa.string())),
+        ("headword", pa.string()),
+        ("english", pa.string()),
+        ("pos", pa.dictionary(pa.int32(), pa.string())),
+        ("animacy", pa.dictionary(pa.int32(), pa.string())),
+        ("register", pa.string()),
+        ("worldview_tags", pa.list_(pa.string())),
+        ("worldview_notes", pa.list_(pa.string())),
+        ("morphemes", _morpheme_type()),
+        ("examples", pa.list_(pa.string())),
+        ("needs_review", pa.bool_()),
+    ])
+
+
+def annotation_schema():
+    _require_pyarrow()
+    return pa.schema([
+        ("sentence_id", pa.int64()),
+        ("position", pa.int32()),
+        ("token", pa.string()),
+        ("has_entry", pa.bool_()),
+        ("headword", pa.string()),
+        ("pos", pa.dictionary(pa.int32(), pa.string())),
+        ("animacy", pa.dictionary(pa.int32(), pa.string())),
+        ("animacy_confidence", pa.float32()),
+        ("morphemes", _morpheme_type()),
+        ("guessed_morphemes", _morpheme_type()),
+        ("worldview_notes", pa.list_(pa.string())),
+    ])
+
+
+# ---------------------------------------------------------------------
+# Writing
+# ---------------------------------------------------------------------
+
+def plain_schema(schema):
+    """`schema` with dictionary columns stored as their plain value type."""
+    return pa.schema([
+        pa.field(f.name, f.type.value_type, f.nullable, f.metadata)
+        if pa.types.is_dictionary(f.type) else f
+        for f in schema
+    ])
+
+
+def _format_for(path: str, fmt: Optional[str]) -> str:
+    if fmt:
+        return fmt
+    return "parquet" if path.endswith((".parquet", ".pq")) else "arrow"
+
+
+class BatchWriter:
+    """
+    Buffer rows column-wise and write them out one record batch at a time.
+
+        with BatchWriter("tokens.parquet", annotation_schema()) as w:
+            for row in rows:
+                w.write(row)
+    """
+
+    def __init__(self, path: str, schema, fmt: Optional[str] = None,
+                 batch_size: int = DEFAULT_BATCH_SIZE, compression: str = "zstd"):
+        _require_pyarrow()
+        self.format = _format_for(path, fmt)
+        if self.format == "arrow":
+            # every batch would carry its own dictionary, which IPC files reject
+            schema = plain_schema(schema)
+        self.schema = schema
+        self.batch_size = batch_size
+        self.rows = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name in schema.names}
+        if self.format == "parquet":
+            self._writer = pq.ParquetWriter(path, schema, compression=compression)
+        elif self.format == "arrow":
+            self._sink = pa.OSFile(path, "wb")
+            self._writer = pa.ipc.new_file(self._sink, schema)
+        else:
+            raise ValueError(f"unknown format {self.format!r} (parquet or arrow)")
+
+    def write(self, row: Dict[str, Any]) -> None:
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        if len(column) >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        n = len(next(iter(self._columns.values())))
+        if not n:
+            return
+        batch = pa.RecordBatch.from_pydict(self._columns, schema=self.schema)
+        self._writer.write_batch(batch)
+        self.rows += n
+        for column in self._columns.values():
+            column.clear()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        try:
+            self._writer.close()
+        finally:
+            if self.format == "arrow":
+                self._sink.close()
+
+    def __enter__(self) -> "BatchWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+            return
+        # don't flush the rows that were being written when it failed, and
+        # don't let a failure while closing hide the original error
+        try:
+            self._release()
+        except Exception:
+            pass
+
+
+def _morphemes(items: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "surface": m.get("surface", m.get("piece")),
+            "gloss": m.get("gloss"),
+            "role": m.get("role", m.get("type")),
+            "notes": m.get("notes"),
+        }
+        for m in items
+    ]
+
+
+def lexicon_rows(tx: LnuTranslator) -> Iterator[Dict[str, Any]]:
+    """LEXICON_CORE and LNU_LEXICON entries as flat rows."""
+    for entry in tx.lexicon.values():
+        yield {
+            "source": "core",
+            "headword": entry.headword,
+            "english": entry.english,
+            "pos": entry.part_of_speech,
+            "animacy": entry.animacy,
+            "register": entry.register,
+            "worldview_tags": entry.worldview_tags or [],
+            "worldview_notes": [],
+            "morphemes": [
+                {"surface": m.surface, "gloss": m.gloss, "role": m.role, "notes": m.notes}
+                for m in entry.morphemes
+            ],
+            "examples": entry.examples or [],
+            "needs_review": False,
+        }
+    for entry in tx.story_lexicon:
+        yield {
+            "source": "story",
+            "headword": entry.get("lemma") or entry.get("surface"),
+            "english": entry.get("gloss"),
+            "pos": entry.get("pos"),
+            "animacy": entry.get("animacy"),
+            "register": None,
+            # story entries have free-text notes, not tags
+            "worldview_tags": [],
+            "worldview_notes": entry.get("worldview_notes") or [],
+            "morphemes": _morphemes(entry.get("morphology") or []),
+            "examples": [
+                " – ".join(p for p in (ex.get("mikmaq"), ex.get("english")) if p)
+                for ex in entry.get("examples") or []
+            ],
+            "needs_review": bool(entry.get("needsReview", True)),
+        }
+
+
+def annotation_rows(tx: LnuTranslator, sentences: Iterable[str]) -> Iterator[Dict[str, Any]]:
+    """
+    One row per token, same content as analyze_sentence().  Bulk exports
+    don't count towards the unknown-word review queue.
+    """
+    memo: Dict[str, Dict[str, Any]] = {}
+    for sentence_id, sentence in enumerate(sentences):
+        tokens = tx.tokenize_sentence(sentence)
+        new = list(dict.fromkeys(t for t in tokens if t not in memo))
+        if len(memo) + len(new) > ANALYSIS_MEMO_SIZE:
+            memo.clear()
+            new = list(dict.fromkeys(tokens))
+        # one batched call per sentence (animacy is guessed for all at once)
+        for token, analysis in zip(new, tx.analyze_words(new, track=False)):
+            a = analysis.to_dict()
+            entry = a["entry"] or {}
+            memo[token] = {
+                "token": token,
+                "has_entry": a["has_entry"],
+                "headword": entry.get("headword"),
+                "pos": entry.get("part_of_speech"),
+                "animacy": a["animacy_guess"],
+                "animacy_confidence": a["animacy_confidence"],
+                "morphemes": _morphemes(entry.get("morphemes") or []),
+                "guessed_morphemes": _morphemes(a["guessed_morphemes"]),
+                "worldview_notes": a["worldview_notes"],
+            }
+        for position, token in enumerate(tokens):
+            yield dict(memo[token], sentence_id=sentence_id, position=position)
+
+
+def export_lexicon(path: str, tx: Optional[LnuTranslator] = None, fmt: Optional[str] = None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Write the lexicon to `path`; returns the number of rows."""
+    tx = tx or get_translator()
+    with BatchWriter(path, lexicon_schema(), fmt, batch_size) as writer:
+        for row in lexicon_rows(tx):
+            writer.write(row)
+    return writer.rows
+
+
+def export_annotations(sentences: Iterable[str], path: str, tx: Optional[LnuTranslator] = None,
+                       fmt: Optional[str] = None, batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """Analyze `sentences` (any iterable, read lazily) into `path`; returns token rows."""
+    tx = tx or get_translator()
+    with BatchWriter(path, annotation_schema(), fmt, batch_size) as writer:
+        for row in annotation_rows(tx, sentences):
+            writer.write(row)
+    return writer.rows
+
+
+# ---------------------------------------------------------------------
+# Reading
+# ---------------------------------------------------------------------
+
+def read_table(path: str, columns: Optional[List[str]] = None):
+    """
+    Load an export as a pyarrow.Table, memory-mapped.  Arrow IPC files are
+    read zero-copy straight from the page cache; Parquet is decoded.
+    """
+    _require_pyarrow()
+    if _format_for(path, None) == "parquet":
+        return pq.read_table(path, columns=columns, memory_map=True)
+    table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+    return table.select(columns) if columns else table
+
+
+def iter_batches(path: str, columns: Optional[List[str]] = None):
+    """Yield record batches one at a time, for exports larger than memory."""
+    _require_pyarrow()
+    if _format_for(path, None) == "parquet":
+        yield from pq.ParquetFile(path, memory_map=True).iter_batches(columns=columns)
+        return
+    reader = pa.ipc.open_file(pa.memory_map(path, "r"))
+    for i in range(reader.num_record_batches):
+        batch = reader.get_batch(i)
+        yield batch.select(columns) if columns else batch
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export lexicon / annotations to Arrow or Parquet.")
+    parser.add_argument("--format", choices=["parquet", "arrow"], help="default: from the file extension")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    sub = parser.add_subparsers(dest="what", required=True)
+    lex = sub.add_parser("lexicon", help="one row per lexicon entry")
+    lex.add_argument("out")
+    ann = sub.add_parser("annotations", help="one row per token of analyze_sentence()")
+    ann.add_argument("sentences", help="text file, one sentence per line ('-' for stdin)")
+    ann.add_argument("out")
+    args = parser.parse_args(argv)
+
+    if args.what == "lexicon":
+        rows = export_lexicon(args.out, fmt=args.format, batch_size=args.batch_size)
+    else:
+        fh = sys.stdin if args.sentences == "-" else open(args.sentences, encoding="utf-8")
+        with fh:
+            lines = (line.strip() for line in fh)
+            rows = export_annotations(
+                (line for line in lines if line), args.out, fmt=args.format, batch_size=args.batch_size
+            )
+    print(f"columnar_export.py: {rows} rows -> {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""
+concordance.py
+
+Corpus index over example sentences and ingested story texts.
+
+    • positional inverted index: normalized word -> (document, token position)
+    • keyword-in-context (KWIC) lookups, single words or phrases:
+          "show every sentence containing kataq"
+    • word and morpheme frequency tables
+
+Documents are added incrementally – add_document() only touches the new
+text, nothing is rebuilt.  Everything per token is kept in flat
+array('I') columns rather than Python objects, so a million-token corpus
+stays in the tens of megabytes, and a lookup costs one dict hit plus a walk
+over that word's postings.
+
+Words are compared SFO-normalized (orthography.normalize), so Mi’kmaq and
+Mi'kmaq, or gesig and kesik, are the same word.
+
+Texts added through append_document() also go to an append-only JSONL
+log when one is attached (load_log); several workers can share it, and
+refresh() (one stat call) indexes what the others appended.
+"""
+
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import threading
+from array import array
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import orthography
+
+try:  # optional (not on Windows)
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+
+@dataclass
+class _Document:
+    title: str
+    source: str
+    text: str
+    words: array      # normalized word id per token
+    starts: array     # char offset where each token starts
+    ends: array       # char offset where each token ends
+    sentences: array  # token index where each sentence starts
+
+
+_SENTENCE_END = ".!?\n"
+
+
+class CorpusIndex:
+    """
+    Incremental positional index.
+
+        corpus = CorpusIndex.from_translator(get_translator())
+        corpus.add_document(story_text, title="Kataq")
+        corpus.concordance("kataq", window=5)
+        corpus.frequencies(limit=20)
+    """
+
+    def __init__(self, morpheme_splitter: Optional[Callable[[str], List[str]]] = None):
+        # morpheme_splitter(word) -> morpheme forms; enables morpheme counts
+        self.morpheme_splitter = morpheme_splitter
+        self._word_ids: Dict[str, int] = {}
+        self._words: List[str] = []
+        self._post_docs: List[array] = []
+        self._post_pos: List[array] = []
+        self._morphemes_of: List[Tuple[str, ...]] = []
+        self._morpheme_counts: Dict[str, int] = {}
+        self._docs: List[_Document] = []
+        self.tokens = 0
+        self._lock = threading.RLock()
+        # shared log of added documents (load_log), and how far we have read
+        self.path: Optional[str] = None
+        self._offset = 0
+        self.logged_documents = 0
+
+    @classmethod
+    def from_translator(cls, tx) -> "CorpusIndex":
+        """Index every example sentence in LEXICON_CORE and LNU_LEXICON."""
+
+        def split(word: str) -> List[str]:
+            # only morphemes the lexicon records; guesses for unknown words
+            # would count whole words and fragments as morphemes
+            res = tx.analyze_word(word, track=False)
+            if res.entry is None:
+                return []
+            return [m.surface.strip("-").lower() for m in res.entry.morphemes if m.surface.strip("-")]
+
+        corpus = cls(morpheme_splitter=split)
+        for hw, entry in tx.lexicon.items():
+            for ex in entry.examples or []:
+                # "Mi'kmaw sentence – English" -> index the Mi'kmaw part
+                corpus.add_document(ex.split(" – ")[0], title=hw, source="translator.py")
+        for entry in tx.story_lexicon:
+            for ex in entry.get("examples") or []:
+                if ex.get("mikmaq"):
+                    corpus.add_document(
+                        ex["mikmaq"], title=entry.get("lemma", ""), source=entry.get("source", "")
+                    )
+        return corpus
+
+    def rebuilt(self, tx) -> "CorpusIndex":
+        """
+        A fresh from_translator(tx) index (e.g. after a lexicon edit) that
+        keeps every document added to this one, and its place in the log.
+        """
+        fresh = type(self).from_translator(tx)
+        with self._lock:
+            start = len(self._docs) - self.logged_documents
+            for doc in self._docs[start:]:
+                fresh.add_document(doc.text, doc.title, doc.source)
+            fresh.path, fresh._offset = self.path, self._offset
+            fresh.logged_documents = self.logged_documents
+        return fresh
+
+    # ------------------ building ------------------
+
+    def _word_id(self, word: str) -> int:
+        wid = self._word_ids.get(word)
+        if wid is None:
+            wid = len(self._words)
+            self._word_ids[word] = wid
+            self._words.append(word)
+            self._post_docs.append(array("I"))
+            self._post_pos.append(array("I"))
+            morphemes: Tuple[str, ...] = ()
+            if self.morpheme_splitter is not None:
+                morphemes = tuple(self.morpheme_splitter(word))
+            self._morphemes_of.append(morphemes)
+        return wid
+
+    def add_document(self, text: str, title: str = "", source: str = "") -> int:
+        """Tokenize and index one document; returns its id."""
+        words, starts, ends, sentences = array("I"), array("I"), array("I"), array("I")
+        with self._lock:
+            doc_id = len(self._docs)
+            last_end = 0
+            for match in orthography.WORD_RE.finditer(text):
+                if not sentences or any(c in _SENTENCE_END for c in text[last_end:match.start()]):
+                    sentences.append(len(words))
+                wid = self._word_id(orthography.normalize(match.group()))
+                self._post_docs[wid].append(doc_id)
+                self._post_pos[wid].append(len(words))
+                for m in self._morphemes_of[wid]:
+                    self._morpheme_counts[m] = self._morpheme_counts.get(m, 0) + 1
+                words.append(wid)
+                starts.append(match.start())
+                ends.append(match.end())
+                last_end = match.end()
+            self._docs.append(_Document(title, source, text, words, starts, ends, sentences))
+            self.tokens += len(words)
+        return doc_id
+
+    def add_documents(self, docs: Iterable[Tuple[str, str, str]]) -> List[int]:
+        """Add (text, title, source) triples."""
+        return [self.add_document(text, title, source) for text, title, source in docs]
+
+    # ------------------ shared log ------------------
+
+    @staticmethod
+    def _flock(fh, lock: bool) -> None:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+    def load_log(self, path: str) -> int:
+        """Attach the JSONL log at `path` and index what is in it; returns how many documents."""
+        with self._lock:
+            self.path, self._offset = path, 0
+            if not os.path.exists(path):
+                return 0
+            with open(path, "rb") as fh:
+                self._replay(fh)
+            return self.logged_documents
+
+    def _replay(self, fh) -> None:
+        """Index every complete record after self._offset."""
+        fh.seek(self._offset)
+        for line in fh.read().splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # another worker is mid-write
+            self._offset += len(line)
+            record = json.loads(line)
+            self.add_document(record["text"], record.get("title", ""), record.get("source", ""))
+            self.logged_documents += 1
+
+    def refresh(self) -> None:
+        """Index documents other workers appended to the log."""
+        if not self.path or not os.path.exists(self.path) or os.path.getsize(self.path) <= self._offset:
+            return
+        with self._lock, open(self.path, "rb") as fh:
+            self._replay(fh)
+
+    def append_document(self, text: str, title: str = "", source: str = "") -> int:
+        """add_document(), also written to the log (if any) so every worker and restart sees it."""
+        with self._lock:
+            if not self.path:
+                self.logged_documents += 1
+                return self.add_document(text, title, source)
+            line = (json.dumps({"text": text, "title": title, "source": source},
+                               ensure_ascii=False) + "\n").encode("utf-8")
+            with open(self.path, "a+b") as fh:
+                self._flock(fh, True)
+                try:
+                    # other workers may have appended since our last refresh
+                    self._replay(fh)
+                    fh.write(line)
+                    fh.flush()
+                    os.fsync(fh.fileno())
+                    self._offset += len(line)
+                finally:
+                    self._flock(fh, False)
+            self.logged_documents += 1
+            return self.add_document(text, title, source)
+
+    # ------------------ queries ------------------
+
+    def _phrase_hits(self, query: str) -> List[Tuple[int, int, int]]:
+        """(doc, first token, token count) for every occurrence of the phrase."""
+        terms = [orthography.normalize(w) for w in orthography.WORD_RE.findall(query)]
+        if not terms:
+            return []
+        ids = [self._word_ids.get(t) for t in terms]
+        if any(i is None for i in ids):
+            return []
+        # walk the rarest word's postings and check the others by position
+        pivot = min(range(len(ids)), key=lambda j: len(self._post_docs[ids[j]]))
+        hits = []
+        for doc_id, pos in zip(self._post_docs[ids[pivot]], self._post_pos[ids[pivot]]):
+            start = pos - pivot
+            words = self._docs[doc_id].words
+            if start < 0 or start + len(ids) > len(words):
+                continue
+            if all(words[start + j] == ids[j] for j in range(len(ids))):
+                hits.append((doc_id, start, len(ids)))
+        return hits
+
+    def _sentence_span(self, doc: _Document, pos: int) -> Tuple[int, int]:
+        # sentence containing token `pos`, as char offsets
+        lo, hi = 0, len(doc.sentences)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if doc.sentences[mid] <= pos:
+                lo = mid + 1
+            else:
+                hi = mid
+        first = doc.sentences[lo - 1]
+        last = (doc.sentences[lo] if lo < len(doc.sentences) else len(doc.words)) - 1
+        end = doc.ends[last]
+        while end < len(doc.text) and doc.text[end] in _SENTENCE_END.strip():
+            end += 1
+        return doc.starts[first], end
+
+    def concordance(
+        self, query: str, window: int = 5, limit: int = 50, offset: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Keyword-in-context lines for a word or phrase.
+
+        Returns { query, total, hits: [ {doc, title, source, position,
+        left, keyword, right, sentence}, ... ] }
+        """
+        with self._lock:
+            hits = self._phrase_hits(query)
+            page = []
+            for doc_id, pos, n in hits[offset: offset + limit]:
+                doc = self._docs[doc_id]
+                kw_start, kw_end = doc.starts[pos], doc.ends[pos + n - 1]
+                left_start = doc.starts[max(0, pos - window)]
+                right_end = doc.ends[min(len(doc.words), pos + n + window) - 1]
+                s_start, s_end = self._sentence_span(doc, pos)
+                page.append({
+                    "doc": doc_id,
+                    "title": doc.title,
+                    "source": doc.source,
+                    "position": pos,
+                    "left": doc.text[left_start:kw_start].strip(),
+                    "keyword": doc.text[kw_start:kw_end],
+                    "right": doc.text[kw_end:right_end].strip(),
+                    "sentence": doc.text[s_start:s_end].strip(),
+                })
+        return {"query": query, "total": len(hits), "hits": page}
+
+    def word_counts(self) -> Dict[str, int]:
+        """Normalized word -> number of occurrences."""
+        with self._lock:
+            return {w: len(self._post_docs[i]) for i, w in enumerate(self._words)}
+
+    def frequencies(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most frequent words, with their share of all tokens."""
+        counts = self.word_counts()
+        return self._table(counts, limit)
+
+    def morpheme_frequencies(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most frequent morphemes (needs a morpheme_splitter)."""
+        with self._lock:
+            counts = dict(self._morpheme_counts)
+        return self._table(counts, limit)
+
+    def _table(self, counts: Dict[str, int], limit: int) -> List[Dict[str, Any]]:
+        total = sum(counts.values()) or 1
+        top = heapq.nsmallest(limit, counts.items(), key=lambda kv: (-kv[1], kv[0]))
+        return [{"form": f, "count": c, "share": round(c / total, 6)} for f, c in top]
+
+    def stats(self) -> Dict[str, int]:
+        return {"documents": len(self._docs), "added_documents": self.logged_documents,
+                "tokens": self.tokens, "types": len(self._words)}
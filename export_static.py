@@ -0,0 +1,161 @@
+# export_static.py
+#
+# Build command: export the translator's lexicon for the static site.
+#
+# bridge.js used to import the whole of lexicon.js and Array.find through it
+# on every lookup, while the Python side kept its own lexicons.  This writes
+# ONE export from translator.py's data (LEXICON_CORE + LNU_LEXICON), with the
+# analysis for each entry precomputed, split into small shards by normalized
+# prefix:
+#
+#     <out>/manifest.json          small, fetch with no-cache
+#     <out>/shards/<hash>.json     content-hashed, cache forever
+#
+# The site fetches manifest.json once, then only the shard for the word being
+# looked up, and works without the API.
+#
+# Usage:
+#     python export_static.py                     # -> ./lexicon-static
+#     python export_static.py --out dist/lexicon --prefix-length 3
+
+import argparse
+import hashlib
+import json
+import os
+from typing import Any, Dict, List, Optional
+
+import orthography
+from translator import LnuTranslator, WordEntry, get_translator
+
+DEFAULT_OUT = "lexicon-static"
+
+
+def shard_key(text: str) -> str:
+    """Lookup key: SFO-normalized, same as bridge.js normalizeKey()."""
+    return orthography.normalize(text)
+
+
+def shard_prefix(key: str, length: int) -> str:
+    letters = [c for c in key if c not in " '-"]
+    return "".join(letters[:length]).ljust(length, "_")
+
+
+def _core_record(entry: WordEntry) -> Dict[str, Any]:
+    # translator.py WordEntry -> the lexicon.js shape bridge.js renders
+    roots = [m.surface for m in entry.morphemes if m.role == "root"]
+    examples = []
+    for ex in entry.examples or []:
+        mikmaq, _, english = ex.partition(" – ")
+        examples.append({"mikmaq": mikmaq.strip(), "english": english.strip()})
+    return {
+        "lemma": entry.headword,
+        "surface": entry.headword,
+        "pos": entry.part_of_speech,
+        "gloss": entry.english,
+        "animacy": entry.animacy,
+        "root": " + ".join(roots) or None,
+        "morphology": [
+            {"piece": m.surface, "type": m.role, "gloss": m.gloss} for m in entry.morphemes
+        ],
+        "examples": examples,
+        "source": "translator.py",
+        "worldview_notes": [],
+        "needsReview": True,
+    }
+
+
+def collect_records(tx: LnuTranslator) -> List[Dict[str, Any]]:
+    """Every entry in lexicon.js shape, with its precomputed analysis."""
+    records: List[Dict[str, Any]] = []
+    by_key: Dict[str, Dict[str, Any]] = {}
+
+    for entry in tx.lexicon.values():
+        rec = _core_record(entry)
+        rec["analysis"] = tx.analyze_word(entry.headword, track=False).to_dict()
+        records.append(rec)
+        by_key.setdefault(shard_key(entry.headword), rec)
+
+    for entry in tx.story_lexicon:
+        keys = [shard_key(k) for k in (entry.get("surface"), entry.get("lemma")) if k]
+        core = next((by_key[k] for k in keys if k in by_key), None)
+        if core is not None:
+            # same word in both lexicons: keep the translator's breakdown,
+            # take the story lexicon's notes, examples and review status
+            core["worldview_notes"] = entry.get("worldview_notes") or core["worldview_notes"]
+            core["examples"] = core["examples"] or entry.get("examples") or []
+            core["source"] = entry.get("source") or core["source"]
+            core["needsReview"] = entry.get("needsReview", core["needsReview"])
+            continue
+        rec = dict(entry)
+        rec["analysis"] = tx.analyze_word(entry["surface"], track=False).to_dict()
+        records.append(rec)
+    return records
+
+
+def _dump(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+
+
+def export(out_dir: str = DEFAULT_OUT, prefix_length: int = 2,
+           tx: Optional[LnuTranslator] = None) -> Dict[str, Any]:
+    """Write manifest + shards to `out_dir`; returns the manifest."""
+    tx = tx or get_translator()
+    records = collect_records(tx)
+
+    shards: Dict[str, Dict[str, Any]] = {}
+    for rec in records:
+        keys = sorted({shard_key(k) for k in (rec.get("surface"), rec.get("lemma")) if k})
+        for key in keys:
+            shard = shards.setdefault(shard_prefix(key, prefix_length), {"keys": {}, "records": []})
+            if not shard["records"] or shard["records"][-1] is not rec:
+                shard["records"].append(rec)
+            shard["keys"].setdefault(key, []).append(len(shard["records"]) - 1)
+
+    shard_dir = os.path.join(out_dir, "shards")
+    os.makedirs(shard_dir, exist_ok=True)
+
+    files: Dict[str, str] = {}
+    for prefix in sorted(shards):
+        body = _dump(shards[prefix])
+        name = hashlib.sha256(body).hexdigest()[:16] + ".json"
+        with open(os.path.join(shard_dir, name), "wb") as fh:
+            fh.write(body)
+        files[prefix] = "shards/" + name
+
+    # drop shards from earlier builds
+    live = {os.path.basename(p) for p in files.values()}
+    for name in os.listdir(shard_dir):
+        if name.endswith(".json") and name not in live:
+            os.remove(os.path.join(shard_dir, name))
+
+    manifest = {
+        "format": 1,
+        "lexicon_version": tx.lexicon_version,
+        "entries": len(records),
+        "prefix_length": prefix_length,
+        # character map for normalizeKey() in bridge.js (orthography.py)
+        "normalize": orthography.NORMALIZE_MAP,
+        # tokens made only of these letters get g -> k
+        "fold_g_letters": "".join(sorted(orthography.MIKMAW_LETTERS)),
+        "shards": files,
+    }
+    with open(os.path.join(out_dir, "manifest.json"), "wb") as fh:
+        fh.write(_dump(manifest))
+    return manifest
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Export the lexicon as static, prefix-sharded JSON.")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--prefix-length", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    manifest = export(args.out, args.prefix_length)
+    print(
+        f"export_static.py: {manifest['entries']} entries in {len(manifest['shards'])} shards "
+        f"-> {args.out} (lexicon {manifest['lexicon_version']})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,396 @@
+"""
+heavy_hitters.py
+
+Fixed-memory tracking of the unknown words people look up most – the
+elder review queue.
+
+    • Count-Min Sketch: approximate count for any word, never an
+      undercount, in width × depth counters no matter how much traffic
+    • top-k table: the `capacity` words with the highest sketch estimate
+      (Space-Saving style – a new word replaces the current minimum once
+      its estimate passes it); a min-heap finds that minimum in O(log k)
+
+Both parts merge by adding counters, so each worker keeps its own tracker
+and writes a snapshot to a shared directory; the admin view merges the
+snapshots (see UnknownWordTracker.merged_from_dir).  Snapshot files are
+named <host>-<pid>-<random id>.json, fresh for every process, so a reused
+pid never overwrites a dead worker's counts.  Snapshots of workers that
+have exited (same host, pid gone) are folded into one _archive.json and
+deleted, so the directory does not grow with every restart.  A snapshot
+is only archived once its worker is gone – a live worker keeps rewriting
+its cumulative counts, which would then be counted twice or lost.
+Snapshots from other hosts are left for a compaction on their own host.
+
+Memory: depth × width × 8 bytes for the sketch plus `capacity` words,
+e.g. the defaults are 4 × 4096 × 8 = 128 KiB + 512 words.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import heapq
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import uuid
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import orthography
+
+try:  # optional (not on Windows)
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+ARCHIVE_NAME = "_archive.json"
+
+_process_id: Tuple[int, str] = (-1, "")
+
+
+def snapshot_name() -> str:
+    """This process's snapshot file name; new after a fork."""
+    global _process_id
+    pid = os.getpid()
+    if _process_id[0] != pid:
+        _process_id = (pid, uuid.uuid4().hex[:12])
+    return f"{socket.gethostname()}-{pid}-{_process_id[1]}.json"
+
+
+def _exited(name: str) -> bool:
+    """True if `name` is a snapshot of a process on this host that has exited."""
+    host, _, rest = name[: -len(".json")].rpartition("-")[0].rpartition("-")
+    if host != socket.gethostname() or not rest.isdigit():
+        return False
+    try:
+        os.kill(int(rest), 0)
+    except ProcessLookupError:
+        return True
+    except OSError:
+        pass  # alive, or not ours to signal
+    return False
+
+
+class CountMinSketch:
+    """depth rows of width 64-bit counters; estimate = min over the rows."""
+
+    def __init__(self, width: int = 4096, depth: int = 4):
+        self.width = width
+        self.depth = depth
+        self.total = 0
+        self._rows: List[array] = [array("Q", bytes(8 * width)) for _ in range(depth)]
+
+    def _cells(self, key: str) -> List[int]:
+        # one 8-byte slice of a single digest per row
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=8 * self.depth).digest()
+        return [
+            int.from_bytes(digest[8 * r: 8 * r + 8], "little") % self.width
+            for r in range(self.depth)
+        ]
+
+    def add(self, key: str, count: int = 1) -> int:
+        """Add `count` to `key`; returns the new estimate."""
+        est = None
+        for row, cell in zip(self._rows, self._cells(key)):
+            row[cell] += count
+            est = row[cell] if est is None else min(est, row[cell])
+        self.total += count
+        return est or 0
+
+    def estimate(self, key: str) -> int:
+        return min(row[cell] for row, cell in zip(self._rows, self._cells(key)))
+
+    def merge(self, other: "CountMinSketch") -> None:
+        if (other.width, other.depth) != (self.width, self.depth):
+            raise ValueError("can only merge sketches of the same width and depth")
+        for mine, theirs in zip(self._rows, other._rows):
+            for i, v in enumerate(theirs):
+                if v:
+                    mine[i] += v
+        self.total += other.total
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "width": self.width,
+            "depth": self.depth,
+            "total": self.total,
+            "rows": [base64.b64encode(r.tobytes()).decode("ascii") for r in self._rows],
+        }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "CountMinSketch":
+        sketch = cls(d["width"], d["depth"])
+        sketch.total = d.get("total", 0)
+        for r, blob in enumerate(d["rows"]):
+            row = array("Q")
+            row.frombytes(base64.b64decode(blob))
+            if len(row) != sketch.width:
+                raise ValueError("sketch row has the wrong width")
+            sketch._rows[r] = row
+        return sketch
+
+
+class UnknownWordTracker:
+    """
+    Thread-safe heavy-hitter tracker.
+
+        tracker = UnknownWordTracker(snapshot_dir="/var/lib/lnu/unknown")
+        tracker.add("kesalultes")
+        tracker.top(20)   # -> [{"word", "count", "first_seen", "last_seen"}, ...]
+    """
+
+    def __init__(
+        self,
+        width: int = 4096,
+        depth: int = 4,
+        capacity: int = 512,
+        snapshot_dir: Optional[str] = None,
+        snapshot_interval: float = 30.0,
+    ):
+        self.capacity = capacity
+        self.snapshot_dir = snapshot_dir
+        self.snapshot_interval = snapshot_interval
+        self._sketch = CountMinSketch(width, depth)
+        # normalized word -> [estimate, first_seen, last_seen, spelling as typed]
+        self._top: Dict[str, List[Any]] = {}
+        # (estimate when pushed, word) for every word in _top; estimates only
+        # grow, so an entry whose estimate is out of date is fixed when it
+        # reaches the top
+        self._heap: List[Tuple[int, str]] = []
+        self._lock = threading.Lock()
+        self._last_snapshot = time.time()
+
+    # ------------------ updates ------------------
+
+    def add(self, word: str, count: int = 1) -> None:
+        key = orthography.normalize(word)
+        if not key:
+            return
+        now = time.time()
+        with self._lock:
+            est = self._sketch.add(key, count)
+            self._offer(key, est, now, now, word.strip())
+            due = self.snapshot_dir and now - self._last_snapshot >= self.snapshot_interval
+            if due:
+                self._last_snapshot = now
+        if due:
+            self.save_snapshot()
+
+    def _offer(self, key: str, est: int, first: float, last: float, spelling: str) -> None:
+        item = self._top.get(key)
+        if item is not None:
+            item[0] = est
+            item[1] = min(item[1], first)
+            item[2] = max(item[2], last)
+            return
+        if len(self._top) < self.capacity:
+            self._top[key] = [est, first, last, spelling]
+            heapq.heappush(self._heap, (est, key))
+            return
+        # table full: replace the weakest word if this one now beats it
+        weakest, current = self._weakest()
+        if est > current:
+            heapq.heappop(self._heap)
+            del self._top[weakest]
+            self._top[key] = [est, first, last, spelling]
+            heapq.heappush(self._heap, (est, key))
+
+    def _weakest(self) -> Tuple[str, int]:
+        """The word with the lowest estimate in _top (left at the heap top)."""
+        heap = self._heap
+        while True:
+            est, key = heap[0]
+            current = self._top[key][0]
+            if current == est:
+                return key, est
+            heapq.heapreplace(heap, (current, key))
+
+    def _rebuild_heap(self) -> None:
+        self._heap = [(item[0], key) for key, item in self._top.items()]
+        heapq.heapify(self._heap)
+
+    # ------------------ queries ------------------
+
+    def estimate(self, word: str) -> int:
+        with self._lock:
+            return self._sketch.estimate(orthography.normalize(word))
+
+    def top(self, n: int = 50) -> List[Dict[str, Any]]:
+        with self._lock:
+            rows = sorted(self._top.items(), key=lambda kv: (-kv[1][0], kv[0]))[:n]
+        return [
+            {"word": k, "spelling": v[3], "count": v[0], "first_seen": v[1], "last_seen": v[2]}
+            for k, v in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "lookups": self._sketch.total,
+            "tracked": len(self._top),
+            "capacity": self.capacity,
+            "sketch": f"{self._sketch.depth}x{self._sketch.width}",
+            # every estimate overcounts by at most this, with high probability
+            "error_bound": round(2.718281828 * self._sketch.total / self._sketch.width, 2),
+        }
+
+    # ------------------ merging / snapshots ------------------
+
+    def merge(self, other: "UnknownWordTracker") -> None:
+        """Add another tracker's counts into this one."""
+        with self._lock:
+            self._sketch.merge(other._sketch)
+            for key, (_, first, last, spelling) in list(other._top.items()):
+                self._offer(key, self._sketch.estimate(key), first, last, spelling)
+            # re-estimate every candidate against the merged sketch
+            for key, item in self._top.items():
+                item[0] = self._sketch.estimate(key)
+            self._rebuild_heap()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": 1,
+                "capacity": self.capacity,
+                "sketch": self._sketch.to_dict(),
+                "top": {k: list(v) for k, v in self._top.items()},
+            }
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "UnknownWordTracker":
+        sketch = CountMinSketch.from_dict(d["sketch"])
+        tracker = cls(sketch.width, sketch.depth, d.get("capacity", 512))
+        tracker._sketch = sketch
+        tracker._top = {k: list(v) for k, v in d.get("top", {}).items()}
+        tracker._rebuild_heap()
+        return tracker
+
+    def save_snapshot(self, path: Optional[str] = None) -> Optional[str]:
+        """
+        Write this worker's state to <snapshot_dir>/<snapshot_name()>
+        (atomically).  Counts are cumulative, so the latest snapshot
+        replaces the last one.
+        """
+        if path is None:
+            if not self.snapshot_dir:
+                return None
+            os.makedirs(self.snapshot_dir, exist_ok=True)
+            path = os.path.join(self.snapshot_dir, snapshot_name())
+        fd, tmp = tempfile.mkstemp(prefix=".unknown-", dir=os.path.dirname(os.path.abspath(path)))
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(self.to_dict(), fh)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return path
+
+    @classmethod
+    def _read(cls, path: str) -> Optional["UnknownWordTracker"]:
+        try:
+            with open(path, encoding="utf-8") as fh:
+                return cls.from_dict(json.load(fh))
+        except (OSError, ValueError, KeyError):
+            # half-written or foreign file: skip it
+            return None
+
+    @classmethod
+    def compact_dir(cls, directory: str) -> int:
+        """
+        Fold the snapshots of exited workers on this host into
+        _archive.json and delete them; returns how many.
+        """
+        if not os.path.isdir(directory):
+            return 0
+        own = snapshot_name()
+        with open(os.path.join(directory, ".compact.lock"), "a+b") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            archive_path = os.path.join(directory, ARCHIVE_NAME)
+            data: Dict[str, Any] = {}
+            if os.path.exists(archive_path):
+                try:
+                    with open(archive_path, encoding="utf-8") as fh:
+                        data = json.load(fh)
+                except (OSError, ValueError):
+                    data = {}
+            archive = cls.from_dict(data) if "sketch" in data else None
+            # files already counted in the archive but not yet deleted
+            # (a compaction interrupted between its two steps)
+            done = [n for n in data.get("compacted", []) if os.path.exists(os.path.join(directory, n))]
+            stale = []
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(".json") or name in (ARCHIVE_NAME, own) or name in done:
+                    continue
+                path = os.path.join(directory, name)
+                if not _exited(name):
+                    continue
+                tracker = cls._read(path)
+                if tracker is not None:
+                    if archive is None:
+                        archive = cls.from_dict(tracker.to_dict())
+                    else:
+                        archive.merge(tracker)
+                stale.append(name)
+            if stale or done:
+                if archive is not None:
+                    state = dict(archive.to_dict(), compacted=done + stale)
+                    fd, tmp = tempfile.mkstemp(prefix=".unknown-", dir=directory)
+                    with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                        json.dump(state, fh)
+                    os.replace(tmp, archive_path)
+                for name in done + stale:
+                    try:
+                        os.remove(os.path.join(directory, name))
+                    except OSError:
+                        pass
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+        return len(stale)
+
+    @classmethod
+    def merged_from_dir(
+        cls,
+        directory: str,
+        live: Optional["UnknownWordTracker"] = None,
+    ) -> "UnknownWordTracker":
+        """
+        Merge every snapshot in `directory` (after compact_dir).  If `live`
+        is given, its own snapshot file is skipped and its in-memory state
+        used instead.
+        """
+        cls.compact_dir(directory)
+        merged: Optional[UnknownWordTracker] = None
+        skip = snapshot_name() if live is not None else None
+        compacted: set = set()
+
+        def sources() -> Iterable[Tuple[str, Optional[UnknownWordTracker]]]:
+            if live is not None:
+                yield "live", live
+            if os.path.isdir(directory):
+                # the archive first: it lists files it already counts
+                names = sorted(os.listdir(directory), key=lambda n: (n != ARCHIVE_NAME, n))
+                for name in names:
+                    if name.endswith(".json") and name != skip:
+                        yield name, None
+
+        for name, tracker in sources():
+            if tracker is None:
+                if name in compacted:
+                    continue
+                tracker = cls._read(os.path.join(directory, name))
+                if tracker is None:
+                    continue
+                if name == ARCHIVE_NAME:
+                    with open(os.path.join(directory, name), encoding="utf-8") as fh:
+                        compacted.update(json.load(fh).get("compacted", []))
+            if merged is None:
+                merged = cls.from_dict(tracker.to_dict())
+            else:
+                merged.merge(tracker)
+        return merged or cls()
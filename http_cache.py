@@ -0,0 +1,146 @@
+"""
+http_cache.py
+
+HTTP caching helpers for the read-only GET routes in api.py.
+
+    • strong ETags derived from the lexicon snapshot version + the request,
+      so browsers, CDNs and reverse proxies can cache and revalidate
+    • If-None-Match is answered with 304 *before* the translator runs
+    • bodies are gzip- or brotli-compressed once they pass a size threshold,
+      and each (ETag, encoding) body is kept in a small LRU, bounded in
+      bytes, so repeated requests don't rebuild or recompress it
+
+A strong ETag must differ between byte-different representations, so the
+compressed variants get their own tag ("...-gzip", "...-br").
+
+brotli is optional: `pip install brotli` to enable it; without it only
+gzip is offered.
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Any, Callable, Dict, Optional
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from result_cache import ResultCache
+
+try:  # optional
+    import brotli  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    brotli = None
+
+
+# Bodies smaller than this are sent uncompressed.
+MIN_COMPRESS_SIZE = 1024
+# Cache-Control max-age for cacheable GET answers (seconds).
+MAX_AGE = int(os.environ.get("LNU_HTTP_MAX_AGE", "300"))
+
+# Stored bodies: at most this many bytes in total per worker, and no single
+# body larger than MAX_CACHED_BODY (those are rebuilt every time).
+BODY_CACHE_BYTES = int(os.environ.get("LNU_HTTP_BODY_CACHE_BYTES", str(32 * 1024 * 1024)))
+MAX_CACHED_BODY = int(os.environ.get("LNU_HTTP_MAX_CACHED_BODY", str(256 * 1024)))
+
+# ETag of the requested variant -> (encoding actually used, body bytes)
+_BODIES = ResultCache(
+    max_entries=2048, ttl=None, max_bytes=BODY_CACHE_BYTES, sizeof=lambda item: len(item[1])
+)
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag (quoted) from the given parts."""
+    digest = hashlib.sha256("\x1f".join(str(p) for p in parts).encode("utf-8"))
+    return '"' + digest.hexdigest()[:32] + '"'
+
+
+def _with_suffix(etag: str, encoding: str) -> str:
+    if encoding == "identity":
+        return etag
+    return etag[:-1] + "-" + encoding + '"'
+
+
+def _choose_encoding(accept_encoding: str) -> str:
+    offered = set()
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            continue
+        offered.add(name.strip().lower())
+    if brotli is not None and "br" in offered:
+        return "br"
+    if "gzip" in offered:
+        return "gzip"
+    return "identity"
+
+
+def _match(if_none_match: Optional[str], etags) -> Optional[str]:
+    """Return the ETag from `etags` the client already holds, if any."""
+    if not if_none_match:
+        return None
+    etags = list(etags)
+    if if_none_match.strip() == "*":
+        return etags[0]
+    # If-None-Match uses the weak comparison: ignore W/ prefixes
+    wanted = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+    for e in etags:
+        if e in wanted:
+            return e
+    return None
+
+
+def _encode(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body)
+    if encoding == "gzip":
+        return gzip.compress(body, compresslevel=6, mtime=0)
+    return body
+
+
+def cached_json_response(
+    request: Request,
+    etag: str,
+    build: Callable[[], Dict[str, Any]],
+    headers: Optional[Dict[str, str]] = None,
+) -> Response:
+    """
+    Answer a GET with conditional-request and compression support.
+
+    `build` is only called when neither a 304 nor a stored body can answer
+    the request – that is where the translator runs.
+    """
+    encoding = _choose_encoding(request.headers.get("accept-encoding", ""))
+    tagged = _with_suffix(etag, encoding)
+    common = {
+        "Cache-Control": f"public, max-age={MAX_AGE}",
+        "Vary": "Accept-Encoding",
+        **(headers or {}),
+    }
+
+    # any variant of this resource the client already holds is still current
+    variants = [etag, _with_suffix(etag, "gzip"), _with_suffix(etag, "br")]
+    held = _match(request.headers.get("if-none-match"), variants)
+    if held is not None:
+        return Response(status_code=304, headers={"ETag": held, **common})
+
+    stored = _BODIES.get(tagged)
+    if stored is None:
+        raw = json.dumps(build(), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        used = encoding if len(raw) >= MIN_COMPRESS_SIZE else "identity"
+        stored = (used, _encode(raw, used))
+        if len(stored[1]) <= MAX_CACHED_BODY:
+            _BODIES.put(tagged, stored)
+    used, body = stored
+
+    out = {"ETag": _with_suffix(etag, used), **common}
+    if used != "identity":
+        out["Content-Encoding"] = used
+    return Response(content=body, media_type="application/json", headers=out)
+
+
+def body_cache_stats() -> Dict[str, Any]:
+    return _BODIES.stats()
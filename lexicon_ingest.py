@@ -0,0 +1,443 @@
+# lexicon_ingest.py
+#
+# Build command: merge lexicon sources into one deduplicated lexicon file for
+# the translator, plus a report of everything a reviewer should look at.
+#
+# Sources are read as streams, in priority order (first wins a conflict):
+#
+#     --source prosper=exports/prosper.csv       CSV export
+#     --source lnuisuti=exports/lnuisuti.jsonl   JSON lines
+#     --source old=exports/old.json              JSON array (read incrementally)
+#     --builtin story                            LNU_LEXICON (lexicon_data.py)
+#     --builtin bridge                           lnu_bridge.LEXICON
+#
+# Every record is mapped to the lexicon.js / LNU_LEXICON shape and keyed on
+# its SFO-normalized surface form (orthography.normalize), so "Gesig",
+# "kesik" and "Kesik" are one headword.  Records go through an external
+# sort – sorted runs of --run-size records spilled to temp files, then
+# merged with heapq.merge – so memory stays bounded however big the inputs
+# are.  The merged stream is grouped by key and, in the same pass:
+#
+#     • duplicates are collapsed (examples / notes / sources unioned)
+#     • conflicting gloss, POS, animacy, root or morphology are flagged, and
+#       the entry is marked needsReview
+#     • every morpheme piece is checked against the morpheme inventory
+#       (lnu_bridge.MORPHEMES + LEXICON_CORE breakdowns + --morphemes file)
+#     • surfaces that aren't valid SFO spelling are flagged
+#
+# Output (--out, default ./lexicon-build):
+#     lexicon.jsonl   merged entries, sorted by key – load with
+#                     lexicon_data.load_lexicon(), or point
+#                     LNU_LEXICON_FILE at it to serve it from the API
+#     report.jsonl    one line per conflict / missing morpheme / bad row
+#     summary.json    counts
+#
+# CSV columns: headword (or surface/sfo), lemma, gloss (or english), pos,
+# animacy, morphemes as "piece:type:gloss|piece:type:gloss", examples as
+# "mi'kmaw – english|...", worldview_notes as "note|note", source, pacifique.
+
+import argparse
+import csv
+import heapq
+import itertools
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+import orthography
+
+DEFAULT_OUT = "lexicon-build"
+DEFAULT_RUN_SIZE = 50_000
+
+# fields where two sources disagreeing needs a human decision
+CONFLICT_FIELDS = ("gloss", "pos", "animacy", "root")
+
+
+# ---------------------------------------------------------------------
+# Sources
+# ---------------------------------------------------------------------
+
+def _split(value: Any, sep: str = "|") -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, list):
+        return value
+    return [v.strip() for v in str(value).split(sep) if v.strip()]
+
+
+def _morphology(raw: Any) -> List[Dict[str, str]]:
+    out = []
+    for m in _split(raw):
+        if isinstance(m, str):
+            piece, _, rest = m.partition(":")
+            mtype, _, gloss = rest.partition(":")
+            m = {"piece": piece, "type": mtype, "gloss": gloss}
+        out.append({
+            "piece": (m.get("piece") or m.get("surface") or m.get("form") or "").strip(),
+            "type": (m.get("type") or m.get("role") or "").strip(),
+            "gloss": (m.get("gloss") or "").strip(),
+        })
+    return [m for m in out if m["piece"]]
+
+
+def _examples(raw: Any) -> List[Dict[str, str]]:
+    out = []
+    for ex in _split(raw):
+        if isinstance(ex, str):
+            mikmaq, _, english = ex.partition(" – ")
+            ex = {"mikmaq": mikmaq.strip(), "english": english.strip()}
+        if ex.get("mikmaq"):
+            out.append({"mikmaq": ex["mikmaq"], "english": ex.get("english", "")})
+    return out
+
+
+def to_record(raw: Dict[str, Any], source: str) -> Dict[str, Any]:
+    """Map a source row onto the LNU_LEXICON shape.  Raises ValueError if unusable."""
+    surface = (raw.get("surface") or raw.get("headword") or raw.get("sfo") or raw.get("lemma") or "").strip()
+    if not surface:
+        raise ValueError("no headword / surface")
+    animacy = (raw.get("animacy") or "").strip().lower() or None
+    if animacy not in (None, "animate", "inanimate"):
+        raise ValueError(f"unknown animacy {animacy!r}")
+    rec = {
+        "lemma": (raw.get("lemma") or surface).strip().lower(),
+        "surface": surface,
+        "pos": (raw.get("pos") or raw.get("part_of_speech") or "").strip() or None,
+        "gloss": (raw.get("gloss") or raw.get("english") or raw.get("english_gloss") or "").strip() or None,
+        "animacy": animacy,
+        "root": (raw.get("root") or "").strip() or None,
+        "morphology": _morphology(raw.get("morphology") or raw.get("morphemes")),
+        "examples": _examples(raw.get("examples")),
+        "source": (raw.get("source") or source).strip(),
+        "worldview_notes": _split(raw.get("worldview_notes")),
+        "needsReview": str(raw.get("needsReview", "true")).lower() not in ("false", "0", "no"),
+    }
+    if raw.get("pacifique"):
+        rec["pacifique"] = raw["pacifique"].strip()
+    return rec
+
+
+def jsonl_source(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def json_array_source(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of a top-level JSON array, decoded one element at a time from
+    `chunk_size` reads, so a big export is never in memory at once.
+    """
+    decoder = json.JSONDecoder()
+    with open(path, encoding="utf-8") as fh:
+        buf = ""
+        eof = False
+        started = False
+
+        def fill() -> bool:
+            nonlocal buf, eof
+            chunk = fh.read(chunk_size)
+            eof = not chunk
+            buf += chunk
+            return bool(chunk)
+
+        while True:
+            buf = buf.lstrip()
+            if not buf:
+                if eof or not fill():
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                continue
+            if not started:
+                if buf[0] != "[":
+                    raise ValueError(f"{path}: expected a JSON array of records")
+                buf, started = buf[1:], True
+                continue
+            if buf[0] == "]":
+                return
+            if buf[0] == ",":
+                buf = buf[1:]
+                continue
+            try:
+                row, end = decoder.raw_decode(buf)
+            except json.JSONDecodeError:
+                # element cut off by the chunk boundary: read on
+                if eof or not fill():
+                    raise
+                continue
+            if isinstance(row, (int, float)) and not eof and buf[end:end + 1] not in (",", "]", " ", "\n", "\t", "\r"):
+                # a number may continue in the next chunk ("2." + "5e10")
+                if fill():
+                    continue
+            buf = buf[end:]
+            yield row
+
+
+def csv_source(path: str) -> Iterator[Dict[str, Any]]:
+    with open(path, newline="", encoding="utf-8") as fh:
+        yield from csv.DictReader(fh)
+
+
+def story_source() -> Iterator[Dict[str, Any]]:
+    from lexicon_data import LNU_LEXICON
+    yield from LNU_LEXICON
+
+
+def bridge_source() -> Iterator[Dict[str, Any]]:
+    import lnu_bridge
+    for entry in lnu_bridge.LEXICON.values():
+        yield {
+            "surface": entry.sfo,
+            "pacifique": entry.pacifique,
+            "pos": entry.pos,
+            "gloss": entry.english_gloss,
+            "animacy": entry.animacy,
+            "morphemes": [{"piece": m.form, "type": m.type, "gloss": m.gloss} for m in entry.morphemes or []],
+            "worldview_notes": entry.worldview_notes,
+            "source": "lnu_bridge.py",
+        }
+
+
+BUILTIN_SOURCES = {"story": story_source, "bridge": bridge_source}
+
+
+def file_source(path: str) -> Iterator[Dict[str, Any]]:
+    if path.endswith(".csv"):
+        return csv_source(path)
+    if path.endswith(".json"):
+        return json_array_source(path)
+    return jsonl_source(path)
+
+
+def morpheme_inventory(path: Optional[str] = None) -> Set[str]:
+    """Normalized morpheme forms a lexicon entry may reference."""
+    import lnu_bridge
+    from translator import LEXICON_CORE
+
+    forms = [m.form for m in lnu_bridge.MORPHEMES]
+    for entry in LEXICON_CORE.values():
+        forms.extend(m.surface for m in entry.morphemes)
+    if path:
+        rows = csv_source(path) if path.endswith(".csv") else jsonl_source(path)
+        forms.extend(r.get("form") or r.get("piece") or r.get("surface") or "" for r in rows)
+    return {k for k in (morpheme_key(f) for f in forms) if k}
+
+
+def morpheme_key(piece: str) -> str:
+    return orthography.normalize(piece.strip().strip("-"))
+
+
+# ---------------------------------------------------------------------
+# External sort
+# ---------------------------------------------------------------------
+
+class ExternalSorter:
+    """
+    Sort (key, priority, record) rows that don't fit in memory: sorted runs
+    of `run_size` rows are spilled to JSON-lines files in `tmpdir`, and
+    merged() streams them back in order with heapq.merge.
+    """
+
+    def __init__(self, tmpdir: str, run_size: int = DEFAULT_RUN_SIZE):
+        self.tmpdir = tmpdir
+        self.run_size = run_size
+        self.runs: List[str] = []
+        self.rows = 0
+        self._buffer: List[Tuple[str, int, int, Dict[str, Any]]] = []
+
+    def add(self, key: str, priority: int, record: Dict[str, Any]) -> None:
+        # the row number keeps equal (key, priority) rows in input order
+        self._buffer.append((key, priority, self.rows, record))
+        self.rows += 1
+        if len(self._buffer) >= self.run_size:
+            self._spill()
+
+    def _spill(self) -> None:
+        if not self._buffer:
+            return
+        self._buffer.sort(key=lambda row: row[:3])
+        path = os.path.join(self.tmpdir, f"run-{len(self.runs):05d}.jsonl")
+        with open(path, "w", encoding="utf-8") as fh:
+            for row in self._buffer:
+                fh.write(json.dumps(row, ensure_ascii=False) + "\n")
+        self.runs.append(path)
+        self._buffer = []
+
+    @staticmethod
+    def _read(path: str) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        with open(path, encoding="utf-8") as fh:
+            for line in fh:
+                yield tuple(json.loads(line))
+
+    def merged(self) -> Iterator[Tuple[str, int, int, Dict[str, Any]]]:
+        self._spill()
+        return heapq.merge(*(self._read(p) for p in self.runs), key=lambda row: row[:3])
+
+
+# ---------------------------------------------------------------------
+# Merge
+# ---------------------------------------------------------------------
+
+def _comparable(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.lower().split())
+    return value
+
+
+def merge_group(key: str, records: List[Dict[str, Any]], inventory: Set[str],
+                report: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Merge every record for one key (highest priority first); appends findings to `report`."""
+    merged = dict(records[0])
+    conflict = False
+
+    for field in CONFLICT_FIELDS:
+        values: Dict[Any, List[str]] = {}
+        for rec in records:
+            if rec.get(field) not in (None, "", "TODO"):
+                values.setdefault(_comparable(rec[field]), []).append(rec["source"])
+        if not merged.get(field) or merged.get(field) == "TODO":
+            merged[field] = next(
+                (r[field] for r in records if r.get(field) not in (None, "", "TODO")), merged.get(field)
+            )
+        if len(values) > 1:
+            conflict = True
+            report.append({
+                "kind": "conflict", "key": key, "field": field, "chosen": merged[field],
+                "values": [{"value": v, "sources": s} for v, s in values.items()],
+            })
+
+    shapes = {}
+    for rec in records:
+        if rec["morphology"]:
+            shape = tuple(morpheme_key(m["piece"]) for m in rec["morphology"])
+            shapes.setdefault(shape, []).append(rec["source"])
+    if not merged["morphology"]:
+        merged["morphology"] = next((r["morphology"] for r in records if r["morphology"]), [])
+    if len(shapes) > 1:
+        conflict = True
+        report.append({
+            "kind": "conflict", "key": key, "field": "morphology",
+            "chosen": [m["piece"] for m in merged["morphology"]],
+            "values": [{"value": list(v), "sources": s} for v, s in shapes.items()],
+        })
+
+    for m in merged["morphology"]:
+        if morpheme_key(m["piece"]) not in inventory:
+            report.append({"kind": "missing_morpheme", "key": key, "piece": m["piece"], "type": m["type"]})
+
+    seen_ex = set()
+    merged["examples"] = []
+    notes: List[str] = []
+    sources: List[str] = []
+    for rec in records:
+        for ex in rec["examples"]:
+            if ex["mikmaq"] not in seen_ex:
+                seen_ex.add(ex["mikmaq"])
+                merged["examples"].append(ex)
+        notes.extend(n for n in rec["worldview_notes"] if n not in notes)
+        sources.extend(s for s in rec["source"].split("; ") if s not in sources)
+        if not merged.get("pacifique") and rec.get("pacifique"):
+            merged["pacifique"] = rec["pacifique"]
+    merged["worldview_notes"] = notes
+    merged["source"] = "; ".join(sources)
+    merged["needsReview"] = conflict or any(r["needsReview"] for r in records)
+
+    spelling = orthography.check(merged["surface"])
+    if not spelling.valid:
+        report.append({"kind": "spelling", "key": key, "surface": merged["surface"], "reason": spelling.reason})
+    return merged
+
+
+def ingest(
+    sources: Iterable[Tuple[str, Iterable[Dict[str, Any]]]],
+    out_dir: str = DEFAULT_OUT,
+    run_size: int = DEFAULT_RUN_SIZE,
+    morphemes_path: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Merge `sources` – (name, rows) pairs, highest priority first – into
+    out_dir/lexicon.jsonl and out_dir/report.jsonl.  Returns the summary.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    inventory = morpheme_inventory(morphemes_path)
+    summary: Dict[str, Any] = {"rows": 0, "invalid": 0, "entries": 0, "duplicates": 0,
+                               "conflicts": 0, "missing_morphemes": 0, "spelling": 0, "sources": {}}
+    counts = {"conflict": "conflicts", "missing_morpheme": "missing_morphemes",
+              "spelling": "spelling", "invalid": "invalid"}
+
+    with tempfile.TemporaryDirectory(prefix="lexicon-ingest-") as tmp, \
+            open(os.path.join(out_dir, "report.jsonl"), "w", encoding="utf-8") as report_fh:
+
+        def emit(findings: List[Dict[str, Any]]) -> None:
+            for f in findings:
+                summary[counts[f["kind"]]] += 1
+                report_fh.write(json.dumps(f, ensure_ascii=False) + "\n")
+
+        sorter = ExternalSorter(tmp, run_size)
+        for priority, (name, rows) in enumerate(sources):
+            n = 0
+            for line, raw in enumerate(rows, 1):
+                summary["rows"] += 1
+                try:
+                    rec = to_record(raw, name)
+                except (ValueError, AttributeError, TypeError) as exc:
+                    emit([{"kind": "invalid", "source": name, "row": line, "reason": str(exc)}])
+                    continue
+                sorter.add(orthography.normalize(rec["surface"]), priority, rec)
+                n += 1
+            summary["sources"][name] = n
+
+        out_path = os.path.join(out_dir, "lexicon.jsonl")
+        with open(out_path + ".tmp", "w", encoding="utf-8") as out_fh:
+            for key, group in itertools.groupby(sorter.merged(), key=lambda row: row[0]):
+                records = [row[3] for row in group]
+                findings: List[Dict[str, Any]] = []
+                entry = merge_group(key, records, inventory, findings)
+                emit(findings)
+                summary["entries"] += 1
+                summary["duplicates"] += len(records) - 1
+                out_fh.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(out_path + ".tmp", out_path)
+        summary["runs"] = len(sorter.runs)
+
+    with open(os.path.join(out_dir, "summary.json"), "w", encoding="utf-8") as fh:
+        json.dump(summary, fh, indent=2)
+    return summary
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Merge lexicon sources into one deduplicated lexicon.")
+    parser.add_argument("--source", dest="sources", action="append", default=[],
+                        type=lambda v: ("file",) + tuple(v.split("=", 1)) if "=" in v else ("file", v, v),
+                        metavar="NAME=PATH", help="CSV / JSON / JSONL export (repeatable, in priority order)")
+    parser.add_argument("--builtin", dest="sources", action="append",
+                        type=lambda v: ("builtin", v, v), metavar="{story,bridge}",
+                        help="built-in lexicon (repeatable)")
+    parser.add_argument("--morphemes", help="extra morpheme inventory (CSV / JSONL with a 'form' column)")
+    parser.add_argument("--out", default=DEFAULT_OUT, help="output directory")
+    parser.add_argument("--run-size", type=int, default=DEFAULT_RUN_SIZE,
+                        help="records held in memory per sorted run")
+    args = parser.parse_args(argv)
+
+    specs = args.sources or [("builtin", "story", "story"), ("builtin", "bridge", "bridge")]
+    streams = []
+    for kind, name, target in specs:
+        if kind == "builtin":
+            if target not in BUILTIN_SOURCES:
+                parser.error(f"unknown builtin {target!r} (choose from {', '.join(BUILTIN_SOURCES)})")
+            streams.append((name, BUILTIN_SOURCES[target]()))
+        else:
+            streams.append((name, file_source(target)))
+
+    summary = ingest(streams, args.out, args.run_size, args.morphemes)
+    print(
+        f"lexicon_ingest.py: {summary['rows']} rows -> {summary['entries']} entries "
+        f"({summary['duplicates']} merged, {summary['conflicts']} conflicts, "
+        f"{summary['missing_morphemes']} missing morphemes, {summary['invalid']} invalid) -> {args.out}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+lexicon_overlays.py
+
+Per-community lexicon overlays (Unama'ki, Mainland, Epekwitk, Listuguj, ...)
+layered over the shared base lexicon.
+
+An overlay is a small delta, defined in dialect_overlays.json:
+
+    entries     headwords the community adds or words differently
+    spellings   local spelling -> base headword it stands for
+    remove      base headwords the community doesn't use
+    parent      another overlay this one builds on
+
+The base lexicon and its indexes are never copied.  At load time every
+overlay's chain (itself, its parent, its parent's parent...) is flattened
+into ONE delta dict, so a lookup is at most a few dict hits in the delta
+and then the normal base lookup – O(1) however deep the layering goes.
+
+This module only knows about plain dicts; translator.py passes in the
+function that turns an entry dict into a WordEntry
+(LnuTranslator.for_dialect() is the public way in).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import orthography
+
+DEFAULT_OVERLAYS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "dialect_overlays.json"
+)
+
+
+class _Removed:
+    def __repr__(self) -> str:
+        return "REMOVED"
+
+
+# delta value for a headword the overlay hides
+REMOVED = _Removed()
+
+
+@dataclass
+class Alias:
+    """Delta value for a local spelling: look `headword` up in the base."""
+    headword: str
+
+
+@dataclass
+class DialectOverlay:
+    name: str
+    label: str
+    parent: Optional[str]
+    version: str  # content hash of this overlay and its parents
+    # lookup key (exact, lowercase and SFO-normalized) -> entry / Alias / REMOVED
+    delta: Dict[str, Any] = field(default_factory=dict)
+
+    def get(self, word: str) -> Optional[Any]:
+        """Delta value for `word`, or None to fall through to the base."""
+        if not self.delta:
+            return None
+        key = word.strip()
+        hit = self.delta.get(key)
+        if hit is None:
+            hit = self.delta.get(key.lower())
+        if hit is None:
+            hit = self.delta.get(orthography.normalize(key))
+        return hit
+
+    def info(self) -> Dict[str, Any]:
+        return {"name": self.name, "label": self.label, "parent": self.parent,
+                "version": self.version, "keys": len(self.delta)}
+
+
+def _keys(headword: str) -> List[str]:
+    return list(dict.fromkeys([headword, headword.lower(), orthography.normalize(headword)]))
+
+
+class OverlayRegistry:
+    """
+        registry = OverlayRegistry.from_file(make_entry=entry_from_dict)
+        registry.get("listuguj").get("gesig")
+    """
+
+    def __init__(self, overlays: Dict[str, DialectOverlay]):
+        self.overlays = overlays
+
+    @classmethod
+    def from_file(
+        cls, path: str = DEFAULT_OVERLAYS_PATH, make_entry: Callable[[Dict[str, Any]], Any] = dict
+    ) -> "OverlayRegistry":
+        if not os.path.exists(path):
+            return cls({})
+        with open(path, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls.from_dict(data.get("dialects", {}), make_entry)
+
+    @classmethod
+    def from_dict(
+        cls, dialects: Dict[str, Dict[str, Any]], make_entry: Callable[[Dict[str, Any]], Any] = dict
+    ) -> "OverlayRegistry":
+        # names are case-insensitive: get() lowercases what callers send
+        dialects = {name.strip().lower(): spec for name, spec in dialects.items()}
+
+        def parent_of(name: str) -> Optional[str]:
+            parent = dialects[name].get("parent")
+            return parent.strip().lower() if parent else None
+
+        def chain(name: str) -> List[str]:
+            # root first, `name` last, so nearer layers win
+            names, seen = [], set()
+            while name is not None:
+                if name in seen:
+                    raise ValueError(f"overlay parent cycle at {name!r}")
+                if name not in dialects:
+                    raise ValueError(f"unknown parent overlay {name!r}")
+                seen.add(name)
+                names.append(name)
+                name = parent_of(name)
+            return names[::-1]
+
+        overlays: Dict[str, DialectOverlay] = {}
+        for name, spec in dialects.items():
+            layers = chain(name)
+            delta: Dict[str, Any] = {}
+            for layer in layers:
+                d = dialects[layer]
+                for headword in d.get("remove", []):
+                    for k in _keys(headword):
+                        delta[k] = REMOVED
+                for spelling, headword in d.get("spellings", {}).items():
+                    for k in _keys(spelling):
+                        delta[k] = Alias(headword)
+                for raw in d.get("entries", []):
+                    entry = make_entry(raw)
+                    for k in _keys(raw["headword"]):
+                        delta[k] = entry
+            blob = json.dumps([dialects[l] for l in layers], sort_keys=True, ensure_ascii=False)
+            overlays[name] = DialectOverlay(
+                name=name,
+                label=spec.get("label", name),
+                parent=parent_of(name),
+                version=hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16],
+                delta=delta,
+            )
+        return cls(overlays)
+
+    def get(self, name: str) -> DialectOverlay:
+        """Overlay by name; KeyError if there is none."""
+        return self.overlays[name.strip().lower()]
+
+    def names(self) -> List[str]:
+        return sorted(self.overlays)
+
+    def info(self) -> List[Dict[str, Any]]:
+        return [self.overlays[n].info() for n in self.names()]
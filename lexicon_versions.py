@@ -0,0 +1,379 @@
+"""
+lexicon_versions.py
+
+Versioned core lexicon: every speaker correction is a new numbered
+version, old versions stay queryable, and every change is audited.
+
+    • version 0 is the shipped lexicon (translator.LEXICON_CORE); it is
+      never copied or changed
+    • each edit appends (version, entry) to that headword's own history –
+      an edit costs one list append, whatever the size of the lexicon
+    • "as of version v" is a bisect in the histories of the headwords that
+      were ever edited; untouched headwords come straight from the base
+    • the audit trail is an append-only JSONL log (who, when, why, the new
+      entry); every `checkpoint_every` edits the current state of all
+      edited headwords is written to <log>.checkpoint, so a restart reads
+      the checkpoint plus the log tail instead of the whole log.  Versions
+      older than the checkpoint are replayed from the log on first use.
+
+Several workers can share one log: an edit takes an flock on it, first
+applies what other workers appended, then appends its own record, so
+version numbers are the same everywhere.  refresh() (one stat call) picks
+up other workers' edits.  Without a log each process has its own versions
+and its own lineage, even when forked from a parent that already had one.
+
+Only the core WordEntry lexicon is versioned; the story lexicon
+(lexicon_data.py) is rebuilt by lexicon_ingest.py instead.
+
+This module only knows about plain dicts; translator.py passes in the
+function that turns an entry dict into a WordEntry.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import secrets
+import tempfile
+import threading
+import time
+from bisect import bisect_right
+from collections.abc import Mapping
+from dataclasses import asdict, is_dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+import orthography
+
+try:  # optional (not on Windows)
+    import fcntl  # type: ignore
+except ImportError:  # pragma: no cover - depends on platform
+    fcntl = None
+
+DEFAULT_CHECKPOINT_EVERY = 500
+
+
+class UnknownVersion(KeyError):
+    pass
+
+
+def _to_dict(entry: Any) -> Dict[str, Any]:
+    return asdict(entry) if is_dataclass(entry) else dict(entry)
+
+
+class LexiconView(Mapping):
+    """Read-only dict view of the lexicon as of one version (None = the live head)."""
+
+    def __init__(self, store: "VersionedLexicon", as_of: Optional[int] = None):
+        self.store = store
+        self.as_of = as_of
+
+    def __getitem__(self, headword: str) -> Any:
+        entry = self.store.get(headword, self.as_of)
+        if entry is None:
+            raise KeyError(headword)
+        return entry
+
+    def __contains__(self, headword: object) -> bool:
+        return isinstance(headword, str) and self.store.get(headword, self.as_of) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for hw in self.store.headwords():
+            if self.store.get(hw, self.as_of) is not None:
+                yield hw
+
+    def __len__(self) -> int:
+        if not self.store.changed_keys:
+            return len(self.store.base)
+        return sum(1 for _ in self)
+
+
+class VersionedLexicon:
+    """
+        store = VersionedLexicon(LEXICON_CORE, path="lexicon.log", make_entry=entry_from_dict)
+        v = store.put("kesalul", {...}, author="speaker", note="fix gloss")
+        store.lookup("Kesalul", as_of=v - 1)   # the entry before the fix
+    """
+
+    def __init__(
+        self,
+        base: Mapping,
+        path: Optional[str] = None,
+        checkpoint_every: int = DEFAULT_CHECKPOINT_EVERY,
+        make_entry: Callable[[Dict[str, Any]], Any] = dict,
+    ):
+        self.base = base
+        self.path = path
+        self.checkpoint_every = checkpoint_every
+        self.make_entry = make_entry
+        # identifies this line of versions (the log's own id when there is
+        # a log), so "version 7" of two different logs never collide
+        self._lineage = secrets.token_hex(8)
+        self._lineage_pid = os.getpid()
+        self.head = 0
+        # headword -> (versions, entries or None for deleted, audit records)
+        self._history: Dict[str, Tuple[List[int], List[Optional[Any]], List[Dict[str, Any]]]] = {}
+        self._added: List[str] = []  # headwords not in base, in order of first edit
+        self._folded: Optional[Dict[str, List[str]]] = None
+        self._floor = 0   # versions below this aren't loaded yet (checkpoint start)
+        self._offset = 0  # bytes of the log applied
+        self._since_checkpoint = 0
+        self._lock = threading.RLock()
+        if path:
+            self._open()
+
+    @property
+    def lineage(self) -> str:
+        # without a log every process keeps its own versions, so a forked
+        # worker must not reuse its parent's lineage
+        if not self.path and self._lineage_pid != os.getpid():
+            self._lineage, self._lineage_pid = secrets.token_hex(8), os.getpid()
+        return self._lineage
+
+    @property
+    def changed_keys(self) -> int:
+        return len(self._history)
+
+    def view(self, as_of: Optional[int] = None) -> LexiconView:
+        return LexiconView(self, as_of)
+
+    # ------------------ reads ------------------
+
+    def resolve(self, as_of: Optional[int] = None) -> int:
+        """The concrete version number `as_of` means (None = head)."""
+        if as_of is None:
+            return self.head
+        if not 0 <= as_of <= self.head:
+            raise UnknownVersion(as_of)
+        return as_of
+
+    def get(self, headword: str, as_of: Optional[int] = None) -> Optional[Any]:
+        """Entry stored under exactly `headword` at version `as_of`."""
+        hist = self._history.get(headword)
+        if hist is None:
+            return self.base.get(headword)
+        versions, entries, _ = hist
+        if as_of is None or as_of >= versions[-1]:
+            return entries[-1]
+        if as_of < self._floor:
+            self._load_full_history()
+            return self.get(headword, as_of)
+        i = bisect_right(versions, as_of)
+        return entries[i - 1] if i else self.base.get(headword)
+
+    def headwords(self) -> Iterator[str]:
+        """Every headword that exists or ever existed, base order then new ones."""
+        yield from self.base
+        yield from self._added
+
+    def build_index(self) -> None:
+        folded: Dict[str, List[str]] = {}
+        for hw in self.headwords():
+            # first spelling wins, same as the old linear scan
+            folded.setdefault(hw.lower(), []).append(hw)
+        # SFO-normalized spellings last, so they never shadow a real headword
+        for hw in self.headwords():
+            bucket = folded.setdefault(orthography.normalize(hw), [])
+            if hw not in bucket:
+                bucket.append(hw)
+        self._folded = folded
+
+    def lookup(self, key: str, as_of: Optional[int] = None) -> Optional[Any]:
+        """Exact headword, then case-folded, then SFO-normalized."""
+        entry = self.get(key, as_of)
+        if entry is not None:
+            return entry
+        if self._folded is None:
+            self.build_index()
+        for hw in self._folded.get(key.lower(), ()):
+            entry = self.get(hw, as_of)
+            if entry is not None:
+                return entry
+        for hw in self._folded.get(orthography.normalize(key), ()):
+            entry = self.get(hw, as_of)
+            if entry is not None:
+                return entry
+        return None
+
+    def history(self, headword: str) -> List[Dict[str, Any]]:
+        """Audit records for `headword`, oldest first, each with the entry it set."""
+        if self._floor:
+            self._load_full_history()
+        hist = self._history.get(headword)
+        if hist is None:
+            return []
+        return [
+            dict(record, entry=_to_dict(entry) if entry is not None else None)
+            for record, entry in zip(hist[2], hist[1])
+        ]
+
+    # ------------------ writes ------------------
+
+    def put(self, headword: str, data: Optional[Dict[str, Any]],
+            author: str = "", note: str = "") -> int:
+        """
+        Set (or with data=None, delete) one entry; returns the new version.
+        `data` is validated with make_entry before anything is logged.
+        """
+        entry = self.make_entry(data) if data is not None else None
+        with self._lock:
+            self.refresh()
+            if entry is None and self.get(headword) is None:
+                raise KeyError(headword)
+            record = {"version": 0, "ts": round(time.time(), 3), "author": author,
+                      "note": note, "headword": headword, "entry": data}
+            if self.path:
+                with open(self.path, "a+b") as fh:
+                    self._flock(fh, True)
+                    try:
+                        # other workers may have appended since our last refresh
+                        self._replay(fh)
+                        record["version"] = self.head + 1
+                        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+                        fh.write(line)
+                        fh.flush()
+                        os.fsync(fh.fileno())
+                        self._offset += len(line)
+                    finally:
+                        self._flock(fh, False)
+            else:
+                record["version"] = self.head + 1
+            self._apply(record, entry)
+            self._since_checkpoint += 1
+            if self.path and self._since_checkpoint >= self.checkpoint_every:
+                self.checkpoint()
+            return record["version"]
+
+    def delete(self, headword: str, author: str = "", note: str = "") -> int:
+        return self.put(headword, None, author, note)
+
+    def _apply(self, record: Dict[str, Any], entry: Optional[Any]) -> None:
+        version = record["version"]
+        if version <= self.head:
+            return  # already applied (checkpoint overlap)
+        hw = record["headword"]
+        hist = self._history.get(hw)
+        if hist is None:
+            hist = self._history[hw] = ([], [], [])
+            if hw not in self.base:
+                self._added.append(hw)
+                if self._folded is not None:
+                    for k in (hw.lower(), orthography.normalize(hw)):
+                        bucket = self._folded.setdefault(k, [])
+                        if hw not in bucket:
+                            bucket.append(hw)
+        hist[2].append({k: record[k] for k in ("version", "ts", "author", "note")})
+        hist[1].append(entry)
+        hist[0].append(version)
+        self.head = version
+
+    # ------------------ log / checkpoints ------------------
+
+    @staticmethod
+    def _flock(fh, lock: bool) -> None:
+        if fcntl is not None:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX if lock else fcntl.LOCK_UN)
+
+    @property
+    def checkpoint_path(self) -> str:
+        return self.path + ".checkpoint"
+
+    def _open(self) -> None:
+        with open(self.path, "a+b") as fh:
+            self._flock(fh, True)
+            try:
+                fh.seek(0)
+                first = fh.readline()
+                if not first:
+                    header = {"log": self.lineage, "created": round(time.time(), 3)}
+                    first = (json.dumps(header) + "\n").encode("utf-8")
+                    fh.write(first)
+                    fh.flush()
+                self._lineage = json.loads(first)["log"]
+                self._offset = len(first)
+            finally:
+                self._flock(fh, False)
+
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding="utf-8") as fh:
+                cp = json.load(fh)
+            if cp.get("log") == self.lineage:
+                for hw, item in cp["entries"].items():
+                    entry = self.make_entry(item["entry"]) if item["entry"] is not None else None
+                    self._history[hw] = ([item["record"]["version"]], [entry], [item["record"]])
+                    if hw not in self.base:
+                        self._added.append(hw)
+                self.head = self._floor = cp["version"]
+                self._offset = cp["offset"]
+        self.refresh()
+
+    def _replay(self, fh) -> None:
+        """Apply every complete record after self._offset."""
+        fh.seek(self._offset)
+        for line in fh.read().splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # another worker is mid-write
+            self._offset += len(line)
+            record = json.loads(line)
+            if "version" not in record:
+                continue
+            data = record["entry"]
+            self._apply(record, self.make_entry(data) if data is not None else None)
+
+    def refresh(self) -> None:
+        """Pick up edits other workers appended to the log."""
+        if not self.path or os.path.getsize(self.path) <= self._offset:
+            return
+        with self._lock, open(self.path, "rb") as fh:
+            self._replay(fh)
+
+    def checkpoint(self) -> Optional[str]:
+        """Write the state of every edited headword, atomically."""
+        if not self.path:
+            return None
+        with self._lock:
+            state = {
+                "log": self.lineage,
+                "version": self.head,
+                "offset": self._offset,
+                "entries": {
+                    hw: {"record": records[-1],
+                         "entry": _to_dict(entries[-1]) if entries[-1] is not None else None}
+                    for hw, (_, entries, records) in self._history.items()
+                },
+            }
+            self._since_checkpoint = 0
+        directory = os.path.dirname(os.path.abspath(self.checkpoint_path))
+        fd, tmp = tempfile.mkstemp(prefix=".lexicon-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(state, fh, ensure_ascii=False)
+            os.replace(tmp, self.checkpoint_path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
+        return self.checkpoint_path
+
+    def _load_full_history(self) -> None:
+        """Replay the whole log, for versions older than the checkpoint."""
+        with self._lock:
+            if not self._floor:
+                return
+            fresh = VersionedLexicon(self.base, make_entry=self.make_entry)
+            with open(self.path, "rb") as fh:
+                fresh._offset = len(fh.readline())  # header
+                fresh._replay(fh)
+            self._history, self._added = fresh._history, fresh._added
+            self.head, self._offset = max(self.head, fresh.head), fresh._offset
+            self._folded = None
+            self._floor = 0
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "head": self.head,
+            "lineage": self.lineage,
+            "changed_headwords": len(self._history),
+            "added_headwords": len(self._added),
+            "log": self.path,
+            "history_loaded_from": self._floor,
+        }
@@ -213,8 +213,9 @@ def build_humorous_compound(english_stub: str, mikmaq_motion_suffix: str = "aqan
     Build a playful compound like 'weenieraqn':
     English stub (roman letters) + a known Mi'kmaw motion suffix.
     This is NOT proper Mi'kmaw, but it's a teaching + humour tool.
+
+        >>> build_humorous_compound("weenie")
+        'weenieaqan'
     """
     # Very naive: just glue them together
     return english_stub + mikmaq_motion_suffix
->>> build_humorous_compound("weenie")
-'weenieaqan'
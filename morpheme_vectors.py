@@ -0,0 +1,430 @@
+"""
+morpheme_vectors.py
+
+Local vector-similarity index over morpheme glosses and the lexicon's
+English glosses, so generation can find the nearest roots and finals for
+ANY purpose text, not only the keywords listed in generation_patterns.json.
+
+    • vectors: TF-IDF over English words (with the same light stemming as
+      term_generation), character 3-grams of each word, so "cooling" and
+      "cooler" share features, and a small synonym table (SYNONYMS) so
+      "chilled", "cooler" and "cold" share a concept feature that spelling
+      alone would never give them; features are hashed into `dim` buckets,
+      so there is no vocabulary to store
+    • storage: one sparse matrix as flat (row, column, weight) arrays
+      sorted by column, rows L2-normalized
+    • query: the non-zeros under the request's own features are gathered
+      with one fancy index, np.bincount sums them into a cosine per row,
+      and np.argpartition picks the top k – a few array operations whose
+      cost follows the postings touched, not the size of the inventory
+    • no network, no pretrained model – everything comes from the repo's
+      own glosses
+
+Rows are the coinage.py morpheme inventory (a morpheme's text is its gloss
+plus the English of every entry that uses it) followed by the lexicon
+entries themselves (English gloss + morpheme glosses + tags).
+
+Build offline and ship the index:
+
+    python morpheme_vectors.py --out morpheme_vectors.npz
+
+LnuTranslator.warm() loads morpheme_vectors.npz when it was built from the
+same texts, otherwise builds the index in memory (milliseconds today).
+
+Needs NumPy; without it generation keeps to its patterns.  Everything
+proposed from here MUST be checked with fluent speakers / elders.
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import math
+import os
+import zlib
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import orthography
+from term_generation import tokenize_text, word_variants
+
+try:  # optional
+    import numpy as np  # type: ignore
+except ImportError:  # pragma: no cover - depends on environment
+    np = None
+
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "morpheme_vectors.npz")
+
+DEFAULT_DIM = 1 << 16
+# character 3-grams count for less than whole words
+CHAR_WEIGHT = 0.3
+# a shared concept (SYNONYMS) counts like a shared word
+SYNONYM_WEIGHT = 1.0
+
+# English words that mean the same thing for coinage purposes, grouped
+# under one concept.  Extend alongside the glosses in lnu_bridge.py.
+SYNONYMS: Dict[str, Tuple[str, ...]] = {
+    "cold": ("cold", "cool", "cooler", "cooling", "chill", "chilled", "chilly", "chiller",
+             "freeze", "freezer", "frozen", "frost", "ice", "icy", "refrigerate",
+             "refrigerator", "fridge"),
+    "warm": ("warm", "warmer", "warmth", "heat", "heater", "heated", "hot", "fire",
+             "burn", "stove", "oven"),
+    "house": ("house", "home", "dwelling", "shelter", "building", "lodge", "wigwam"),
+    "container": ("container", "box", "inside", "storage", "store", "keep", "hold",
+                  "holder", "case", "bag", "basket", "chest"),
+    "care": ("care", "caring", "protect", "protection", "safe", "safety", "tend", "look"),
+    "good": ("good", "well", "fine", "healthy", "right"),
+    "love": ("love", "loved", "beloved", "precious", "dear", "cherish"),
+    "pain": ("pain", "hurt", "ache", "sore", "injury", "sick"),
+    "fish": ("fish", "fishing", "salmon", "eel", "trout", "cod"),
+    "tool": ("tool", "device", "instrument", "machine", "appliance", "thing"),
+    "make": ("make", "making", "made", "build", "create", "cause"),
+    "food": ("food", "eat", "eating", "meal", "drink", "drinks", "beverage"),
+}
+_CONCEPT_OF: Dict[str, str] = {w: c for c, words in SYNONYMS.items() for w in words}
+# below this cosine a morpheme isn't "near" the request
+MIN_SIMILARITY = 0.12
+
+RETRIEVAL_CAUTION = (
+    "Assembled from the morphemes whose glosses are closest to the purpose. "
+    "Confirm meaning, phonology and cultural fit with fluent Mi'kmaw speakers "
+    "and elders before any use."
+)
+
+
+def text_features(text: str, dim: int) -> Dict[int, float]:
+    """
+    Hashed, weighted term frequencies of one text: words (+ variants),
+    their concepts and their character 3-grams.  Each feature's count is
+    damped (1 + log count) before its kind's weight is applied, so a
+    lightly weighted feature still counts.
+    """
+    counts: Dict[Tuple[bytes, str], int] = {}
+    for word in tokenize_text(text):
+        concepts = set()
+        for variant in word_variants(word):
+            counts[(b"w", variant)] = counts.get((b"w", variant), 0) + 1
+            if variant in _CONCEPT_OF:
+                concepts.add(_CONCEPT_OF[variant])
+        for concept in concepts:
+            counts[(b"g", concept)] = counts.get((b"g", concept), 0) + 1
+        padded = "<" + word + ">"
+        for i in range(len(padded) - 2):
+            counts[(b"c", padded[i:i + 3])] = counts.get((b"c", padded[i:i + 3]), 0) + 1
+
+    weights = {b"w": 1.0, b"g": SYNONYM_WEIGHT, b"c": CHAR_WEIGHT}
+    tf: Dict[int, float] = {}
+    for (kind, term), count in counts.items():
+        col = zlib.crc32(kind + b"\x1f" + term.encode("utf-8")) % dim
+        tf[col] = tf.get(col, 0.0) + weights[kind] * (1.0 + math.log(count))
+    return tf
+
+
+def fingerprint(texts: Sequence[str], dim: int) -> str:
+    # the feature settings change every vector too
+    settings = repr((CHAR_WEIGHT, SYNONYM_WEIGHT, sorted(SYNONYMS.items()), 2))
+    blob = "\x1e".join(texts) + "\x1d" + str(dim) + "\x1d" + settings
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+
+class VectorIndex:
+    """
+    Sparse TF-IDF rows with cosine top-k.
+
+        index = VectorIndex.build(["cold (it is cold)", "house, dwelling", ...])
+        index.top_k("keeps drinks chilled", k=5)   # -> [(row, score), ...]
+    """
+
+    def __init__(self, rows, cols, vals, idf, n_rows: int, fingerprint: str = ""):
+        if np is None:
+            raise RuntimeError("the vector index needs numpy: pip install numpy")
+        cols = np.asarray(cols, dtype=np.int32)
+        order = np.argsort(cols, kind="stable")
+        self.rows = np.asarray(rows, dtype=np.int32)[order]
+        self.cols = cols[order]
+        self.vals = np.asarray(vals, dtype=np.float32)[order]
+        self.idf = np.asarray(idf, dtype=np.float32)
+        self.n_rows = int(n_rows)
+        self.fingerprint = fingerprint
+        # column c's non-zeros are [colptr[c], colptr[c + 1])
+        self.colptr = np.zeros(self.dim + 1, dtype=np.int64)
+        np.cumsum(np.bincount(self.cols, minlength=self.dim), out=self.colptr[1:])
+
+    @property
+    def dim(self) -> int:
+        return int(self.idf.shape[0])
+
+    # ------------------ building ------------------
+
+    @classmethod
+    def build(cls, texts: Sequence[str], dim: int = DEFAULT_DIM) -> "VectorIndex":
+        if np is None:
+            raise RuntimeError("the vector index needs numpy: pip install numpy")
+        rows: List[int] = []
+        cols: List[int] = []
+        tfs: List[float] = []
+        for r, text in enumerate(texts):
+            for col, count in text_features(text, dim).items():
+                rows.append(r)
+                cols.append(col)
+                tfs.append(count)
+        rows_a = np.asarray(rows, dtype=np.int32)
+        cols_a = np.asarray(cols, dtype=np.int32)
+        n = len(texts)
+        # each (row, col) pair appears once, so bincount over cols = document frequency
+        df = np.bincount(cols_a, minlength=dim).astype(np.float32)
+        idf = (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+        vals = np.asarray(tfs, dtype=np.float32) * idf[cols_a]
+        norms = np.sqrt(np.bincount(rows_a, weights=vals * vals, minlength=n))
+        vals = vals / np.maximum(norms, 1e-12)[rows_a]
+        return cls(rows_a, cols_a, vals, idf, n, fingerprint(texts, dim))
+
+    # ------------------ querying ------------------
+
+    def _query(self, text: str):
+        q = np.zeros(self.dim, dtype=np.float32)
+        for col, tf in text_features(text, self.dim).items():
+            q[col] = tf * self.idf[col]
+        norm = float(np.sqrt((q * q).sum()))
+        return q / norm if norm else q
+
+    def scores(self, text: str):
+        """Cosine similarity of `text` to every row, as one array."""
+        q = self._query(text)
+        q_cols = np.flatnonzero(q)
+        starts = self.colptr[q_cols]
+        lengths = self.colptr[q_cols + 1] - starts
+        # positions of every non-zero under the query's columns, in one array
+        offsets = np.repeat(starts - (np.cumsum(lengths) - lengths), lengths)
+        idx = offsets + np.arange(int(lengths.sum()))
+        return np.bincount(
+            self.rows[idx], weights=self.vals[idx] * q[self.cols[idx]], minlength=self.n_rows
+        )
+
+    def top_k(
+        self, text: str, k: int = 10, candidates=None, min_score: float = 0.0
+    ) -> List[Tuple[int, float]]:
+        """Best `k` (row, score) pairs, optionally among `candidates` (row ids)."""
+        s = self.scores(text)
+        ids = np.arange(self.n_rows) if candidates is None else np.asarray(candidates, dtype=np.int64)
+        if not len(ids) or k <= 0:
+            return []
+        sub = s[ids]
+        if k < len(ids):
+            part = np.argpartition(-sub, k - 1)[:k]
+        else:
+            part = np.arange(len(ids))
+        part = part[np.argsort(-sub[part], kind="stable")]
+        return [(int(ids[i]), round(float(sub[i]), 4)) for i in part if sub[i] > min_score]
+
+    # ------------------ persistence ------------------
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        np.savez_compressed(
+            path, rows=self.rows, cols=self.cols, vals=self.vals, idf=self.idf,
+            n_rows=np.asarray(self.n_rows), fingerprint=np.asarray(self.fingerprint),
+        )
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX_PATH) -> "VectorIndex":
+        if np is None:
+            raise RuntimeError("the vector index needs numpy: pip install numpy")
+        with np.load(path) as data:
+            return cls(data["rows"], data["cols"], data["vals"], data["idf"],
+                       int(data["n_rows"]), str(data["fingerprint"]))
+
+
+# ---------------------------------------------------------------------
+# Morphemes + entries
+# ---------------------------------------------------------------------
+
+def _entry_glosses(tx) -> List[Dict[str, Any]]:
+    """Every lexicon entry as {headword, english, morphemes: [(surface, gloss)], tags}."""
+    out: List[Dict[str, Any]] = []
+    for entry in tx.lexicon.values():
+        out.append({
+            "headword": entry.headword,
+            "english": entry.english,
+            "morphemes": [(m.surface, m.gloss) for m in entry.morphemes or []],
+            "tags": list(entry.worldview_tags or []),
+            "source": "core",
+        })
+    for entry in tx.story_lexicon:
+        out.append({
+            "headword": entry.get("lemma") or entry.get("surface"),
+            "english": entry.get("gloss") or "",
+            "morphemes": [(m.get("piece", ""), m.get("gloss", "")) for m in entry.get("morphology") or []],
+            "tags": [],
+            "source": "story",
+        })
+    try:
+        import lnu_bridge
+        for sfo, entry in lnu_bridge.LEXICON.items():
+            out.append({
+                "headword": sfo,
+                "english": entry.english_gloss,
+                "morphemes": [(m.form, m.gloss) for m in entry.morphemes],
+                "tags": list(entry.semantic_fields or []),
+                "source": "lnu_bridge",
+            })
+    except ImportError:  # pragma: no cover
+        pass
+    return [e for e in out if e["headword"]]
+
+
+class MorphemeRetriever:
+    """
+        retriever = MorphemeRetriever.from_translator(get_translator())
+        retriever.nearest("keeps drinks chilled", slot="root")
+        retriever.compose("cooler", "keeps drinks chilled", ["food"])
+    """
+
+    def __init__(self, inventory: List[Any], entries: List[Dict[str, Any]], index: VectorIndex):
+        # rows 0..len(inventory)-1 are morphemes, the rest are entries
+        self.inventory = inventory
+        self.entries = entries
+        self.index = index
+        self._slot_rows: Dict[str, Any] = {}
+        for i, m in enumerate(inventory):
+            # inflectional finals stay in the index but never fill a slot
+            if not getattr(m, "inflectional", False):
+                self._slot_rows.setdefault(m.slot, []).append(i)
+        self._slot_rows = {s: np.asarray(r, dtype=np.int64) for s, r in self._slot_rows.items()}
+        self._entry_rows = np.arange(len(inventory), len(inventory) + len(entries), dtype=np.int64)
+
+    @staticmethod
+    def texts(inventory: List[Any], entries: List[Dict[str, Any]]) -> List[str]:
+        used_in: Dict[str, List[str]] = {}
+        for e in entries:
+            for surface, _ in e["morphemes"]:
+                used_in.setdefault(surface.strip().strip("-").lower(), []).append(e["english"])
+        texts = [" ".join([m.gloss] + used_in.get(m.surface, [])) for m in inventory]
+        texts += [
+            " ".join([e["english"]] + [g for _, g in e["morphemes"]] + [t.replace("_", " ") for t in e["tags"]])
+            for e in entries
+        ]
+        return texts
+
+    @classmethod
+    def from_translator(cls, tx, path: str = DEFAULT_INDEX_PATH, dim: int = DEFAULT_DIM) -> "MorphemeRetriever":
+        from coinage import build_inventory
+
+        inventory = build_inventory(tx)
+        entries = _entry_glosses(tx)
+        texts = cls.texts(inventory, entries)
+        index = None
+        if os.path.exists(path):
+            index = VectorIndex.load(path)
+            if index.fingerprint != fingerprint(texts, index.dim):
+                index = None  # built from other glosses; rebuild
+        return cls(inventory, entries, index or VectorIndex.build(texts, dim))
+
+    def morpheme_scores(self, text: str):
+        """Cosine of `text` to each inventory morpheme, in inventory order."""
+        return self.index.scores(text)[: len(self.inventory)]
+
+    def nearest(
+        self, text: str, k: int = 5, slot: Optional[str] = None, min_score: float = MIN_SIMILARITY
+    ) -> List[Dict[str, Any]]:
+        """Closest morphemes (optionally one slot) to `text`, best first."""
+        rows = self._slot_rows.get(slot) if slot else np.arange(len(self.inventory))
+        if rows is None:
+            return []
+        return [
+            {"surface": self.inventory[r].surface, "gloss": self.inventory[r].gloss,
+             "role": self.inventory[r].slot, "source": self.inventory[r].source, "score": s}
+            for r, s in self.index.top_k(text, k, rows, min_score)
+        ]
+
+    def nearest_entries(self, text: str, k: int = 5, min_score: float = MIN_SIMILARITY) -> List[Dict[str, Any]]:
+        """
+        Closest `k` distinct lexicon words, best first.  A word listed in
+        more than one source lexicon is returned once (its best-scoring row).
+        """
+        base = len(self.inventory)
+        n = k
+        while True:
+            hits = self.index.top_k(text, n, self._entry_rows, min_score)
+            out: List[Dict[str, Any]] = []
+            seen = set()
+            for r, s in hits:
+                e = self.entries[r - base]
+                key = (e["headword"], e["english"])
+                if key not in seen:
+                    seen.add(key)
+                    out.append({"headword": e["headword"], "english": e["english"],
+                                "source": e["source"], "score": s})
+            # widen the search while duplicates crowd out distinct words
+            if len(out) >= k or len(hits) < n or n >= len(self._entry_rows):
+                return out[:k]
+            n *= 2
+
+    def compose(
+        self, concept: str, purpose: str, domain_tags: Iterable[str] = ()
+    ) -> Optional[Dict[str, Any]]:
+        """
+        [preverb] + nearest root(s) + best final for a request, as a plain
+        dict {word, morphemes, score, related}; None when no root is near
+        enough.  Only spellings the SFO automaton accepts are proposed.
+        """
+        text = " ".join([concept, purpose] + [t.replace("_", " ") for t in domain_tags])
+        roots = self.nearest(text, k=2, slot="root")
+        if not roots:
+            return None
+        if len(roots) > 1 and roots[1]["score"] < 0.5 * roots[0]["score"]:
+            roots = roots[:1]
+        # the final slot only holds derivational finals (coinage.build_inventory)
+        finals = self.nearest(text, k=8, slot="final", min_score=-1.0)
+        preverbs = self.nearest(text, k=1, slot="preverb")
+
+        for parts in ([*preverbs, *roots], [*preverbs, roots[0]], roots, roots[:1]):
+            for final in finals[:3] or [None]:
+                morphemes = parts + ([final] if final else [])
+                word = ""
+                for m in morphemes:
+                    piece = m["surface"]
+                    # collapse a letter repeated across the boundary, as coinage.py does
+                    if word and piece and word[-1] == piece[0] and word[-1] != "'":
+                        piece = piece[1:]
+                    word += piece
+                if orthography.accepts(word):
+                    return {
+                        "word": word[:1].upper() + word[1:],
+                        "morphemes": morphemes,
+                        "score": round(sum(m["score"] for m in morphemes), 4),
+                        "related": self.nearest_entries(text, k=3),
+                    }
+        return None
+
+
+def load_or_build(tx, path: str = DEFAULT_INDEX_PATH) -> Optional[MorphemeRetriever]:
+    """Retriever over `tx`'s glosses; None without NumPy."""
+    if np is None:
+        return None
+    return MorphemeRetriever.from_translator(tx, path)
+
+
+def main(argv: Optional[Iterable[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Build the morpheme / gloss vector index.")
+    parser.add_argument("--out", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--dim", type=int, default=DEFAULT_DIM, help="hashed feature buckets")
+    parser.add_argument("--query", help="print the nearest morphemes and entries for this text")
+    args = parser.parse_args(argv)
+
+    from translator import get_translator
+    tx = get_translator()
+    from coinage import build_inventory
+    inventory, entries = build_inventory(tx), _entry_glosses(tx)
+    index = VectorIndex.build(MorphemeRetriever.texts(inventory, entries), args.dim)
+    index.save(args.out)
+    print(f"morpheme_vectors.py: {len(inventory)} morphemes + {len(entries)} entries, "
+          f"{len(index.vals)} non-zeros -> {args.out}")
+    if args.query:
+        retriever = MorphemeRetriever(inventory, entries, index)
+        for m in retriever.nearest(args.query, k=10, min_score=0.0):
+            print(f"  {m['score']:.3f}  {m['role']:<8} {m['surface']:<16} {m['gloss']}")
+        for e in retriever.nearest_entries(args.query, min_score=0.0):
+            print(f"  {e['score']:.3f}  entry    {e['headword']:<16} {e['english']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,289 @@
+"""
+orthography.py
+
+Smith-Francis orthography (SFO) normalizer and validator.
+
+Used by:
+    • translator.py – input is normalized before lexicon lookup, and
+      unknown words that are not valid SFO get a note saying so
+    • coinage.py    – partial words are pruned as soon as they can no
+      longer become valid SFO
+
+The validator is a small deterministic finite automaton compiled once into
+a transition table (state x character class).  Checking a word is one
+table step per character, so it is linear in the word length and cheap
+enough to run on every partial composition during generation.
+
+Rules encoded (prototype – refine with speakers and SFO references):
+
+    • graphemes: vowels a e i o u ɨ; consonants p t k q j l m n s w y
+      (kw / qw are written as two letters)
+    • the apostrophe marks a long vowel, so it only follows a vowel –
+      except word-initial l' as in L'nu, L'nui'suti
+    • no doubled vowel letters (length is written with ', not aa/ee)
+    • at most two vowels in a row, at most three consonants in a row
+    • hyphens may separate morphemes (ke'-sa'lul) but not start/end a word
+
+Normalization maps common non-SFO spellings onto SFO before checking:
+curly/accent apostrophes -> ', Pacifique accented vowels -> plain
+vowels (êpsi -> epsi), macron vowels -> vowel + ' (ā -> a'), and
+Listuguj / Pacifique g -> k (gesig -> kesik).  The g fold is only applied
+to tokens that can be Mi'kmaw words – made of SFO letters plus g, and not
+inside a parenthesized English gloss – so "Kataq (silver stage)" keeps its
+"stage".
+"""
+
+from __future__ import annotations
+
+import re
+import unicodedata
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+
+# ---------------------------------------------------------------------------
+# Normalization
+# ---------------------------------------------------------------------------
+
+NORMALIZE_MAP: Dict[str, str] = {}
+for _chars, _to in (
+    ("’‘ʼ´`ʹ′", "'"),
+    ("áàâäã", "a"),
+    ("éèêë", "e"),
+    ("íìîï", "i"),
+    ("óòôöõ", "o"),
+    ("úùûü", "u"),
+    ("ĝǵ", "g"),
+):
+    for _c in _chars:
+        NORMALIZE_MAP[_c] = _to
+for _c, _to in (("ā", "a'"), ("ē", "e'"), ("ī", "i'"), ("ō", "o'"), ("ū", "u'")):
+    NORMALIZE_MAP[_c] = _to
+
+_NORMALIZE_TABLE = str.maketrans(NORMALIZE_MAP)
+
+
+# One word in running text: letters with internal (or a final) apostrophe,
+# so Mi'kmaq, kesa'lul and kwe' stay whole.
+WORD_RE = re.compile(r"[^\W\d_]+(?:['’ʼ][^\W\d_]+)*['’ʼ]?", re.UNICODE)
+
+
+# letters a Listuguj / Pacifique spelling of a Mi'kmaw word can contain
+MIKMAW_LETTERS = frozenset("aeiouɨptkqjlmnswyg")
+
+
+def _fold_g(tokens: List[str]) -> List[str]:
+    out = []
+    depth = 0  # inside "( ... )": an English gloss
+    for tok in tokens:
+        in_gloss = depth > 0 or tok.startswith("(")
+        depth = max(0, depth + tok.count("(") - tok.count(")"))
+        if "g" in tok and not in_gloss and all(c in MIKMAW_LETTERS for c in tok if c.isalpha()):
+            tok = tok.replace("g", "k")
+        out.append(tok)
+    return out
+
+
+def normalize(text: str) -> str:
+    """
+    Map a word or phrase onto lowercase SFO spelling.
+
+    One pass over the input; does not validate – see check().
+    """
+    text = unicodedata.normalize("NFC", text.strip()).lower()
+    tokens = text.translate(_NORMALIZE_TABLE).split()
+    if "g" in text or "ĝ" in text or "ǵ" in text:
+        tokens = _fold_g(tokens)
+    return " ".join(tokens)
+
+
+# ---------------------------------------------------------------------------
+# Automaton
+# ---------------------------------------------------------------------------
+
+# character classes
+_VOWELS = "aeiouɨ"
+_CONSONANTS = "ptkqjlmnswy"
+(C_A, C_E, C_I, C_O, C_U, C_SCHWA, C_L, C_CONS, C_APOS, C_HYPHEN, C_OTHER) = range(11)
+_N_CLASSES = 11
+
+_CHAR_CLASS: Dict[str, int] = {}
+for _i, _v in enumerate(_VOWELS):
+    _CHAR_CLASS[_v] = _i
+    _CHAR_CLASS[_v.upper()] = _i
+for _c in _CONSONANTS:
+    _CHAR_CLASS[_c] = C_CONS
+    _CHAR_CLASS[_c.upper()] = C_CONS
+_CHAR_CLASS["l"] = _CHAR_CLASS["L"] = C_L
+_CHAR_CLASS["'"] = C_APOS
+_CHAR_CLASS["-"] = C_HYPHEN
+
+_REASONS = {
+    C_OTHER: "letter is not part of Smith-Francis orthography",
+    C_APOS: "apostrophe must follow a vowel (long vowel) or word-initial l",
+    C_HYPHEN: "hyphen must sit between two morphemes",
+}
+
+
+class _Builder:
+    """Builds the transition table from named states and rules."""
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.accepting: List[bool] = []
+
+    def state(self, name: str, accepting: bool) -> int:
+        self.names.append(name)
+        self.accepting.append(accepting)
+        return len(self.names) - 1
+
+
+def _compile() -> Tuple[List[List[int]], List[bool], List[str], int, int]:
+    b = _Builder()
+    DEAD = b.state("dead", False)
+    START = b.state("start", False)
+    HYPHEN = b.state("hyphen", False)
+    L_INIT = b.state("initial-l", True)
+    L_APOS = b.state("initial-l'", False)
+    VOWEL = [b.state(f"vowel-{v}", True) for v in _VOWELS]   # one vowel, remembers which
+    VV = b.state("two-vowels", True)
+    LONG = b.state("long-vowel", True)                       # vowel + '
+    CONS = [b.state(f"consonants-{n}", True) for n in (1, 2, 3)]
+
+    n_states = len(b.names)
+    table = [[DEAD] * _N_CLASSES for _ in range(n_states)]
+
+    def on_vowel(src: int, prev_vowel: Optional[int] = None):
+        for vc in range(len(_VOWELS)):
+            if prev_vowel is not None:
+                # doubled vowel letter is never SFO; a third vowel neither
+                table[src][vc] = DEAD if vc == prev_vowel else VV
+            else:
+                table[src][vc] = VOWEL[vc]
+
+    def on_consonant(src: int, run: int):
+        nxt = CONS[run] if run < 3 else DEAD
+        table[src][C_CONS] = nxt
+        table[src][C_L] = nxt
+
+    # start of word / after a hyphen
+    for src in (START, HYPHEN):
+        on_vowel(src)
+        on_consonant(src, 0)
+    table[START][C_L] = L_INIT
+
+    # word-initial l: like a consonant, but also allows l'
+    on_vowel(L_INIT)
+    on_consonant(L_INIT, 1)
+    table[L_INIT][C_APOS] = L_APOS
+    table[L_INIT][C_HYPHEN] = HYPHEN
+    on_vowel(L_APOS)
+    on_consonant(L_APOS, 0)
+
+    for vc, src in enumerate(VOWEL):
+        on_vowel(src, prev_vowel=vc)
+        on_consonant(src, 0)
+        table[src][C_APOS] = LONG
+        table[src][C_HYPHEN] = HYPHEN
+
+    on_consonant(VV, 0)
+    table[VV][C_APOS] = LONG
+    table[VV][C_HYPHEN] = HYPHEN
+
+    on_vowel(LONG)
+    on_consonant(LONG, 0)
+    table[LONG][C_HYPHEN] = HYPHEN
+
+    for run, src in enumerate(CONS, start=1):
+        on_vowel(src)
+        on_consonant(src, run)
+        table[src][C_HYPHEN] = HYPHEN
+
+    return table, b.accepting, b.names, START, DEAD
+
+
+_TABLE, _ACCEPTING, _STATE_NAMES, START, DEAD = _compile()
+
+
+def run(text: str, state: int = START) -> Tuple[int, int]:
+    """
+    Feed `text` to the automaton from `state`.
+
+    Returns (final state, characters consumed before dying); the second
+    value equals len(text) unless the text was rejected.  Passing the
+    returned state back in continues the same word, so callers can check
+    a word piece by piece.
+    """
+    table = _TABLE
+    classes = _CHAR_CLASS
+    for pos, ch in enumerate(text):
+        state = table[state][classes.get(ch, C_OTHER)]
+        if state == DEAD:
+            return DEAD, pos
+    return state, len(text)
+
+
+def is_accepting(state: int) -> bool:
+    """True if a word may end in `state` (as returned by run())."""
+    return _ACCEPTING[state]
+
+
+def viable(word: str) -> bool:
+    """True if `word` is valid SFO or could still become valid by adding letters."""
+    return run(word)[0] != DEAD
+
+
+def accepts(word: str) -> bool:
+    """True if `word` (one word, already normalized) is valid SFO."""
+    return _ACCEPTING[run(word)[0]]
+
+
+def is_valid_sfo(text: str) -> bool:
+    """True if every word of `text` (already normalized) is valid SFO."""
+    words = text.split()
+    return bool(words) and all(accepts(w) for w in words)
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+# ---------------------------------------------------------------------------
+
+@dataclass
+class OrthographyCheck:
+    text: str                      # input as given
+    normalized: str                # after normalize()
+    valid: bool
+    position: Optional[int] = None  # index in `normalized` where it failed
+    reason: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+# a token for check(): punctuation around and between words is skipped
+_CHECK_TOKEN_RE = re.compile(r"[\w'-]+", re.UNICODE)
+
+
+def check(text: str) -> OrthographyCheck:
+    """Normalize `text` and explain the first SFO problem, if any."""
+    norm = normalize(text)
+    tokens = list(_CHECK_TOKEN_RE.finditer(norm))
+    if not tokens:
+        return OrthographyCheck(text, norm, False, 0, "empty word")
+    for match in tokens:
+        word, offset = match.group(), match.start()
+        state, consumed = run(word)
+        if state == DEAD:
+            cls = _CHAR_CLASS.get(word[consumed], C_OTHER)
+            if cls in _REASONS:
+                reason = _REASONS[cls]
+            elif consumed and word[consumed] == word[consumed - 1]:
+                reason = "doubled vowel – long vowels are written with an apostrophe"
+            elif cls == C_CONS or cls == C_L:
+                reason = "too many consonants in a row"
+            else:
+                reason = "too many vowels in a row"
+            return OrthographyCheck(text, norm, False, offset + consumed, reason)
+        if not _ACCEPTING[state]:
+            return OrthographyCheck(text, norm, False, offset + len(word), "word cannot end here")
+    return OrthographyCheck(text, norm, True)
@@ -0,0 +1,192 @@
+"""
+result_cache.py
+
+Small thread-safe LRU cache with a TTL, an entry bound (and optionally a
+byte bound, given a `sizeof` for values), hit/miss counters and
+optional persistence to a JSON file so it survives restarts.  A persisted
+file records the cache's `namespace` (e.g. a hash of the data the values
+were computed from); a file written under another namespace is dropped
+on load instead of serving stale values.
+
+Used by LnuTranslator.generate_term_for_api (keyed on a canonicalized
+GenerationRequest).  Values must be JSON-serializable if the cache is
+persisted, and should be treated as read-only by callers – the same object
+is handed to every hit.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+
+class ResultCache:
+    """
+    LRU + TTL cache.
+
+        cache = ResultCache(max_entries=1024, ttl=3600, path="gen-cache.json", namespace=data_hash)
+        value = cache.get(key)
+        if value is None:
+            value = compute()
+            cache.put(key, value)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl: Optional[float] = 3600.0,
+        path: Optional[str] = None,
+        namespace: Optional[str] = None,
+        max_bytes: Optional[int] = None,
+        sizeof: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.namespace = namespace
+        # with `sizeof`, the values' total size is kept under max_bytes too;
+        # a value larger than max_bytes on its own is not stored
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.bytes = 0
+        # key -> (expires_at wall-clock seconds or None, value)
+        self._data: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        if path:
+            self.load()
+
+    # ------------------ core ------------------
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.time()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                self.misses += 1
+                return None
+            expires, value = item
+            if expires is not None and expires <= now:
+                self._drop(key)
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        expires = time.time() + self.ttl if self.ttl else None
+        size = self.sizeof(value) if self.sizeof is not None else 0
+        with self._lock:
+            self._drop(key)
+            if self.max_bytes is not None and size > self.max_bytes:
+                return
+            self._data[key] = (expires, value)
+            self._sizes[key] = size
+            self.bytes += size
+            self._evict()
+
+    def _drop(self, key: str) -> None:
+        if self._data.pop(key, None) is not None:
+            self.bytes -= self._sizes.pop(key, 0)
+
+    def _evict(self) -> None:
+        while len(self._data) > self.max_entries or (
+            self.max_bytes is not None and self.bytes > self.max_bytes
+        ):
+            key, _ = self._data.popitem(last=False)
+            self.bytes -= self._sizes.pop(key, 0)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "max_entries": self.max_entries,
+            "bytes": self.bytes if self.sizeof is not None else None,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+            "path": self.path,
+            "namespace": self.namespace,
+        }
+
+    # ------------------ persistence ------------------
+
+    def load(self, path: Optional[str] = None) -> int:
+        """Load unexpired entries from disk; returns how many were loaded."""
+        path = path or self.path
+        if not path or not os.path.exists(path):
+            return 0
+        try:
+            with open(path, encoding="utf-8") as fh:
+                data = json.load(fh)
+        except (OSError, ValueError):
+            # a corrupt or half-written cache is not worth failing startup for
+            return 0
+        if data.get("namespace") != self.namespace:
+            # computed from other data (patterns, lexicon...): stale
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return 0
+        rows = data.get("entries", [])
+
+        now = time.time()
+        loaded = 0
+        with self._lock:
+            for key, expires, value in rows:
+                if expires is not None and expires <= now:
+                    continue
+                self._drop(key)
+                size = self.sizeof(value) if self.sizeof is not None else 0
+                if self.max_bytes is not None and size > self.max_bytes:
+                    continue
+                self._data[key] = (expires, value)
+                self._sizes[key] = size
+                self.bytes += size
+                loaded += 1
+            self._evict()
+        return loaded
+
+    def save(self, path: Optional[str] = None) -> None:
+        """Write the cache to disk atomically (temp file + rename)."""
+        path = path or self.path
+        if not path:
+            return
+        with self._lock:
+            rows = [[k, exp, v] for k, (exp, v) in self._data.items()]
+        directory = os.path.dirname(os.path.abspath(path))
+        fd, tmp = tempfile.mkstemp(prefix=".cache-", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump({"version": 1, "namespace": self.namespace, "entries": rows}, fh)
+            os.replace(tmp, path)
+        except BaseException:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+            raise
@@ -0,0 +1,174 @@
+# serve.py
+#
+# Pre-fork launcher for api.py.
+#
+# `uvicorn api:app --workers N` starts N fresh interpreters, so every worker
+# imports translator.py, builds its own copy of the lexicon dicts and lookup
+# indexes, and pays for that on its first request.  This launcher does the
+# work ONCE in the parent, moves it out of the garbage collector's reach
+# (gc.freeze, so refcount/GC passes don't dirty the pages), and then forks
+# the workers.  The workers share those pages copy-on-write.
+#
+# Usage:
+#     python serve.py --workers 4 --port 8000
+#
+# Every worker reports its own memory at GET /stats.
+# Needs os.fork (Linux / macOS).  On Windows use plain uvicorn.
+
+import argparse
+import gc
+import os
+import signal
+import socket
+import sys
+from typing import Dict, List
+
+
+# ---------------------------------------------------------------------
+# Memory reporting
+# ---------------------------------------------------------------------
+
+_SMAPS_FIELDS = {
+    "Rss": "rss",
+    "Pss": "pss",
+    "Shared_Clean": "shared_clean",
+    "Shared_Dirty": "shared_dirty",
+    "Private_Clean": "private_clean",
+    "Private_Dirty": "private_dirty",
+}
+
+
+def process_memory() -> Dict[str, int]:
+    """
+    Memory used by the current process, in bytes.
+
+    On Linux this reads /proc/self/smaps_rollup, which splits RSS into
+    shared and private pages – the shared part is what pre-forking saves.
+    Elsewhere only the peak RSS from getrusage is available.
+    """
+    try:
+        with open("/proc/self/smaps_rollup") as fh:
+            out: Dict[str, int] = {}
+            for line in fh:
+                name, _, rest = line.partition(":")
+                if name in _SMAPS_FIELDS:
+                    out[_SMAPS_FIELDS[name]] = int(rest.split()[0]) * 1024
+            if out:
+                return out
+    except OSError:
+        pass
+
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is kB on Linux, bytes on macOS
+    if sys.platform != "darwin":
+        peak *= 1024
+    return {"max_rss": peak}
+
+
+# ---------------------------------------------------------------------
+# Pre-fork server
+# ---------------------------------------------------------------------
+
+def _bind(host: str, port: int) -> socket.socket:
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def _run_worker(app, sock: socket.socket, log_level: str) -> None:
+    import uvicorn
+
+    # the parent's handlers must not leak into the worker; uvicorn sets its own
+    signal.signal(signal.SIGINT, signal.SIG_DFL)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+    config = uvicorn.Config(app, log_level=log_level, lifespan="on")
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+def _fork_worker(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 0
+        try:
+            _run_worker(app, sock, log_level)
+        except BaseException:
+            code = 1
+        finally:
+            os._exit(code)
+    return pid
+
+
+def serve(host: str = "0.0.0.0", port: int = 8000, workers: int = 2,
+          log_level: str = "info") -> None:
+    """
+    Build the translator and its indexes once, then fork `workers` copies
+    of the API that all accept on the same listening socket.
+    """
+    # api refuses lexicon edits it could not share with the other workers
+    os.environ["LNU_SERVE_WORKERS"] = str(workers)
+    # Importing api builds the translator singleton; warm() builds every index.
+    import api
+
+    api.translator.warm()
+
+    # Everything allocated so far is long-lived.  Freezing it keeps the
+    # collector from touching (and so un-sharing) those pages in the children.
+    gc.collect()
+    gc.freeze()
+
+    sock = _bind(host, port)
+    children: List[int] = []
+    stopping = False
+
+    def _stop(signum, _frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGINT, _stop)
+    signal.signal(signal.SIGTERM, _stop)
+
+    for _ in range(workers):
+        children.append(_fork_worker(api.app, sock, log_level))
+    print(f"serve.py: parent {os.getpid()} forked workers {children} on {host}:{port}")
+
+    while children:
+        try:
+            pid, _status = os.wait()
+        except ChildProcessError:
+            break
+        except InterruptedError:
+            continue
+        if pid in children:
+            children.remove(pid)
+        if not stopping:
+            # a crashed worker is re-forked from the same warm parent
+            children.append(_fork_worker(api.app, sock, log_level))
+
+    sock.close()
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description="Pre-fork launcher for the Lnu Translator API.")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 2)
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+
+    serve(host=args.host, port=args.port, workers=args.workers, log_level=args.log_level)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+singleflight.py
+
+In-flight de-duplication ("singleflight") for the translator calls in api.py.
+
+When a class opens the same story sentence at once, dozens of identical
+/explain-sentence requests arrive within milliseconds.  The first caller for
+a key runs the computation; every caller that arrives with the same key
+while it is still running waits for it and gets the same result (or the
+same exception).  Nothing is kept once the call finishes – that is what
+the caches are for; this only collapses concurrent duplicates.
+
+The api.py routes are plain `def`s that FastAPI runs in its thread pool, so
+this is thread-based.  Results are shared objects: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "waiters")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+
+class SingleFlight:
+    """
+    flights = SingleFlight()
+    result = flights.do("sentence:" + key, lambda: tx.explain_sentence_for_api(s))
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.calls = 0       # do() invocations
+        self.executions = 0  # times fn actually ran
+        self.coalesced = 0   # callers that shared someone else's run
+        self.errors = 0
+        self.max_waiters = 0
+
+    def do(self, key: str, fn: Callable[[], T]) -> T:
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            if call is not None:
+                call.waiters += 1
+                self.coalesced += 1
+                self.max_waiters = max(self.max_waiters, call.waiters)
+                leader = False
+            else:
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as exc:
+            call.error = exc
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "coalesced_ratio": round(self.coalesced / self.calls, 4) if self.calls else None,
+            "errors": self.errors,
+            "in_flight": self.in_flight(),
+            "max_waiters": self.max_waiters,
+        }
@@ -0,0 +1,153 @@
+"""
+suggest.py
+
+As-you-type completions for the language page (GET /suggest, WS /ws/suggest).
+
+The index is a sorted array of normalized keys (SFO-normalized headwords and
+surface forms from LEXICON_CORE and LNU_LEXICON, plus an apostrophe-free
+spelling so "kesal" finds "kesa'lul").  A prefix query is two binary
+searches for the matching key range, then a top-k by usage frequency over
+that range.  Top-k lists for every 1- and 2-letter prefix are precomputed at
+build time, because those are the only ranges that get large.
+
+Frequency = how often the word appears in the lexicons' example sentences
+(+1 for having an entry).  Call set_frequencies() with better counts – e.g.
+from a corpus index – when they exist.
+"""
+
+from __future__ import annotations
+
+import heapq
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, Tuple
+
+import orthography
+from lexicon_overlays import REMOVED, Alias
+
+
+MAX_K = 50
+# prefixes up to this length get their top-MAX_K precomputed
+PRECOMPUTE_PREFIX = 2
+
+
+def _keys_for(text: str) -> List[str]:
+    key = orthography.normalize(text)
+    keys = [key]
+    bare = key.replace("'", "")
+    if bare != key:
+        keys.append(bare)
+    return keys
+
+
+class SuggestIndex:
+    """
+    Sorted-array prefix index.
+
+        idx = SuggestIndex.from_translator(get_translator())
+        idx.suggest("kes", k=5)
+    """
+
+    def __init__(self, items: Iterable[Tuple[str, str, str]]):
+        """
+        items: (display text, headword it leads to, source) triples.
+        Spellings that normalize the same are merged; the first one wins.
+        """
+        targets: Dict[str, Dict[str, Any]] = {}
+        for text, headword, source in items:
+            norm = orthography.normalize(text)
+            t = targets.setdefault(norm, {"text": text, "headword": headword, "source": source})
+            if t["source"] != source and source not in t["source"].split("+"):
+                t["source"] += "+" + source
+        self._targets: List[Dict[str, Any]] = list(targets.values())
+        self._frequency: List[float] = [1.0] * len(self._targets)
+
+        pairs = []
+        for i, t in enumerate(self._targets):
+            for key in _keys_for(t["text"]):
+                pairs.append((key, i))
+        pairs.sort()
+        self._keys: List[str] = [k for k, _ in pairs]
+        self._ids: List[int] = [i for _, i in pairs]
+        self._top: Dict[str, List[int]] = {}
+        self._precompute()
+
+    @classmethod
+    def from_translator(cls, tx) -> "SuggestIndex":
+        """
+        Index `tx`'s words; for a dialect view (tx.overlay) that is its own
+        entries and local spellings first, without the headwords it removes.
+        """
+        items: List[Tuple[str, str, str]] = []
+        examples: List[str] = []
+        overlay = getattr(tx, "overlay", None)
+        if overlay is not None:
+            for key, hit in overlay.delta.items():
+                if isinstance(hit, Alias):
+                    items.append((key, hit.headword, "dialect"))
+                elif hit is not REMOVED:
+                    items.append((hit.headword, hit.headword, "dialect"))
+                    examples.extend(hit.examples or [])
+        for hw, entry in tx.lexicon.items():
+            if overlay is not None and overlay.get(hw) is not None:
+                continue  # removed, or replaced by the dialect's own entry above
+            items.append((hw, hw, "core"))
+            examples.extend(entry.examples or [])
+        for entry in tx.story_lexicon:
+            target = entry.get("lemma") or entry.get("surface")
+            for text in (entry.get("surface"), entry.get("lemma")):
+                if text and (overlay is None or overlay.get(text) is not REMOVED):
+                    items.append((text, target, "story"))
+            examples.extend(ex.get("mikmaq", "") for ex in entry.get("examples") or [])
+
+        index = cls(items)
+        counts: Dict[str, float] = {}
+        for sentence in examples:
+            for tok in orthography.WORD_RE.findall(sentence):
+                key = orthography.normalize(tok)
+                counts[key] = counts.get(key, 0.0) + 1.0
+        index.set_frequencies(counts, base=1.0)
+        return index
+
+    def __len__(self) -> int:
+        return len(self._targets)
+
+    # ------------------ ranking data ------------------
+
+    def set_frequencies(self, counts: Dict[str, float], base: float = 1.0) -> None:
+        """Rank by `counts` (normalized word -> count) plus `base`."""
+        for i, t in enumerate(self._targets):
+            self._frequency[i] = base + counts.get(orthography.normalize(t["text"]), 0.0)
+        self._precompute()
+
+    def _precompute(self) -> None:
+        top: Dict[str, List[int]] = {}
+        buckets: Dict[str, set] = {}
+        for key, i in zip(self._keys, self._ids):
+            for n in range(1, PRECOMPUTE_PREFIX + 1):
+                if len(key) >= n:
+                    buckets.setdefault(key[:n], set()).add(i)
+        for prefix, ids in buckets.items():
+            top[prefix] = heapq.nlargest(MAX_K, ids, key=self._rank_key)
+        self._top = top
+
+    def _rank_key(self, i: int) -> Tuple[float, int, List[int]]:
+        # higher frequency first; shorter / alphabetical breaks ties
+        t = self._targets[i]["text"]
+        return (self._frequency[i], -len(t), [-ord(c) for c in t[:8]])
+
+    # ------------------ queries ------------------
+
+    def suggest(self, prefix: str, k: int = 10) -> List[Dict[str, Any]]:
+        k = max(1, min(k, MAX_K))
+        p = orthography.normalize(prefix)
+        if not p:
+            return []
+
+        if len(p) <= PRECOMPUTE_PREFIX:
+            ids = self._top.get(p, [])[:k]
+        else:
+            lo = bisect_left(self._keys, p)
+            hi = bisect_left(self._keys, p + "\U0010ffff", lo)
+            ids = heapq.nlargest(k, set(self._ids[lo:hi]), key=self._rank_key)
+
+        return [dict(self._targets[i], frequency=self._frequency[i]) for i in ids]
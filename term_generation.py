@@ -0,0 +1,189 @@
+"""
+term_generation.py
+
+Data-driven pattern library behind LnuTranslator.generate_modern_term.
+
+Patterns live in generation_patterns.json (shared with bridge.js) instead of
+being hardcoded `if "refrigerator" in ...` branches.  Each pattern says which
+purpose/concept keywords and which domain tags point at it, with weights, and
+which morpheme template it proposes.
+
+At load time the library is compiled into an inverted index:
+
+    keyword -> [(pattern number, weight), ...]
+    tag     -> [(pattern number, weight), ...]
+
+so matching a request only touches the postings for the words it actually
+contains – the cost grows with the number of *matching* patterns, not with
+the size of the library.
+
+This module only knows about plain dicts; translator.py turns matches into
+Morpheme / GenerationCandidate objects.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_PATTERNS_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "generation_patterns.json"
+)
+
+# Words that never carry the purpose of a concept.
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be by for from has have in into is it its of on or
+    so that the their them they this to was were which while with
+    """.split()
+)
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def tokenize_text(text: str) -> List[str]:
+    """Lowercase, split into words and drop stop words."""
+    return [
+        w.strip("'")
+        for w in _WORD_RE.findall(text.lower())
+        if w.strip("'") and w.strip("'") not in STOP_WORDS
+    ]
+
+
+def word_variants(word: str) -> Tuple[str, ...]:
+    # "keeps" should hit a "keep" keyword; good enough for English purposes.
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return (word, word[:-1])
+    return (word,)
+
+
+@dataclass
+class GenerationPattern:
+    id: str
+    word: str
+    morphemes: List[Dict[str, Any]]
+    explanation: str
+    caution: str
+    keywords: Dict[str, float] = field(default_factory=dict)
+    domain_tags: Dict[str, float] = field(default_factory=dict)
+    min_score: float = 1.0
+    fallback: bool = False
+    base_score: float = 0.0
+
+    @classmethod
+    def from_dict(cls, d: Dict[str, Any]) -> "GenerationPattern":
+        return cls(
+            id=d["id"],
+            word=d["word"],
+            morphemes=list(d.get("morphemes", [])),
+            explanation=d.get("explanation", ""),
+            caution=d.get("caution", ""),
+            keywords={k.lower(): float(w) for k, w in d.get("keywords", {}).items()},
+            domain_tags={t.lower(): float(w) for t, w in d.get("domain_tags", {}).items()},
+            min_score=float(d.get("min_score", 1.0)),
+            fallback=bool(d.get("fallback", False)),
+            base_score=float(d.get("base_score", 0.0)),
+        )
+
+
+@dataclass
+class PatternMatch:
+    pattern: GenerationPattern
+    score: float
+    matched_keywords: List[str]
+    matched_tags: List[str]
+
+
+class PatternLibrary:
+    """
+    Compiled, indexed set of generation patterns.
+
+        lib = PatternLibrary.from_file()
+        lib.match("refrigerator", "keeps food cold", ["home"], top_k=3)
+    """
+
+    def __init__(self, patterns: Iterable[GenerationPattern]):
+        self.patterns: List[GenerationPattern] = list(patterns)
+        self._keyword_index: Dict[str, List[Tuple[int, float]]] = {}
+        self._tag_index: Dict[str, List[Tuple[int, float]]] = {}
+        self._fallbacks: List[int] = []
+        # content hash, part of the generation cache key
+        blob = json.dumps([asdict(p) for p in self.patterns], sort_keys=True, ensure_ascii=False)
+        self.version = hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+
+        for i, pat in enumerate(self.patterns):
+            if pat.fallback:
+                self._fallbacks.append(i)
+            for kw, weight in pat.keywords.items():
+                self._keyword_index.setdefault(kw, []).append((i, weight))
+            for tag, weight in pat.domain_tags.items():
+                self._tag_index.setdefault(tag, []).append((i, weight))
+
+    @classmethod
+    def from_dicts(cls, items: Iterable[Dict[str, Any]]) -> "PatternLibrary":
+        return cls(GenerationPattern.from_dict(d) for d in items)
+
+    @classmethod
+    def from_file(cls, path: Optional[str] = None) -> "PatternLibrary":
+        with open(path or DEFAULT_PATTERNS_PATH, encoding="utf-8") as fh:
+            data = json.load(fh)
+        return cls.from_dicts(data.get("patterns", []))
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+    def match(
+        self,
+        concept: str,
+        purpose: str,
+        domain_tags: Iterable[str] = (),
+        top_k: Optional[int] = None,
+    ) -> List[PatternMatch]:
+        """
+        Score every pattern reachable from the request's words and tags,
+        keep those over their min_score, add the fallbacks, and rank.
+        """
+        scores: Dict[int, float] = {}
+        keywords: Dict[int, List[str]] = {}
+        tags: Dict[int, List[str]] = {}
+
+        seen = set()
+        for word in tokenize_text(concept) + tokenize_text(purpose):
+            for variant in word_variants(word):
+                if variant in seen:
+                    continue
+                seen.add(variant)
+                for i, weight in self._keyword_index.get(variant, ()):
+                    scores[i] = scores.get(i, 0.0) + weight
+                    keywords.setdefault(i, []).append(variant)
+
+        for tag in {t.strip().lower() for t in domain_tags if t}:
+            for i, weight in self._tag_index.get(tag, ()):
+                scores[i] = scores.get(i, 0.0) + weight
+                tags.setdefault(i, []).append(tag)
+
+        matches: List[Tuple[int, PatternMatch]] = []
+        for i, score in scores.items():
+            pat = self.patterns[i]
+            if pat.fallback or score < pat.min_score:
+                continue
+            matches.append((i, PatternMatch(pat, score, keywords.get(i, []), tags.get(i, []))))
+
+        for i in self._fallbacks:
+            pat = self.patterns[i]
+            matches.append((i, PatternMatch(
+                pat, pat.base_score + scores.get(i, 0.0),
+                keywords.get(i, []), tags.get(i, []),
+            )))
+
+        # real matches first, then by score, ties in library order
+        matches.sort(key=lambda m: (m[1].pattern.fallback, -m[1].score, m[0]))
+        ranked = [m for _, m in matches]
+        if top_k is not None:
+            ranked = ranked[: max(top_k, 0)]
+        return ranked
@@ -0,0 +1,5 @@
+# The modules live flat at the repo root; make them importable from tests/.
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,104 @@
+import random
+
+import pytest
+
+from annotation_sessions import AnnotationSession, AnnotationSessions, EditConflict, split_sentences
+from translator import get_translator
+
+DOC = "Kesalul nikmaq. Wela'lin."
+
+
+@pytest.fixture(scope="module")
+def tx():
+    return get_translator()
+
+
+def _layout(session):
+    return [(s.start, s.end, s.text, [t["token"] for t in s.tokens]) for s in session.sentences]
+
+
+def _fresh_layout(tx, text):
+    return _layout(AnnotationSession(tx, text, max_chars=10_000))
+
+
+def test_split_sentences_offsets():
+    text = "  Kataq.  Nme'j!\nTekek"
+    for start, end, sentence in split_sentences(text):
+        assert text[start:end] == sentence
+
+
+def test_edits_match_a_full_resplit(tx):
+    # adding and deleting "." / "!" / newlines merges and splits sentences;
+    # after every edit the incremental state must equal a from-scratch split
+    rng = random.Random(7)
+    pieces = ["Kesalul", " nikmaq", ".", "!", " ", "\n", "Wela'lin", "tekek", "?", ""]
+    session = AnnotationSession(tx, DOC, max_chars=10_000)
+    for _ in range(300):
+        start = rng.randint(0, len(session.text))
+        end = rng.randint(start, min(len(session.text), start + 6))
+        session.apply_edits([{"start": start, "end": end, "text": rng.choice(pieces)}])
+        assert _layout(session) == _fresh_layout(tx, session.text)
+
+
+def test_unchanged_sentences_keep_their_ids(tx):
+    session = AnnotationSession(tx, DOC, max_chars=10_000)
+    second = session.sentences[1].id
+    reply = session.apply_edits([{"start": 0, "end": 7, "text": "Kwe"}])
+    assert session.sentences[1].id == second
+    assert [s["text"] for s in reply["changed"]] == ["Kwe nikmaq."]
+    assert session.sentences[1].start == len("Kwe nikmaq. ")
+
+
+def test_batch_with_bad_edit_changes_nothing(tx):
+    session = AnnotationSession(tx, DOC, max_chars=10_000)
+    before = _layout(session)
+    with pytest.raises(ValueError):
+        session.apply_edits([{"start": 0, "end": 7, "text": "Kwe"}, {"start": 500, "end": 600, "text": "x"}],
+                            version=0)
+    assert session.text == DOC
+    assert session.version == 0
+    assert _layout(session) == before
+    # the same client can retry a corrected batch against version 0
+    session.apply_edits([{"start": 0, "end": 7, "text": "Kwe"}], version=0)
+    assert session.text == "Kwe nikmaq. Wela'lin."
+
+
+def test_edit_ranges_use_the_length_left_by_earlier_edits(tx):
+    session = AnnotationSession(tx, DOC, max_chars=10_000)
+    n = len(DOC)
+    # valid only because the first edit makes the document longer
+    session.apply_edits([{"start": n, "end": n, "text": " Kataq."}, {"start": n + 1, "end": n + 6, "text": "Tekek"}])
+    assert session.text == DOC + " Tekek."
+
+
+def test_failed_apply_is_rolled_back(tx, monkeypatch):
+    session = AnnotationSession(tx, DOC, max_chars=10_000)
+    before = _layout(session)
+    calls = []
+
+    def boom(*args):
+        calls.append(args)
+        if len(calls) == 2:
+            raise RuntimeError("analysis failed")
+        return original(*args)
+
+    original = session._apply
+    monkeypatch.setattr(session, "_apply", boom)
+    with pytest.raises(RuntimeError):
+        session.apply_edits([{"start": 0, "end": 7, "text": "Kwe"}, {"start": 0, "end": 3, "text": "Kesalul"}])
+    assert (session.text, session.version, _layout(session)) == (DOC, 0, before)
+
+
+def test_oversized_batch_is_rejected_whole(tx):
+    session = AnnotationSession(tx, DOC, max_chars=len(DOC) + 5)
+    with pytest.raises(ValueError):
+        session.apply_edits([{"start": 0, "end": 0, "text": "abc"}, {"start": 0, "end": 0, "text": "defghi"}])
+    assert session.text == DOC
+
+
+def test_version_conflict():
+    sessions = AnnotationSessions(get_translator())
+    sid, state = sessions.create(DOC)
+    sessions.edit(sid, [{"start": 0, "end": 0, "text": " "}], version=state["version"])
+    with pytest.raises(EditConflict):
+        sessions.edit(sid, [{"start": 0, "end": 0, "text": " "}], version=state["version"])
@@ -0,0 +1,49 @@
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+import columnar_export as ce
+from translator import get_translator
+
+
+@pytest.fixture(scope="module")
+def tx():
+    return get_translator()
+
+
+@pytest.mark.parametrize("ext", ["arrow", "parquet"])
+def test_lexicon_round_trip_across_batches(tmp_path, tx, ext):
+    # batch_size=3: every batch has a different set of pos / animacy values
+    path = str(tmp_path / f"lexicon.{ext}")
+    rows = ce.export_lexicon(path, tx, batch_size=3)
+    table = ce.read_table(path)
+    assert rows == table.num_rows == len(list(ce.lexicon_rows(tx)))
+    expected = [r["headword"] for r in ce.lexicon_rows(tx)]
+    assert table.column("headword").to_pylist() == expected
+    assert sum(b.num_rows for b in ce.iter_batches(path)) == rows
+
+
+@pytest.mark.parametrize("ext", ["arrow", "parquet"])
+def test_annotations_with_changing_values(tmp_path, tx, ext):
+    sentences = ["Kesalul kataq"] * 50 + ["nme'jik tekek"] * 50
+    path = str(tmp_path / f"tokens.{ext}")
+    rows = ce.export_annotations(sentences, path, tx, batch_size=40)
+    table = ce.read_table(path, columns=["sentence_id", "position", "token"])
+    assert rows == table.num_rows == 200
+    assert table.column("token").to_pylist()[-2:] == ["nme'jik", "tekek"]
+
+
+def test_ipc_schema_has_no_dictionaries(tmp_path):
+    path = str(tmp_path / "x.arrow")
+    with ce.BatchWriter(path, ce.lexicon_schema()) as writer:
+        pass
+    assert not any(pa.types.is_dictionary(f.type) for f in writer.schema)
+
+
+def test_exit_does_not_flush_after_error(tmp_path):
+    path = str(tmp_path / "x.arrow")
+    with pytest.raises(KeyError):
+        with ce.BatchWriter(path, ce.annotation_schema(), batch_size=10) as writer:
+            writer.write({"sentence_id": "not a number"})
+            raise KeyError("original")
+    assert writer.rows == 0
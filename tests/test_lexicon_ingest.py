@@ -0,0 +1,108 @@
+import csv
+import json
+import random
+
+import pytest
+
+import lexicon_ingest as li
+
+
+def _read_jsonl(path):
+    with open(path, encoding="utf-8") as fh:
+        return [json.loads(line) for line in fh]
+
+
+def _rows(source, n, rng):
+    words = ["kesalul", "Gesig", "kesik", "tekek", "nme'j", "kataq", "wikuom", "sal"]
+    out = []
+    for i in range(n):
+        out.append({
+            "surface": rng.choice(words),
+            "gloss": rng.choice(["one", "two", None]),
+            "pos": rng.choice(["noun", "verb", None]),
+            "examples": [{"mikmaq": f"{source} ex {i % 5}", "english": ""}],
+            "worldview_notes": [f"{source} note {i % 3}"],
+        })
+    return out
+
+
+def test_external_sort_gives_the_same_result_as_one_run(tmp_path):
+    rng = random.Random(2)
+    sources = [(name, _rows(name, 60, rng)) for name in ("a", "b", "c")]
+    small = li.ingest(sources, str(tmp_path / "small"), run_size=7)
+    big = li.ingest(sources, str(tmp_path / "big"), run_size=10_000)
+    assert small["runs"] > 1 and big["runs"] == 1
+    assert _read_jsonl(tmp_path / "small" / "lexicon.jsonl") == _read_jsonl(tmp_path / "big" / "lexicon.jsonl")
+    assert {k: v for k, v in small.items() if k != "runs"} == {k: v for k, v in big.items() if k != "runs"}
+    assert small["entries"] + small["duplicates"] == small["rows"] - small["invalid"]
+
+
+def test_spellings_collapse_and_first_source_wins(tmp_path):
+    sources = [
+        ("first", [{"surface": "Kesik", "gloss": "winter", "pos": "noun",
+                    "examples": "Kesik – winter", "worldview_notes": "cold season"}]),
+        ("second", [{"surface": "gesig", "gloss": "Winter ", "pos": "verb",
+                     "examples": "Kesik – winter|Gesig tekek – winter is cold"}]),
+    ]
+    summary = li.ingest(sources, str(tmp_path))
+    (entry,) = _read_jsonl(tmp_path / "lexicon.jsonl")
+    assert summary["entries"] == 1 and summary["duplicates"] == 1
+    assert entry["surface"] == "Kesik" and entry["pos"] == "noun"
+    assert entry["source"] == "first; second"
+    assert [ex["mikmaq"] for ex in entry["examples"]] == ["Kesik", "Gesig tekek"]
+    assert entry["needsReview"]
+    report = _read_jsonl(tmp_path / "report.jsonl")
+    # "winter" / "Winter " agree once compared; only the POS conflicts
+    assert [(r["kind"], r.get("field")) for r in report] == [("conflict", "pos")]
+
+
+def test_fills_gaps_from_lower_priority_sources(tmp_path):
+    sources = [
+        ("first", [{"surface": "tekek", "gloss": "TODO"}]),
+        ("second", [{"surface": "tekek", "gloss": "it is cold", "animacy": "inanimate",
+                     "morphemes": "tekek:root:cold"}]),
+    ]
+    li.ingest(sources, str(tmp_path))
+    (entry,) = _read_jsonl(tmp_path / "lexicon.jsonl")
+    assert entry["gloss"] == "it is cold"
+    assert entry["animacy"] == "inanimate"
+    assert [m["piece"] for m in entry["morphology"]] == ["tekek"]
+
+
+def test_invalid_rows_and_missing_morphemes_are_reported(tmp_path):
+    sources = [("s", [{"gloss": "no headword"}, {"surface": "kataq", "animacy": "sometimes"},
+                      {"surface": "kataq", "morphemes": "zzz:root:?"}])]
+    summary = li.ingest(sources, str(tmp_path))
+    kinds = [r["kind"] for r in _read_jsonl(tmp_path / "report.jsonl")]
+    assert summary["invalid"] == 2 and summary["entries"] == 1
+    assert kinds.count("invalid") == 2 and "missing_morpheme" in kinds
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 5, 64, 1 << 16])
+def test_json_array_source_any_chunk_size(tmp_path, chunk_size):
+    rows = [{"surface": "kesalul", "n": 12.5, "tags": ["a", "]"]}, {"surface": "tek\"ek", "n": -3e2},
+            {"surface": "nme'j", "n": 1000000, "x": None, "y": True}]
+    path = tmp_path / "rows.json"
+    path.write_text("  [\n" + ",\n ".join(json.dumps(r) for r in rows) + "\n]\n", encoding="utf-8")
+    assert list(li.json_array_source(str(path), chunk_size=chunk_size)) == rows
+
+
+def test_json_array_source_rejects_non_arrays(tmp_path):
+    path = tmp_path / "obj.json"
+    path.write_text('{"surface": "x"}', encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(li.json_array_source(str(path)))
+
+
+def test_file_sources_by_extension(tmp_path):
+    csv_path = tmp_path / "rows.csv"
+    with open(csv_path, "w", newline="", encoding="utf-8") as fh:
+        w = csv.DictWriter(fh, ["headword", "english", "morphemes"])
+        w.writeheader()
+        w.writerow({"headword": "kesalul", "english": "I love you", "morphemes": "ke-:prefix:I|sal:root:love"})
+    jsonl_path = tmp_path / "rows.jsonl"
+    jsonl_path.write_text('{"surface": "tekek"}\n\n{"surface": "kataq"}\n', encoding="utf-8")
+    (rec,) = [li.to_record(r, "csv") for r in li.file_source(str(csv_path))]
+    assert rec["gloss"] == "I love you"
+    assert [m["piece"] for m in rec["morphology"]] == ["ke-", "sal"]
+    assert [r["surface"] for r in li.file_source(str(jsonl_path))] == ["tekek", "kataq"]
@@ -0,0 +1,146 @@
+import json
+import os
+import random
+
+import pytest
+
+from lexicon_versions import UnknownVersion, VersionedLexicon
+
+BASE = {
+    "kesalul": {"headword": "kesalul", "english": "I love you"},
+    "tekek": {"headword": "tekek", "english": "it is cold"},
+}
+
+
+def _entry(hw, english):
+    return {"headword": hw, "english": english}
+
+
+def _replay_model(edits, as_of):
+    """Brute force: the lexicon at version `as_of`, from the list of edits."""
+    state = dict(BASE)
+    for version, (hw, data) in enumerate(edits, 1):
+        if version > as_of:
+            break
+        if data is None:
+            state.pop(hw, None)
+        else:
+            state[hw] = data
+    return state
+
+
+def _random_edits(store, n, rng):
+    edits = []
+    words = list(BASE) + ["kataq", "nme'j", "wikuom"]
+    for i in range(n):
+        hw = rng.choice(words)
+        if store.get(hw) is not None and rng.random() < 0.2:
+            store.delete(hw, author="t")
+            edits.append((hw, None))
+        else:
+            data = _entry(hw, f"gloss {i}")
+            store.put(hw, data, author="t", note=str(i))
+            edits.append((hw, data))
+    return edits
+
+
+def _state(store, as_of):
+    return {hw: store.get(hw, as_of) for hw in store.view(as_of)}
+
+
+def test_every_version_matches_a_full_replay():
+    store = VersionedLexicon(BASE)
+    edits = _random_edits(store, 60, random.Random(1))
+    assert store.head == 60
+    for v in range(0, 61):
+        assert _state(store, v) == _replay_model(edits, v)
+    with pytest.raises(UnknownVersion):
+        store.resolve(61)
+
+
+def test_lookup_folds_case_and_spelling_at_any_version():
+    store = VersionedLexicon(BASE)
+    v = store.put("Kesik", _entry("Kesik", "winter"))
+    assert store.lookup("kesik")["english"] == "winter"
+    assert store.lookup("GESIG")["english"] == "winter"
+    assert store.lookup("kesik", as_of=v - 1) is None
+    with pytest.raises(KeyError):
+        store.delete("nope")
+
+
+def test_log_reopens_to_the_same_state(tmp_path):
+    path = str(tmp_path / "lexicon.log")
+    store = VersionedLexicon(BASE, path=path, checkpoint_every=1000)
+    edits = _random_edits(store, 40, random.Random(2))
+    reopened = VersionedLexicon(BASE, path=path)
+    assert reopened.head == 40 and reopened.lineage == store.lineage
+    for v in range(0, 41, 3):
+        assert _state(reopened, v) == _replay_model(edits, v)
+    assert [r["note"] for r in reopened.history("tekek")] == [r["note"] for r in store.history("tekek")]
+
+
+def test_checkpoint_plus_log_tail_replays_old_versions(tmp_path):
+    path = str(tmp_path / "lexicon.log")
+    store = VersionedLexicon(BASE, path=path, checkpoint_every=7)
+    edits = _random_edits(store, 30, random.Random(3))
+    assert os.path.exists(store.checkpoint_path)
+    with open(store.checkpoint_path, encoding="utf-8") as fh:
+        assert json.load(fh)["version"] == 28
+
+    reopened = VersionedLexicon(BASE, path=path, checkpoint_every=7)
+    assert reopened.stats()["history_loaded_from"] == 28
+    assert _state(reopened, None) == _replay_model(edits, 30)
+    # versions older than the checkpoint come back from the log
+    for v in (0, 5, 27, 28, 29):
+        assert _state(reopened, v) == _replay_model(edits, v)
+    assert reopened.stats()["history_loaded_from"] == 0
+    assert len(reopened.history("kesalul")) == len(store.history("kesalul"))
+
+
+def test_checkpoint_from_another_log_is_ignored(tmp_path):
+    path = str(tmp_path / "lexicon.log")
+    store = VersionedLexicon(BASE, path=path, checkpoint_every=2)
+    _random_edits(store, 4, random.Random(4))
+    checkpoint = store.checkpoint_path
+    os.remove(path)
+    fresh = VersionedLexicon(BASE, path=path)
+    assert os.path.exists(checkpoint)
+    assert fresh.head == 0 and _state(fresh, None) == BASE
+
+
+def test_two_writers_share_one_version_sequence(tmp_path):
+    path = str(tmp_path / "lexicon.log")
+    a = VersionedLexicon(BASE, path=path)
+    b = VersionedLexicon(BASE, path=path)
+    assert a.put("kataq", _entry("kataq", "eel")) == 1
+    # b has not refreshed yet; its put applies a's record first
+    assert b.put("tekek", _entry("tekek", "cold")) == 2
+    assert b.get("kataq")["english"] == "eel"
+    a.refresh()
+    assert a.head == 2 and a.get("tekek")["english"] == "cold"
+
+
+def test_half_written_record_is_not_applied(tmp_path):
+    path = str(tmp_path / "lexicon.log")
+    a = VersionedLexicon(BASE, path=path)
+    a.put("kataq", _entry("kataq", "eel"))
+    with open(path, "ab") as fh:
+        fh.write(b'{"version": 2, "headword": "tek')
+    b = VersionedLexicon(BASE, path=path)
+    assert b.head == 1
+
+
+def test_lineage_is_per_process_without_a_log():
+    store = VersionedLexicon(BASE)
+    parent = store.lineage
+    read, write = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read)
+        os.write(write, store.lineage.encode())
+        os._exit(0)
+    os.close(write)
+    child = os.read(read, 64).decode()
+    os.close(read)
+    os.waitpid(pid, 0)
+    assert child and child != parent and store.lineage == parent
@@ -0,0 +1,95 @@
+import itertools
+import random
+import re
+
+import pytest
+
+import orthography
+
+VOWELS = "aeiouɨ"
+CONSONANTS = "ptkqjlmnswy"
+
+
+def reference_accepts(word):
+    """The rules in orthography.py's docstring, checked directly."""
+    w = word.lower()
+    if not w or w[0] == "-" or w[-1] == "-" or "--" in w:
+        return False
+    if any(c not in VOWELS + CONSONANTS + "'-" for c in w):
+        return False
+    for i, c in enumerate(w):
+        if c == "'":
+            after_vowel = i > 0 and w[i - 1] in VOWELS
+            initial_l = i == 1 and w[0] == "l"
+            if not (after_vowel or initial_l):
+                return False
+    if w == "l'" or w.startswith("l'-"):
+        return False
+    for morpheme in w.split("-"):
+        for run in re.findall(f"[{VOWELS}]+", morpheme):
+            if len(run) > 2 or (len(run) == 2 and run[0] == run[1]):
+                return False
+        for run in re.findall(f"[{CONSONANTS}]+", morpheme):
+            if len(run) > 3:
+                return False
+    return True
+
+
+def test_automaton_matches_reference_exhaustively():
+    alphabet = "aeltk'-"
+    for n in range(1, 7):
+        for chars in itertools.product(alphabet, repeat=n):
+            word = "".join(chars)
+            assert orthography.accepts(word) == reference_accepts(word), word
+
+
+def test_automaton_matches_reference_on_random_words():
+    rng = random.Random(3)
+    alphabet = VOWELS + CONSONANTS + "'-" + "LAgxb"
+    for _ in range(20000):
+        word = "".join(rng.choice(alphabet) for _ in range(rng.randint(1, 12)))
+        assert orthography.accepts(word) == reference_accepts(word), word
+
+
+@pytest.mark.parametrize("word", ["kesalul", "kesa'lul", "ke'-sa'lul", "L'nu", "l'nui'suti", "tekek", "nme'jik"])
+def test_known_words_are_valid(word):
+    assert orthography.accepts(word)
+
+
+def test_run_continues_piece_by_piece():
+    rng = random.Random(5)
+    for _ in range(2000):
+        word = "".join(rng.choice(VOWELS + CONSONANTS + "'-") for _ in range(rng.randint(1, 10)))
+        cut = rng.randint(0, len(word))
+        state, _ = orthography.run(word[:cut])
+        if state != orthography.DEAD:
+            state, _ = orthography.run(word[cut:], state)
+        assert state == orthography.run(word)[0]
+        assert orthography.viable(word) == (state != orthography.DEAD)
+
+
+def test_run_reports_where_it_died():
+    state, consumed = orthography.run("kaab")
+    assert state == orthography.DEAD and consumed == 2
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Gesig", "kesik"),
+    ("Mi’kmaq", "mi'kmaq"),
+    ("êpsi", "epsi"),
+    ("tā", "ta'"),
+    ("Kataq (silver stage)", "kataq (silver stage)"),
+    ("  Kesalul   nikmaq ", "kesalul nikmaq"),
+])
+def test_normalize(text, expected):
+    assert orthography.normalize(text) == expected
+
+
+def test_check_explains_the_first_problem():
+    assert orthography.check("Kesa'lul nikmaq.").valid
+    bad = orthography.check("kesalul kaan")
+    assert not bad.valid
+    assert bad.position == len("kesalul ka")
+    assert "doubled vowel" in bad.reason
+    assert orthography.check("...").reason == "empty word"
+    assert orthography.check("ke-").reason == "word cannot end here"
@@ -0,0 +1,92 @@
+import random
+
+import pytest
+
+from timeline_service import PRESENT_YEAR, IntervalTree, TimelineEvent, TimelineService, parse_date_range
+
+
+def _brute(intervals, start, end):
+    hits = [(s, e, i) for s, e, i in intervals if s <= end and e >= start]
+    return [i for _, _, i in sorted(hits)]
+
+
+@pytest.mark.parametrize("n", [0, 1, 2, 3, 10, 257])
+def test_interval_tree_matches_brute_force(n):
+    rng = random.Random(n)
+    intervals = []
+    for i in range(n):
+        s = rng.randint(-500, 500)
+        intervals.append((float(s), float(s + rng.choice([0, 0, 1, 5, 50, 400])), i))
+    tree = IntervalTree(intervals)
+    assert len(tree) == n
+    inf = float("inf")
+    queries = [(-inf, inf), (-inf, -600), (600, inf), (0, 0)]
+    queries += [tuple(sorted((rng.uniform(-700, 700), rng.uniform(-700, 700)))) for _ in range(300)]
+    for start, end in queries:
+        assert tree.overlapping(start, end) == _brute(intervals, start, end), (start, end)
+
+
+def test_interval_tree_touching_bounds_count():
+    tree = IntervalTree([(1.0, 2.0, 0), (2.0, 3.0, 1), (4.0, 4.0, 2)])
+    assert tree.overlapping(2.0, 2.0) == [0, 1]
+    assert tree.overlapping(3.5, 3.9) == []
+    assert tree.overlapping(4.0, 10.0) == [2]
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("", None),
+    (None, None),
+    ("contemporary", None),
+    (1610, (1610.0, 1610.0)),
+    ("1725", (1725.0, 1725.0)),
+    ("24 June 1610", (1610.0, 1610.0)),
+    ("c. 0–1800 CE", (0.0, 1800.0)),
+    ("500 BCE – 1000 CE", (-500.0, 1000.0)),
+    ("500–300 BCE", (-500.0, -300.0)),
+    ("1000 BC to 500", (-1000.0, 500.0)),
+    ("2000 B.C.E.–1500 B.C.E.", (-2000.0, -1500.0)),
+    ("1750 AD", (1750.0, 1750.0)),
+    ("1914-18", (1914.0, 1918.0)),
+    ("-11500", (-11500.0, -11500.0)),
+    ("-12000 BP", (PRESENT_YEAR - 12000.0, PRESENT_YEAR - 12000.0)),
+    ("c. 13,500–11,000 years ago", (PRESENT_YEAR - 13500.0, PRESENT_YEAR - 11000.0)),
+])
+def test_parse_date_range(text, expected):
+    assert parse_date_range(text) == expected
+
+
+@pytest.mark.parametrize("text", ["18th century", "the 1st millennium", "1610-06-24", "1610-06"])
+def test_parse_date_range_rejects_forms_it_cannot_place(text):
+    assert parse_date_range(text) is None
+
+
+def _event(i, start, end, era):
+    return TimelineEvent(id=f"e{i}", source="test", title=f"event {i}", era=era,
+                         start=start, end=end, date_display="", tags=["t"] if i % 2 else [])
+
+
+def test_service_query_matches_brute_force():
+    rng = random.Random(11)
+    eras = ["Before Contact", "Treaty Era", "Modern"]
+    events = []
+    for i in range(120):
+        s = rng.randint(-2000, 2000)
+        events.append(_event(i, float(s), float(s + rng.randint(0, 300)), rng.choice(eras)))
+    service = TimelineService(events, eras)
+    for _ in range(100):
+        start, end = sorted((rng.randint(-2500, 2500), rng.randint(-2500, 2500)))
+        era = rng.choice(eras + [None])
+        got = service.query(start=start, end=end, era=era, limit=1000)
+        want = [e for e in events if e.start <= end and e.end >= start and (era is None or e.era == era)]
+        want.sort(key=lambda e: (e.start, e.end, int(e.id[1:])))
+        assert got["total"] == len(want)
+        assert [e["id"] for e in got["events"]] == [e.id for e in want]
+
+
+def test_service_paging_order_and_tags():
+    events = [_event(i, float(i), float(i), "Modern") for i in range(10)]
+    service = TimelineService(events)
+    page = service.query(offset=2, limit=3, order="desc")
+    assert [e["id"] for e in page["events"]] == ["e7", "e6", "e5"]
+    assert service.query(tag="T")["total"] == 5
+    assert service.query(era="nope")["total"] == 0
@@ -0,0 +1,579 @@
+"""
+timeline_service.py
+
+Server-side queries over the timeline data the site ships as JavaScript:
+
+    timelineData.js   TIMELINE_EVENTS – the Two-Eyed Seeing timeline cards
+    data.js           LNU_DATA        – eras, figures, timeline_events
+
+timeline.js filters these client-side by scanning the whole arrays, so
+every visitor downloads everything.  This module reads both files once
+(a small parser for the JS object literals they contain – no Node needed)
+and answers filtered, paged queries:
+
+    • dates: "24 June 1610", "1725", "c. 0–1800 CE", "-12000 BP",
+      "c. 13,500–11,000 years ago" ... all become [start, end] in years CE
+      (BCE negative; BP and "years ago" count back from 1950, as
+      radiocarbon dates do)
+    • interval tree over [start, end] (sorted by start, each node knowing
+      the latest end below it), one for all events and one per era:
+      "overlapping 1700–1760 in the Treaty Era" costs O(log n + hits)
+    • inverted indexes: figure -> events, word -> events (for "mentioning
+      Membertou")
+    • results in date order, paged with offset / limit
+
+Usage:
+    service = TimelineService.from_files()
+    service.query(start=1700, end=1760, era="Treaty Era", mention="Membertou")
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_TIMELINE_PATH = os.path.join(_HERE, "timelineData.js")
+DEFAULT_DATA_PATH = os.path.join(_HERE, "data.js")
+
+# "years ago" / BP are counted back from this year
+PRESENT_YEAR = 1950
+
+MAX_PAGE = 200
+
+
+# ---------------------------------------------------------------------
+# JS object-literal parser
+# ---------------------------------------------------------------------
+#
+# Enough of JavaScript for data files: objects (quoted or bare keys),
+# arrays, strings in ' or ", numbers, true / false / null / undefined,
+# `"a" + "b"` concatenation, comments and trailing commas.
+
+_TOKEN_RE = re.compile(
+    r"""
+      (?P<ws>\s+|//[^\n]*|/\*.*?\*/)
+    | (?P<str>"(?:[^"\\\n]|\\.)*"|'(?:[^'\\\n]|\\.)*')
+    | (?P<num>-?(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+    | (?P<name>[A-Za-z_$][\w$]*)
+    | (?P<punct>[{}\[\]:,+;=])
+    """,
+    re.VERBOSE | re.DOTALL,
+)
+
+_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f", "v": "\v", "0": "\0"}
+_CONSTANTS = {"true": True, "false": False, "null": None, "undefined": None}
+
+
+def _unescape(body: str) -> str:
+    def repl(m: "re.Match[str]") -> str:
+        s = m.group(1)
+        if s[0] == "u":
+            return chr(int(s[1:], 16))
+        if s[0] == "x":
+            return chr(int(s[1:], 16))
+        return _ESCAPES.get(s, s)
+
+    return re.sub(r"\\(u[0-9a-fA-F]{4}|x[0-9a-fA-F]{2}|.)", repl, body, flags=re.DOTALL)
+
+
+def _tokenize(text: str) -> List[Tuple[str, Any]]:
+    tokens: List[Tuple[str, Any]] = []
+    pos = 0
+    while pos < len(text):
+        m = _TOKEN_RE.match(text, pos)
+        if m is None:
+            raise ValueError(f"unexpected {text[pos:pos + 20]!r} at offset {pos}")
+        pos = m.end()
+        kind = m.lastgroup
+        if kind == "ws":
+            continue
+        value = m.group(kind)
+        if kind == "str":
+            value = _unescape(value[1:-1])
+        elif kind == "num":
+            value = float(value) if any(c in value for c in ".eE") else int(value)
+        tokens.append((kind, value))
+    return tokens
+
+
+class _Parser:
+    def __init__(self, tokens: List[Tuple[str, Any]], pos: int = 0):
+        self.tokens = tokens
+        self.pos = pos
+
+    def _peek(self) -> Tuple[str, Any]:
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else ("eof", None)
+
+    def _take(self, value: Optional[str] = None) -> Tuple[str, Any]:
+        tok = self._peek()
+        if value is not None and tok != ("punct", value):
+            raise ValueError(f"expected {value!r}, got {tok[1]!r}")
+        self.pos += 1
+        return tok
+
+    def value(self) -> Any:
+        kind, val = self._peek()
+        if (kind, val) == ("punct", "{"):
+            out = self._object()
+        elif (kind, val) == ("punct", "["):
+            out = self._array()
+        elif kind in ("str", "num"):
+            self.pos += 1
+            out = val
+        elif kind == "name" and val in _CONSTANTS:
+            self.pos += 1
+            out = _CONSTANTS[val]
+        else:
+            raise ValueError(f"unexpected {val!r}")
+        # "a" + "b" string concatenation
+        while self._peek() == ("punct", "+"):
+            self.pos += 1
+            out = out + self.value()
+        return out
+
+    def _object(self) -> Dict[str, Any]:
+        self._take("{")
+        out: Dict[str, Any] = {}
+        while self._peek() != ("punct", "}"):
+            kind, key = self._take()
+            if kind not in ("str", "name", "num"):
+                raise ValueError(f"bad object key {key!r}")
+            self._take(":")
+            out[str(key)] = self.value()
+            if self._peek() == ("punct", ","):
+                self.pos += 1
+        self._take("}")
+        return out
+
+    def _array(self) -> List[Any]:
+        self._take("[")
+        out: List[Any] = []
+        while self._peek() != ("punct", "]"):
+            out.append(self.value())
+            if self._peek() == ("punct", ","):
+                self.pos += 1
+        self._take("]")
+        return out
+
+
+def parse_js_literal(text: str) -> Any:
+    """Parse one JS object / array / scalar literal."""
+    return _Parser(_tokenize(text)).value()
+
+
+def load_js_const(path: str, name: str) -> Any:
+    """Value of `const NAME = <literal>;` (or let / var) in a JS file."""
+    with open(path, encoding="utf-8") as fh:
+        tokens = _tokenize(fh.read())
+    for i in range(len(tokens) - 2):
+        if (
+            tokens[i] in (("name", "const"), ("name", "let"), ("name", "var"))
+            and tokens[i + 1] == ("name", name)
+            and tokens[i + 2] == ("punct", "=")
+        ):
+            return _Parser(tokens, i + 3).value()
+    raise KeyError(f"{name} not found in {path}")
+
+
+# ---------------------------------------------------------------------
+# Dates
+# ---------------------------------------------------------------------
+
+_NUMBER_RE = re.compile(r"\d[\d,]*(?:\.\d+)?")
+_RANGE_SPLIT_RE = re.compile(r"\s*(?:–|—|−|\bto\b|(?<=\d)\s*-\s*(?=\d))\s*")
+_AGO_RE = re.compile(r"\by(?:ea)?rs ago\b|\bb\.?p\.?(?=\W|$)")
+_BCE_RE = re.compile(r"\bb\.?c\.?(?:e\.?)?(?=\W|$)")
+_CE_RE = re.compile(r"\b(?:c\.?e\.?|a\.?d\.?)(?=\W|$)")
+# forms this parser would misplace: "18th century", ISO "1610-06-24"
+_ORDINAL_RE = re.compile(r"\b\d+(?:st|nd|rd|th)\b")
+_ISO_DATE_RE = re.compile(r"\b\d{4}-(?:\d{2}-\d{2}|0[1-9])\b")
+
+
+def _era(part: str) -> Optional[str]:
+    if _AGO_RE.search(part):
+        return "ago"
+    if _BCE_RE.search(part):
+        return "bce"
+    if _CE_RE.search(part):
+        return "ce"
+    return None
+
+
+def parse_date_range(text: Any) -> Optional[Tuple[float, float]]:
+    """
+    [start, end] in years CE for the date formats used in the data files;
+    None when there is no date in it ("contemporary", "") or it is in a
+    form that can't be placed on the axis (centuries, ISO dates).
+
+    Each side of a range keeps its own era ("500 BCE – 1000 CE"); a side
+    without one takes the era of the side after it ("500–300 BCE").
+    """
+    if text is None or text == "":
+        return None
+    if isinstance(text, (int, float)):
+        return float(text), float(text)
+    s = str(text).strip().lower()
+    if _ORDINAL_RE.search(s) or _ISO_DATE_RE.search(s):
+        return None
+
+    parts: List[Tuple[float, Optional[str], bool]] = []
+    for part in _RANGE_SPLIT_RE.split(s):
+        found = _NUMBER_RE.findall(part)
+        if found:
+            # "24 June 1610": the year comes last
+            year = float(found[-1].replace(",", ""))
+            parts.append((year, _era(part), part.lstrip().startswith("-")))
+    if not parts:
+        return None
+
+    years: List[float] = []
+    era: Optional[str] = None
+    for year, marked, minus in reversed(parts):
+        era = marked or era
+        if era == "ago":
+            years.append(PRESENT_YEAR - year)
+        elif era == "bce" or minus:
+            years.append(-year)
+        else:
+            years.append(year)
+    years.reverse()
+    # "1914-18": the end only repeats the last digits of the start
+    if len(parts) == 2 and years[0] > 0 and 0 < years[1] < years[0] and parts[1][1] is None:
+        digits = len(str(int(parts[1][0])))
+        if len(str(int(parts[0][0]))) > digits:
+            scale = 10 ** digits
+            end = years[0] // scale * scale + years[1]
+            if end > years[0]:
+                years[1] = end
+    return min(years), max(years)
+
+
+# ---------------------------------------------------------------------
+# Events
+# ---------------------------------------------------------------------
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def words(text: str) -> List[str]:
+    return [w.lower() for w in _WORD_RE.findall(text)]
+
+
+def slug(text: str) -> str:
+    return "_".join(words(text))
+
+
+@dataclass
+class TimelineEvent:
+    id: str
+    source: str        # "timelineData.js" or "data.js"
+    title: str
+    era: str
+    start: float
+    end: float
+    date_display: str
+    type: Optional[str] = None
+    tags: List[str] = field(default_factory=list)
+    people: List[str] = field(default_factory=list)
+    record: Dict[str, Any] = field(default_factory=dict)  # the original object
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "source": self.source,
+            "title": self.title,
+            "era": self.era,
+            "type": self.type,
+            "tags": self.tags,
+            "start": self.start,
+            "end": self.end,
+            "date_display": self.date_display,
+            "people": self.people,
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.summary(), record=self.record)
+
+    def text(self) -> str:
+        parts = [self.title, self.era, self.type or "", " ".join(self.tags), " ".join(self.people)]
+        parts += [v for v in self.record.values() if isinstance(v, str)]
+        for person in self.record.get("people") or []:
+            parts += [v for v in person.values() if isinstance(v, str)]
+        return " ".join(parts)
+
+
+def events_from_timeline_data(items: Iterable[Dict[str, Any]]) -> List[TimelineEvent]:
+    out = []
+    for d in items:
+        span = parse_date_range(d.get("dateDisplay")) or parse_date_range(d.get("sortKey"))
+        if span is None:
+            continue
+        out.append(TimelineEvent(
+            id=d["id"],
+            source="timelineData.js",
+            title=d.get("title", ""),
+            era=d.get("era", ""),
+            start=span[0],
+            end=span[1],
+            date_display=d.get("dateDisplay", ""),
+            type=d.get("type"),
+            tags=list(d.get("tags") or []),
+            people=[p.get("name", "") for p in d.get("people") or []],
+            record=d,
+        ))
+    return out
+
+
+def events_from_lnu_data(data: Dict[str, Any]) -> List[TimelineEvent]:
+    out = []
+    for d in data.get("timeline_events", []):
+        start = parse_date_range(d.get("start"))
+        end = parse_date_range(d.get("end"))
+        if start is None and end is None:
+            continue
+        lo = (start or end)[0]
+        hi = (end or start)[1]
+        display = str(d.get("start", ""))
+        if d.get("end") not in (None, "", d.get("start")):
+            display += " – " + str(d["end"])
+        out.append(TimelineEvent(
+            id=d["id"],
+            source="data.js",
+            title=d.get("label", ""),
+            era=d.get("era", ""),
+            start=min(lo, hi),
+            end=max(lo, hi),
+            date_display=display,
+            tags=list(d.get("tags") or []),
+            record=d,
+        ))
+    return out
+
+
+# ---------------------------------------------------------------------
+# Interval tree
+# ---------------------------------------------------------------------
+
+class IntervalTree:
+    """
+    Static augmented interval tree: intervals sorted by start form an
+    implicit balanced BST (the middle of each slice is its root), and
+    max_end[i] is the latest end in the subtree rooted at i.  Overlap
+    queries skip every subtree that ends before the query or starts after
+    it: O(log n + hits), hits come out in start order.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[float, float, int]]):
+        items = sorted(intervals)
+        self.starts = [s for s, _, _ in items]
+        self.ends = [e for _, e, _ in items]
+        self.ids = [i for _, _, i in items]
+        self.max_end = list(self.ends)
+        self._augment(0, len(items))
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def _augment(self, lo: int, hi: int) -> float:
+        if lo >= hi:
+            return float("-inf")
+        mid = (lo + hi) // 2
+        self.max_end[mid] = max(self.ends[mid], self._augment(lo, mid), self._augment(mid + 1, hi))
+        return self.max_end[mid]
+
+    def overlapping(self, start: float, end: float) -> List[int]:
+        out: List[int] = []
+        # explicit in-order traversal, so hits stay sorted by start
+        pending: List[Tuple[int, int]] = []
+        lo, hi = 0, len(self.ids)
+        while True:
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if self.max_end[mid] < start:
+                    break  # nothing in this subtree reaches the query
+                pending.append((mid, hi))
+                hi = mid
+            if not pending:
+                return out
+            mid, hi = pending.pop()
+            if self.starts[mid] > end:
+                # this node and everything after it in order start too late
+                return out
+            if self.ends[mid] >= start:
+                out.append(self.ids[mid])
+            lo = mid + 1
+
+
+# ---------------------------------------------------------------------
+# Service
+# ---------------------------------------------------------------------
+
+class TimelineService:
+    """
+        service = TimelineService.from_files()
+        service.query(start=1700, end=1760, era="Treaty Era", figure="membertou")
+        # -> {total, offset, limit, events: [ {id, title, era, start, end, ...}, ... ]}
+    """
+
+    def __init__(
+        self,
+        events: List[TimelineEvent],
+        eras: Optional[List[str]] = None,
+        figures: Optional[Dict[str, Dict[str, Any]]] = None,
+        version: str = "",
+    ):
+        self.events = events
+        self.version = version
+        self._by_id = {e.id: i for i, e in enumerate(events)}
+        # figures: data.js LNU_DATA.figures plus everyone named in a card's people
+        self.figures: Dict[str, Dict[str, Any]] = dict(figures or {})
+        for e in events:
+            for person in e.record.get("people") or []:
+                key = slug(person.get("name", ""))
+                if key and key not in self.figures:
+                    self.figures[key] = dict(person)
+        self.eras = list(dict.fromkeys(list(eras or []) + [e.era for e in events if e.era]))
+
+        self._words: Dict[str, Set[int]] = {}
+        for i, e in enumerate(events):
+            for w in set(words(e.text())):
+                self._words.setdefault(w, set()).add(i)
+
+        self._by_figure: Dict[str, Set[int]] = {}
+        for key, fig in self.figures.items():
+            # an event is about a figure when it mentions every word of the
+            # figure's id (membertou, donald_marshall_jr, ...)
+            self._by_figure[key] = self._mentioning(key.replace("_", " "))
+
+        self._tree = IntervalTree((e.start, e.end, i) for i, e in enumerate(events))
+        by_era: Dict[str, List[Tuple[float, float, int]]] = {}
+        for i, e in enumerate(events):
+            by_era.setdefault(e.era.lower(), []).append((e.start, e.end, i))
+        self._era_trees = {era: IntervalTree(items) for era, items in by_era.items()}
+
+    @classmethod
+    def from_files(
+        cls, timeline_path: str = DEFAULT_TIMELINE_PATH, data_path: str = DEFAULT_DATA_PATH
+    ) -> "TimelineService":
+        events: List[TimelineEvent] = []
+        eras: List[str] = []
+        figures: Dict[str, Dict[str, Any]] = {}
+        digest = hashlib.sha256()
+        if os.path.exists(data_path):
+            data = load_js_const(data_path, "LNU_DATA")
+            events += events_from_lnu_data(data)
+            eras = list(data.get("eras", []))
+            figures = dict(data.get("figures", {}))
+            with open(data_path, "rb") as fh:
+                digest.update(fh.read())
+        if os.path.exists(timeline_path):
+            events += events_from_timeline_data(load_js_const(timeline_path, "TIMELINE_EVENTS"))
+            with open(timeline_path, "rb") as fh:
+                digest.update(fh.read())
+        return cls(events, eras, figures, digest.hexdigest()[:16])
+
+    # ------------------ lookups ------------------
+
+    def _mentioning(self, text: str) -> Set[int]:
+        wanted = words(text)
+        if not wanted:
+            return set(range(len(self.events)))
+        postings = sorted((self._words.get(w, set()) for w in wanted), key=len)
+        hits = set(postings[0])
+        for p in postings[1:]:
+            hits &= p
+        return hits
+
+    def get(self, event_id: str) -> Optional[TimelineEvent]:
+        i = self._by_id.get(event_id)
+        return self.events[i] if i is not None else None
+
+    def query(
+        self,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+        era: Optional[str] = None,
+        figure: Optional[str] = None,
+        mention: Optional[str] = None,
+        tag: Optional[str] = None,
+        order: str = "asc",
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Dict[str, Any]:
+        """
+        Events overlapping [start, end] (open-ended when either is None),
+        optionally only in one era, about one figure, mentioning some
+        words, or carrying a tag; in date order, one page at a time.
+        """
+        tree = self._tree
+        if era:
+            tree = self._era_trees.get(era.strip().lower())
+            if tree is None:
+                return {"total": 0, "offset": offset, "limit": limit, "events": []}
+        ids = tree.overlapping(
+            float("-inf") if start is None else start,
+            float("inf") if end is None else end,
+        )
+
+        keep: Optional[Set[int]] = None
+        if figure:
+            keep = self._by_figure.get(figure) or self._by_figure.get(slug(figure)) or set()
+        if mention:
+            found = self._mentioning(mention)
+            keep = found if keep is None else keep & found
+        if keep is not None:
+            ids = [i for i in ids if i in keep]
+        if tag:
+            t = tag.strip().lower()
+            ids = [i for i in ids if any(x.lower() == t for x in self.events[i].tags)]
+        if order == "desc":
+            ids.sort(key=lambda i: (-self.events[i].start, -self.events[i].end))
+
+        offset = max(0, offset)
+        limit = max(0, min(limit, MAX_PAGE))
+        return {
+            "total": len(ids),
+            "offset": offset,
+            "limit": limit,
+            "events": [self.events[i].summary() for i in ids[offset:offset + limit]],
+        }
+
+    def era_stats(self) -> List[Dict[str, Any]]:
+        out = []
+        for name in self.eras:
+            tree = self._era_trees.get(name.lower())
+            n = len(tree) if tree is not None else 0
+            out.append({
+                "era": name,
+                "events": n,
+                "start": tree.starts[0] if n else None,
+                "end": max(tree.ends) if n else None,
+            })
+        return out
+
+    def figure_list(self) -> List[Dict[str, Any]]:
+        return [
+            {"id": key, "name": fig.get("name", key), "role": fig.get("role"),
+             "events": len(self._by_figure.get(key, ()))}
+            for key, fig in self.figures.items()
+        ]
+
+    def figure(self, key: str) -> Optional[Dict[str, Any]]:
+        fig = self.figures.get(key)
+        if fig is None:
+            return None
+        ids = sorted(self._by_figure.get(key, ()), key=lambda i: (self.events[i].start, self.events[i].end))
+        return dict(fig, id=key, events=[self.events[i].summary() for i in ids])
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "events": len(self.events),
+            "eras": len(self.eras),
+            "figures": len(self.figures),
+            "indexed_words": len(self._words),
+            "version": self.version,
+        }
@@ -38,8 +38,22 @@ so the structure stays stable while the knowledge grows.
 
 from __future__ import annotations
 
+import copy
+import hashlib
+import json
+import os
 from dataclasses import dataclass, asdict
-from typing import List, Dict, Optional, Any
+from typing import List, Dict, Iterable, Optional, Any, Tuple
+
+import animacy_model
+import morpheme_vectors
+import orthography
+from heavy_hitters import UnknownWordTracker
+from lexicon_overlays import REMOVED, Alias, DialectOverlay, OverlayRegistry
+from lexicon_versions import LexiconView, VersionedLexicon
+from lexicon_data import LNU_LEXICON, load_lexicon
+from result_cache import ResultCache
+from term_generation import PatternLibrary, tokenize_text
 
 
 # ---------------------------------------------------------------------------
@@ -67,6 +81,43 @@ class WordEntry:
     examples: List[str] = None        # example Mi'kmaw sentences
 
 
+def entry_from_dict(d: Dict[str, Any]) -> WordEntry:
+    """WordEntry from its asdict() shape (JSON files, overlays)."""
+    return WordEntry(
+        headword=d["headword"],
+        english=d.get("english", ""),
+        part_of_speech=d.get("part_of_speech", ""),
+        animacy=d.get("animacy"),
+        morphemes=[
+            Morpheme(m["surface"], m.get("gloss", ""), m.get("role", ""), m.get("notes"))
+            for m in d.get("morphemes") or []
+        ],
+        register=d.get("register"),
+        worldview_tags=d.get("worldview_tags") or [],
+        examples=d.get("examples") or [],
+    )
+
+
+def entry_from_story(rec: Dict[str, Any]) -> WordEntry:
+    """WordEntry from a story-lexicon record (lexicon.js / LNU_LEXICON shape)."""
+    return WordEntry(
+        headword=rec.get("surface") or rec.get("lemma") or "",
+        english=rec.get("gloss") or "",
+        part_of_speech=rec.get("pos") or "",
+        animacy=rec.get("animacy"),
+        morphemes=[
+            Morpheme(m.get("piece", ""), m.get("gloss", ""), m.get("type", ""))
+            for m in rec.get("morphology") or []
+        ],
+        # story worldview_notes are free text, not tags
+        worldview_tags=[],
+        examples=[
+            " – ".join(p for p in (ex.get("mikmaq"), ex.get("english")) if p)
+            for ex in rec.get("examples") or []
+        ],
+    )
+
+
 @dataclass
 class AnalysisResult:
     word: str
@@ -75,6 +126,8 @@ class AnalysisResult:
     guessed_morphemes: List[Morpheme]
     animacy_guess: Optional[str]
     worldview_notes: List[str]
+    # 1.0 for a lexicon entry, lower for rule / model guesses
+    animacy_confidence: Optional[float] = None
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -83,6 +136,7 @@ class AnalysisResult:
             "entry": asdict(self.entry) if self.entry else None,
             "guessed_morphemes": [asdict(m) for m in self.guessed_morphemes],
             "animacy_guess": self.animacy_guess,
+            "animacy_confidence": self.animacy_confidence,
             "worldview_notes": self.worldview_notes,
         }
 
@@ -101,6 +155,17 @@ class GenerationRequest:
     purpose: str
     domain_tags: List[str]
 
+    def cache_key(self, top_k: Optional[int] = None) -> str:
+        """
+        Canonical form used as a cache key: lowercased, stop words removed,
+        words de-duplicated and sorted, domain tags sorted.  Pattern matching
+        only looks at the set of words, so requests that differ only in
+        wording like "keeps the food cold" / "Keeps food cold" share a key.
+        """
+        words = sorted(set(tokenize_text(self.concept) + tokenize_text(self.purpose)))
+        tags = sorted({t.strip().lower() for t in self.domain_tags if t and t.strip()})
+        return "w=%s|t=%s|k=%s" % (" ".join(words), ",".join(tags), top_k)
+
 
 @dataclass
 class GenerationCandidate:
@@ -108,6 +173,8 @@ class GenerationCandidate:
     breakdown: List[Morpheme]
     explanation: str
     caution: str  # reminder to check with fluent speakers / elders
+    score: float = 0.0               # ranking score from the pattern library
+    pattern_id: Optional[str] = None  # which pattern produced it
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -115,6 +182,8 @@ class GenerationCandidate:
             "breakdown": [asdict(m) for m in self.breakdown],
             "explanation": self.explanation,
             "caution": self.caution,
+            "score": self.score,
+            "pattern_id": self.pattern_id,
         }
 
 
@@ -250,6 +319,10 @@ WORLDVIEW_HINTS = {
 }
 
 
+# confidence reported for guesses from ANIMACY_HINTS / the -jik rule
+RULE_CONFIDENCE = 0.9
+
+
 def guess_animacy(word: str) -> Optional[str]:
     word_lower = word.lower()
     for frag, anim in ANIMACY_HINTS.items():
@@ -295,44 +368,323 @@ class LnuTranslator:
         )
     """
 
-    def __init__(self, lexicon: Optional[Dict[str, WordEntry]] = None):
-        self.lexicon = lexicon or LEXICON_CORE
+    def __init__(
+        self,
+        lexicon: Optional[Dict[str, WordEntry]] = None,
+        story_lexicon: Optional[List[Dict[str, Any]]] = None,
+        patterns: Optional[PatternLibrary] = None,
+        generation_cache: Optional[ResultCache] = None,
+        unknown_words: Optional[UnknownWordTracker] = None,
+        animacy: Optional["animacy_model.AnimacyModel"] = None,
+        overlays: Optional[OverlayRegistry] = None,
+        versions: Optional[VersionedLexicon] = None,
+    ):
+        # the core lexicon and every speaker correction since, as numbered
+        # versions (lexicon_versions.py); `lexicon` is its live head
+        self.versions = versions or VersionedLexicon(lexicon or LEXICON_CORE, make_entry=entry_from_dict)
+        # story-derived entries shared with lexicon.js (see lexicon_data.py)
+        self.story_lexicon = story_lexicon or LNU_LEXICON
+        # generation patterns (generation_patterns.json), loaded on first use
+        self._patterns = patterns
+        # generate_term_for_api results, keyed on generation_version plus
+        # GenerationRequest.cache_key()
+        self.generation_cache = generation_cache or ResultCache()
+        # words analyze_word had no entry for, most looked-up first
+        # (heavy_hitters.py); None = don't track
+        self.unknown_words = unknown_words
+        # n-gram fallback for guess_animacy (animacy_model.py), loaded on
+        # first use; stays None without NumPy
+        self._animacy_model = animacy
+        self._animacy_model_loaded = animacy is not None
+        # nearest morphemes / entries for any purpose text
+        # (morpheme_vectors.py), loaded on first use; None without NumPy
+        self._morpheme_retriever: Optional["morpheme_vectors.MorphemeRetriever"] = None
+        self._morpheme_retriever_loaded = False
+        self._morpheme_retriever_revision = 0  # lexicon version it was built from
+        # lookup indexes, built lazily or up front by warm()
+        self._story_index: Optional[Dict[str, Dict[str, Any]]] = None
+        # the same entries as WordEntry, for lookup() after the core lexicon
+        self._story_entries: Dict[str, WordEntry] = {}
+        self._content_version: Optional[str] = None
+        # per-community deltas (dialect_overlays.json), loaded on first use;
+        # for_dialect() hands out views that share everything above
+        self._overlays = overlays
+        self._overlay: Optional[DialectOverlay] = None
+        self._dialect_views: Dict[str, "LnuTranslator"] = {}
+        self._base: Optional["LnuTranslator"] = None
+        self.warmed = False
+
+    # ------------------ indexes / warmup ------------------
+
+    def warm(self) -> "LnuTranslator":
+        """
+        Build every lookup index now instead of on the first request.
+
+        Call this once in the parent process before forking workers
+        (see serve.py) so the indexes live in pages the workers share.
+        Safe to call more than once.
+        """
+        if not self.warmed:
+            self._build_indexes()
+            _ = self.patterns
+            _ = self.lexicon_version
+            _ = self.animacy_model
+            _ = self.morpheme_retriever
+            _ = self.overlays
+            self.warmed = True
+        return self
+
+    @property
+    def lexicon(self) -> LexiconView:
+        """The core lexicon at the latest version (a read-only mapping)."""
+        return self.versions.view()
+
+    @property
+    def lexicon_version(self) -> str:
+        """
+        Content hash of the lexicon snapshot this translator serves.
+
+        Changes whenever any entry changes, so it can key HTTP ETags and
+        caches of lexicon-derived answers.
+        """
+        return self.lexicon_version_at(None)
+
+    def lexicon_version_at(self, as_of: Optional[int] = None) -> str:
+        """lexicon_version as of an earlier version number (None = latest)."""
+        if self._base is not None:
+            base = self._base.lexicon_version_at(as_of)
+            return hashlib.sha256((base + self._overlay.version).encode("utf-8")).hexdigest()[:16]
+        if self._content_version is None:
+            snapshot = {
+                "core": {hw: asdict(e) for hw, e in self.versions.view(0).items()},
+                "story": self.story_lexicon,
+            }
+            blob = json.dumps(snapshot, sort_keys=True, ensure_ascii=False, default=str)
+            self._content_version = hashlib.sha256(blob.encode("utf-8")).hexdigest()[:16]
+        revision = self.versions.resolve(as_of)
+        if revision == 0:
+            return self._content_version
+        tag = f"{self._content_version}:{self.versions.lineage}:{revision}"
+        return hashlib.sha256(tag.encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def generation_version(self) -> str:
+        """
+        Hash of everything generate_term_for_api depends on: the pattern
+        library, the lexicon and the morpheme vector index.  Generation
+        cache keys start with it, so a redeploy or a lexicon edit never
+        serves candidates computed from older data.
+        """
+        retriever = self.morpheme_retriever
+        parts = [
+            self.patterns.version,
+            self.lexicon_version,
+            retriever.index.fingerprint if retriever is not None else "-",
+        ]
+        return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()[:16]
+
+    @property
+    def animacy_model(self) -> Optional["animacy_model.AnimacyModel"]:
+        if not self._animacy_model_loaded:
+            self._animacy_model = animacy_model.load_or_train(self)
+            self._animacy_model_loaded = True
+        return self._animacy_model
+
+    @property
+    def morpheme_retriever(self) -> Optional["morpheme_vectors.MorphemeRetriever"]:
+        # rebuilt after a lexicon edit, so new glosses and morphemes are found
+        revision = self.versions.head
+        if not self._morpheme_retriever_loaded or self._morpheme_retriever_revision != revision:
+            self._morpheme_retriever = morpheme_vectors.load_or_build(self)
+            self._morpheme_retriever_loaded = True
+            self._morpheme_retriever_revision = revision
+        return self._morpheme_retriever
+
+    @property
+    def overlays(self) -> OverlayRegistry:
+        if self._overlays is None:
+            self._overlays = OverlayRegistry.from_file(make_entry=entry_from_dict)
+        return self._overlays
+
+    @property
+    def dialect(self) -> Optional[str]:
+        return self._overlay.name if self._overlay else None
+
+    @property
+    def overlay(self) -> Optional[DialectOverlay]:
+        """The dialect overlay this view applies (None for the base)."""
+        return self._overlay
+
+    def for_dialect(self, name: Optional[str]) -> "LnuTranslator":
+        """
+        This translator seen through a dialect overlay (None / "" = the
+        shared base).  The view shares the base lexicon, indexes, caches
+        and models – only the small overlay delta is its own – and is
+        cached, so calling this per request is cheap.  KeyError for an
+        unknown dialect.
+        """
+        if self._base is not None:
+            return self._base.for_dialect(name)
+        if not name:
+            return self
+        overlay = self.overlays.get(name)
+        view = self._dialect_views.get(overlay.name)
+        if view is None:
+            # build shared indexes before copying, so views don't each build their own
+            self.warm()
+            view = copy.copy(self)
+            view._overlay = overlay
+            view._base = self
+            self._dialect_views[overlay.name] = view
+        return view
+
+    @property
+    def patterns(self) -> PatternLibrary:
+        if self._patterns is None:
+            self._patterns = PatternLibrary.from_file()
+        return self._patterns
+
+    def _build_indexes(self) -> None:
+        self.versions.build_index()
+
+        story: Dict[str, Dict[str, Any]] = {}
+        entries: Dict[str, WordEntry] = {}
+        for entry in self.story_lexicon:
+            word_entry = entry_from_story(entry)
+            for key in (entry.get("surface"), entry.get("lemma")):
+                if key:
+                    story.setdefault(key.lower(), entry)
+                    for k in (key.lower(), orthography.normalize(key)):
+                        entries.setdefault(k, word_entry)
+
+        self._story_entries = entries
+        self._story_index = story
 
     # ------------------ lookup & analysis ------------------
 
-    def lookup(self, word: str) -> Optional[WordEntry]:
+    def lookup(self, word: str, as_of: Optional[int] = None) -> Optional[WordEntry]:
+        """
+        Entry for `word` at lexicon version `as_of` (None = latest): exact
+        headword, then case-insensitive, then Pacifique / Listuguj /
+        curly-apostrophe spellings folded to SFO.  Words the core lexicon
+        lacks fall back to the story lexicon (LNU_LEXICON, or the file
+        lexicon_ingest.py built, via LNU_LEXICON_FILE).
+        """
         # Normalize a little: strip spaces, lowercase where safe.
         key = word.strip()
-        # try exact first
-        if key in self.lexicon:
-            return self.lexicon[key]
-        # loose search (case-insensitive)
-        for hw, entry in self.lexicon.items():
-            if hw.lower() == key.lower():
-                return entry
-        return None
+        if self._overlay is not None:
+            # dialect delta first: its own entry, a local spelling of a
+            # base headword, or a headword the community doesn't use
+            hit = self._overlay.get(key)
+            seen = set()
+            while isinstance(hit, Alias) and hit.headword not in seen:
+                # the spelling may point at the overlay's own entry, or at
+                # a headword a nearer layer overrides
+                seen.add(hit.headword)
+                key = hit.headword
+                hit = self._overlay.get(key)
+            if hit is REMOVED:
+                return None
+            if hit is not None and not isinstance(hit, Alias):
+                return hit
+        entry = self.versions.lookup(key, as_of)
+        if entry is None:
+            entry = self._story_entry(key)
+        return entry
+
+    def _story_entry(self, key: str) -> Optional[WordEntry]:
+        if self._story_index is None:
+            self._build_indexes()
+        entries = self._story_entries
+        if not entries:
+            return None
+        entry = entries.get(key.lower())
+        if entry is None:
+            entry = entries.get(orthography.normalize(key))
+        return entry
+
+    def find_entry(self, word: str) -> Optional[Dict[str, Any]]:
+        """Find a story-lexicon entry (lexicon.js shape) by surface or lemma."""
+        if self._story_index is None:
+            self._build_indexes()
+        return self._story_index.get(word.strip().lower())
+
+    def guess_animacy_batch(self, words: List[str]) -> List[Tuple[Optional[str], Optional[float]]]:
+        """
+        (animacy, confidence) for each word: ANIMACY_HINTS and the -jik
+        rule first, then the n-gram model for everything left – all of
+        those in one vectorized call.  (None, None) = no idea.
+        """
+        guesses: List[Tuple[Optional[str], Optional[float]]] = []
+        rest: List[int] = []
+        for i, word in enumerate(words):
+            anim = guess_animacy(word)
+            guesses.append((anim, RULE_CONFIDENCE) if anim else (None, None))
+            if anim is None:
+                rest.append(i)
+        model = self.animacy_model
+        if rest and model is not None:
+            for i, guess in zip(rest, model.classify([words[i] for i in rest])):
+                guesses[i] = guess
+        return guesses
+
+    def analyze_word(
+        self, word: str, track: bool = True, as_of: Optional[int] = None
+    ) -> AnalysisResult:
+        """
+        Analyze one word.  Misses are counted in self.unknown_words unless
+        `track` is False (use that for batch/offline callers, so only real
+        lookups feed the review queue).
 
-    def analyze_word(self, word: str) -> AnalysisResult:
-        entry = self.lookup(word)
+        `as_of`: analyze against that lexicon version instead of the latest
+        (to reproduce an earlier annotation); such lookups are never tracked.
+        """
+        entry = self.lookup(word, as_of)
         if entry:
-            # We already have a curated breakdown; also attach worldview notes.
-            notes = collect_worldview_notes(entry.headword)
-            # merge stored worldview tags into notes in a friendly way
-            if entry.worldview_tags:
-                notes.append(
-                    "Worldview tags: " + ", ".join(entry.worldview_tags)
-                )
-            return AnalysisResult(
-                word=word,
-                entry=entry,
-                guessed_morphemes=[],
-                animacy_guess=entry.animacy,
-                worldview_notes=notes,
+            return self._analyze_entry(word, entry)
+        return self._analyze_unknown(
+            word, self.guess_animacy_batch([word])[0], track and as_of is None
+        )
+
+    def analyze_words(
+        self, words: List[str], track: bool = True, as_of: Optional[int] = None
+    ) -> List[AnalysisResult]:
+        """analyze_word() for many words, guessing animacy for all misses at once."""
+        track = track and as_of is None
+        entries = [self.lookup(w, as_of) for w in words]
+        misses = [w for w, e in zip(words, entries) if not e]
+        guesses = iter(self.guess_animacy_batch(misses))
+        return [
+            self._analyze_entry(w, e) if e else self._analyze_unknown(w, next(guesses), track)
+            for w, e in zip(words, entries)
+        ]
+
+    def _analyze_entry(self, word: str, entry: WordEntry) -> AnalysisResult:
+        # We already have a curated breakdown; also attach worldview notes.
+        notes = collect_worldview_notes(entry.headword)
+        # merge stored worldview tags into notes in a friendly way
+        if entry.worldview_tags:
+            notes.append(
+                "Worldview tags: " + ", ".join(entry.worldview_tags)
             )
+        return AnalysisResult(
+            word=word,
+            entry=entry,
+            guessed_morphemes=[],
+            animacy_guess=entry.animacy,
+            worldview_notes=notes,
+            animacy_confidence=1.0 if entry.animacy else None,
+        )
+
+    def _analyze_unknown(
+        self, word: str, animacy: Tuple[Optional[str], Optional[float]], track: bool
+    ) -> AnalysisResult:
+        if track and self.unknown_words is not None:
+            self.unknown_words.add(word)
 
         # No entry: try a light morphological guess based on patterns
         guessed: List[Morpheme] = []
-        anim_guess = guess_animacy(word)
+        anim_guess, anim_confidence = animacy
         notes = collect_worldview_notes(word)
 
         # very small set of pattern heuristics – extend as needed
@@ -362,8 +714,18 @@ class LnuTranslator:
                 "No lexicon entry yet. This is a good candidate to confirm with fluent speakers."
             )
 
+        spelling = orthography.check(word)
+        if not spelling.valid:
+            notes.append(
+                f"Not standard Smith-Francis spelling: {spelling.reason} "
+                f"(letter {(spelling.position or 0) + 1} of '{spelling.normalized}'). "
+                "Check the spelling with a speaker or dictionary."
+            )
+        elif spelling.normalized != word.strip().lower():
+            notes.append(f"Smith-Francis spelling: {spelling.normalized}.")
+
         if anim_guess:
-            notes.append(f"Animacy guess: {anim_guess}.")
+            notes.append(f"Animacy guess: {anim_guess} (confidence {anim_confidence:.2f}).")
 
         return AnalysisResult(
             word=word,
@@ -371,89 +733,146 @@ class LnuTranslator:
             guessed_morphemes=guessed,
             animacy_guess=anim_guess,
             worldview_notes=notes,
+            animacy_confidence=anim_confidence,
         )
 
     # ------------------ sentence helpers ------------------
 
-    def analyze_sentence(self, sentence: str) -> Dict[str, Any]:
+    @staticmethod
+    def tokenize_sentence(sentence: str) -> List[str]:
+        # simple tokenization – you may want something smarter later
+        return [t for t in sentence.replace(",", " ").split() if t]
+
+    def analyze_sentence(
+        self, sentence: str, track: bool = True, as_of: Optional[int] = None
+    ) -> Dict[str, Any]:
         """
         Break a Mi'kmaw sentence into words and analyze each.
         This does NOT attempt full syntax – just word-level support.
+
+        `lexicon_revision` in the result is the lexicon version used; pass
+        it back as `as_of` to get the same analyses later.
         """
-        # simple tokenization – you may want something smarter later
-        tokens = [t for t in sentence.replace(",", " ").split() if t]
-        analyses = [self.analyze_word(tok).to_dict() for tok in tokens]
+        revision = self.versions.resolve(as_of)
+        tokens = self.tokenize_sentence(sentence)
+        analyses = [
+            a.to_dict()
+            for a in self.analyze_words(tokens, track=track and as_of is None, as_of=revision)
+        ]
         return {
             "sentence": sentence,
             "tokens": tokens,
             "analyses": analyses,
+            "lexicon_revision": revision,
         }
 
     # ------------------ modern term generation ------------------
 
-    def generate_modern_term(self, req: GenerationRequest) -> List[GenerationCandidate]:
+    def generate_modern_term(
+        self, req: GenerationRequest, top_k: Optional[int] = None
+    ) -> List[GenerationCandidate]:
         """
         Suggest Mi'kmaw-style words for a modern concept.
 
         This uses PATTERNS, not "translations". All results MUST be
         checked with fluent speakers / elders before real-world use.
-        """
 
-        candidates: List[GenerationCandidate] = []
-
-        # 1. Example pattern for "thing that keeps X cold" (refrigerator).
-        if "refrigerator" in req.concept.lower() or (
-            "cold" in req.purpose.lower() and "food" in req.purpose.lower()
-        ):
-            # Use tekek (it is cold) + container / house notion.
-            # We'll propose something like:
-            #   "Mesentaqtekekim" – "that which makes-things-be-cold-inside"
-            morphemes = [
-                Morpheme("mesen-", "to keep / maintain", "preverb"),
-                Morpheme("taq-", "inside / container / dwelling", "root-ish"),
-                Morpheme("tekek", "cold (inanimate state)", "root"),
-                Morpheme("-im", "instrument / thing that does this", "suffix"),
-            ]
-            word = "Mesentaqtekekim"
-            explanation = (
-                "Built from mesen- (to keep/maintain) + taq (inside) + tekek (cold) "
-                "+ -im (instrument). Rough sense: 'the thing that keeps the inside cold'."
-            )
-            caution = (
-                "Prototype only. Confirm phonology, stress and cultural fit with fluent "
-                "Mi'kmaw speakers and elders before adopting. Adjust spelling to local dialect."
+        Patterns come from generation_patterns.json; candidates are ranked
+        by how strongly the concept, purpose and domain tags match them,
+        with the generic fallback pattern(s) always last.  Just before the
+        fallbacks comes one word assembled from the morphemes whose glosses
+        are nearest the purpose (morpheme_vectors.py), so concepts no
+        pattern knows still get a specific suggestion.
+        """
+        matches = self.patterns.match(req.concept, req.purpose, req.domain_tags)
+        candidates = [
+            GenerationCandidate(
+                word=m.pattern.word,
+                breakdown=[
+                    Morpheme(d["surface"], d.get("gloss", ""), d.get("role", ""), d.get("notes"))
+                    for d in m.pattern.morphemes
+                ],
+                explanation=m.pattern.explanation,
+                caution=m.pattern.caution,
+                score=round(m.score, 3),
+                pattern_id=m.pattern.id,
             )
-            candidates.append(GenerationCandidate(word, morphemes, explanation, caution))
-
-        # 2. Generic fallback pattern: describe purpose in verbs.
-        # This gives at least one candidate even if we have no handcrafted pattern.
-        base_root = "apoqnmatultim"  # "it helps / it supports" – placeholder root
-        morphemes = [
-            Morpheme(base_root, "to help / support (placeholder root)", "root"),
-            Morpheme("-ik", "thing which does this", "suffix"),
+            for m in matches
         ]
-        generic_word = base_root.capitalize() + "ik"
+        retrieved = self._retrieval_candidate(req)
+        if retrieved is not None and all(c.word != retrieved.word for c in candidates):
+            at = next((i for i, m in enumerate(matches) if m.pattern.fallback), len(matches))
+            candidates.insert(at, retrieved)
+        if top_k is not None:
+            candidates = candidates[: max(top_k, 0)]
+        return candidates
+
+    def _retrieval_candidate(self, req: GenerationRequest) -> Optional[GenerationCandidate]:
+        retriever = self.morpheme_retriever
+        if retriever is None:
+            return None
+        found = retriever.compose(req.concept, req.purpose, req.domain_tags)
+        if found is None:
+            return None
         explanation = (
-            "Generic helper pattern: root meaning 'to help/support' + -ik (instrument). "
-            "Use this only as a brainstorming starting point."
+            "Nearest morphemes to the purpose: "
+            + " + ".join(f"{m['surface']} ({m['gloss']})" for m in found["morphemes"])
+            + "."
         )
-        caution = (
-            "Generic pattern. Replace the root with a better verb that reflects the purpose "
-            "once you consult speakers (e.g., a more specific verb for how the object acts)."
+        if found["related"]:
+            explanation += " Related words: " + ", ".join(
+                f"{e['headword']} ({e['english']})" for e in found["related"]
+            ) + "."
+        return GenerationCandidate(
+            word=found["word"],
+            breakdown=[
+                Morpheme(m["surface"], m["gloss"], m["role"], m["source"]) for m in found["morphemes"]
+            ],
+            explanation=explanation,
+            caution=morpheme_vectors.RETRIEVAL_CAUTION,
+            score=round(found["score"], 3),
+            pattern_id="retrieval",
         )
-        candidates.append(GenerationCandidate(generic_word, morphemes, explanation, caution))
-
-        return candidates
 
     # ------------------ API-friendly wrappers ------------------
 
-    def explain_word_for_api(self, word: str) -> Dict[str, Any]:
+    def explain_word_for_api(
+        self, word: str, as_of: Optional[int] = None, track: bool = True
+    ) -> Dict[str, Any]:
         """Return a JSON-serializable explanation for one word."""
-        return self.analyze_word(word).to_dict()
-
-    def explain_sentence_for_api(self, sentence: str) -> Dict[str, Any]:
+        revision = self.versions.resolve(as_of)
+        result = self.analyze_word(word, track=track and as_of is None, as_of=revision).to_dict()
+        result["lexicon_revision"] = revision
+        return result
+
+    def explain_sentence_for_api(
+        self, sentence: str, as_of: Optional[int] = None, track: bool = True
+    ) -> Dict[str, Any]:
         """Return a JSON-serializable explanation for a sentence."""
-        return self.analyze_sentence(sentence)
+        return self.analyze_sentence(sentence, track=track, as_of=as_of)
+
+    def track_unknown(self, words: Iterable[str], as_of: Optional[int] = None) -> None:
+        """
+        Count each of `words` that has no entry in self.unknown_words.  For
+        callers whose analysis came from a shared or cached result (so
+        analyze_word never saw them): one count per caller.
+        """
+        if self.unknown_words is None or as_of is not None:
+            return
+        for w in words:
+            if self.lookup(w) is None:
+                self.unknown_words.add(w)
+
+    def edit_entry(
+        self, headword: str, data: Optional[Dict[str, Any]], author: str = "", note: str = ""
+    ) -> int:
+        """
+        Record a speaker correction (data=None deletes the entry); returns
+        the new lexicon version.  Earlier versions stay available via as_of.
+        """
+        if data is not None:
+            data = dict(data, headword=headword)
+        return self.versions.put(headword, data, author=author, note=note)
 
     def generate_term_for_api(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -463,7 +882,8 @@ class LnuTranslator:
             {
                 "concept": "refrigerator",
                 "purpose": "keeps food and drinks cold",
-                "domain_tags": ["home", "food", "modern_object"]
+                "domain_tags": ["home", "food", "modern_object"],
+                "top_k": 3            # optional
             }
         """
         req = GenerationRequest(
@@ -471,259 +891,18 @@ class LnuTranslator:
             purpose=payload.get("purpose", ""),
             domain_tags=payload.get("domain_tags", []) or [],
         )
-        cands = self.generate_modern_term(req)
+        top_k = payload.get("top_k")
+        key = self.generation_version + "|" + req.cache_key(top_k)
+        candidates = self.generation_cache.get(key)
+        if candidates is None:
+            cands = self.generate_modern_term(req, top_k=top_k)
+            candidates = [c.to_dict() for c in cands]
+            self.generation_cache.put(key, candidates)
         return {
             "concept": req.concept,
-            "candidates": [c.to_dict() for c in cands],
+            "candidates": candidates,
         }
 
-# lexicon_data.py
-# Python mirror of lexicon.js for use inside translator.py
-
-from typing import List, Dict, Any
-
-LNU_LEXICON: List[Dict[str, Any]] = [
-    {
-        "lemma": "kwe'",
-        "surface": "Kwe'",
-        "pos": "interjection",
-        "gloss": "Hello",
-        "animacy": None,
-        "root": "kwe'",
-        "morphology": [
-            {"piece": "kwe'", "type": "root", "gloss": "greeting / hello"},
-        ],
-        "examples": [
-            {
-                "mikmaq": "Kwe', teluisi Katew.",
-                "english": "Hello, my name is Katew.",
-            }
-        ],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Used as a friendly greeting; often the first word children learn.",
-            "Opening a story with “Kwe’” sets the tone of respect and relationship.",
-        ],
-        "needsReview": False,
-    },
-
-    {
-        "lemma": "teluisi",
-        "surface": "Teluisi",
-        "pos": "expression",
-        "gloss": "My name is …",
-        "animacy": None,
-        "root": "teluis-",
-        "morphology": [
-            {"piece": "telu-", "type": "root", "gloss": "to be called / named (approx.)"},
-            {"piece": "-isi", "type": "suffix", "gloss": "1st person ‘I am called’ (approx.)"},
-        ],
-        "examples": [
-            {"mikmaq": "Teluisi Katew.", "english": "My name is Katew."}
-        ],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Introductions in Mi’kmaw often come with place and kin, not just personal name.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "kesalul",
-        "surface": "Kesalul",
-        "pos": "verb",
-        "gloss": "I love you (singular)",
-        "animacy": "animate",
-        "root": "kesal-",
-        "morphology": [
-            {"piece": "ke-", "type": "prefix", "gloss": "you (2nd person)"},
-            {"piece": "sal", "type": "root", "gloss": "love, be precious"},
-            {"piece": "-ul", "type": "suffix", "gloss": "I (1st person) acting on you"},
-        ],
-        "examples": [
-            {
-                "mikmaq": "Kesalul, nikmaq.",
-                "english": "I love you, my family.",
-            }
-        ],
-        "source": "Rebecca Thomas – I Place You Into the Fire; community usage",
-        "worldview_notes": [
-            "Tiny shifts in glottal stop position change meaning.",
-            "Shows the link between sound, emotion, and ceremony (fire).",
-        ],
-        "needsReview": False,
-    },
-
-    {
-        "lemma": "msit no'kmaq",
-        "surface": "Msit No'kmaq",
-        "pos": "expression",
-        "gloss": "All my relations",
-        "animacy": None,
-        "root": "msit + no'kmaq",
-        "morphology": [
-            {"piece": "msit", "type": "root", "gloss": "all, everything"},
-            {"piece": "no'kmaq", "type": "root", "gloss": "my relations / all my kin"},
-        ],
-        "examples": [
-            {
-                "mikmaq": "Msit No'kmaq, wela'liek.",
-                "english": "All my relations, I thank you.",
-            }
-        ],
-        "source": "Community teaching; LD manual",
-        "worldview_notes": [
-            "Names the full web of kin – people, animals, plants, waters, winds, ancestors.",
-            "Implies responsibility to everything you’re related to.",
-        ],
-        "needsReview": False,
-    },
-
-    {
-        "lemma": "wela'lin",
-        "surface": "Wela'lin",
-        "pos": "expression",
-        "gloss": "Thank you",
-        "animacy": None,
-        "root": "wel-",
-        "morphology": [
-            {"piece": "wel", "type": "root", "gloss": "good, well"},
-            {"piece": "a'lin", "type": "suffix", "gloss": "to be thus / let it be so (approx.)"},
-        ],
-        "examples": [
-            {"mikmaq": "Wela'lin Msit No'kmaq.", "english": "Thank you, all my relations."}
-        ],
-        "source": "LD manual; everyday speech",
-        "worldview_notes": [
-            "Often deeper than ‘thanks’ – about the state you’re brought into.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "netukulimk",
-        "surface": "Netukulimk",
-        "pos": "noun-abstract",
-        "gloss": "Taking only what you need while caring for land and future generations",
-        "animacy": None,
-        "root": "netukulimk",
-        "morphology": [],
-        "examples": [
-            {
-                "mikmaq": "Netukulimk wjit aq aqamk skitqamu.",
-                "english": "Netukulimk is how we live with the earth.",
-            }
-        ],
-        "source": "Mi'kmaw ethics / LD resource manual",
-        "worldview_notes": [
-            "Key law of balance between harvest and responsibility.",
-        ],
-        "needsReview": False,
-    },
-
-    {
-        "lemma": "kataq",
-        "surface": "Kataq",
-        "pos": "noun-animate",
-        "gloss": "American eel",
-        "animacy": "animate",
-        "root": "kataq",
-        "morphology": [
-            {"piece": "kataq", "type": "root", "gloss": "eel"},
-        ],
-        "examples": [
-            {
-                "mikmaq": "Kataq wjit apoqnmulti'juin lnu'k.",
-                "english": "The eel helps Mi'kmaq people live.",
-            }
-        ],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Eel is a teacher and relative in the story, not just food.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "yellow eel",
-        "surface": "Kataq (yellow stage)",
-        "pos": "noun-animate",
-        "gloss": "Yellow eel life stage",
-        "animacy": "animate",
-        "root": "kataq",
-        "morphology": [],
-        "examples": [],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Represents middle life stage in lakes and rivers.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "silver eel",
-        "surface": "Kataq (silver stage)",
-        "pos": "noun-animate",
-        "gloss": "Silver eel life stage (ocean-going)",
-        "animacy": "animate",
-        "root": "kataq",
-        "morphology": [],
-        "examples": [],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Stage for the long journey back to Sargasso Sea.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "oyster",
-        "surface": "oyster (fill exact Mi'kmaw form)",
-        "pos": "noun-animate",
-        "gloss": "Oyster",
-        "animacy": "animate",
-        "root": "TODO",
-        "morphology": [],
-        "examples": [],
-        "source": "Oyster storybook (your photos)",
-        "worldview_notes": [
-            "Described as filtering and cleaning the water in the lakes.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "apoqnmulti'juin",
-        "surface": "apoqnmulti'juin",
-        "pos": "verb/phrase",
-        "gloss": "helps us live / we are helped to live (approx.)",
-        "animacy": None,
-        "root": "TODO",
-        "morphology": [],
-        "examples": [],
-        "source": "Kataq: The Story of Our Eels",
-        "worldview_notes": [
-            "Shows mutual support between people and more-than-human kin.",
-        ],
-        "needsReview": True,
-    },
-
-    {
-        "lemma": "mother earth",
-        "surface": "Mother Earth (fill preferred Mi'kmaw form)",
-        "pos": "noun-proper",
-        "gloss": "Mother Earth",
-        "animacy": "animate",
-        "root": "TODO",
-        "morphology": [],
-        "examples": [],
-        "source": "Eel + Oyster stories; LD manual",
-        "worldview_notes": [
-            "Central relative that all the water teachings return to.",
-        ],
-        "needsReview": True,
-    },
-]
 
 # ---------------------------------------------------------------------------
 # Module-level singleton (optional convenience)
@@ -735,19 +914,8 @@ _default_translator: Optional[LnuTranslator] = None
 def get_translator() -> LnuTranslator:
     global _default_translator
     if _default_translator is None:
-        _default_translator = LnuTranslator()
+        # LNU_LEXICON_FILE: a lexicon built by lexicon_ingest.py, served
+        # instead of the built-in LNU_LEXICON
+        path = os.environ.get("LNU_LEXICON_FILE")
+        _default_translator = LnuTranslator(story_lexicon=load_lexicon(path) if path else None)
     return _default_translator
-from lexicon_data import LNU_LEXICON
-
-class LnuTranslator:
-    def __init__(self):
-        self.lexicon = LNU_LEXICON
-
-    def find_entry(self, word: str):
-        lower = word.lower()
-        for entry in self.lexicon:
-            if entry["surface"].lower() == lower or entry["lemma"].lower() == lower:
-                return entry
-        return None
-
-    # and your explain_word_for_api() can call self.find_entry(...)